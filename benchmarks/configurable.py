@@ -0,0 +1,113 @@
+import argparse
+import logging
+from os.path import join
+from timeit import default_timer as timer
+
+from hdx.api.configuration import Configuration
+from hdx.scraper.configurable.scraper import ConfigurableScraper
+from hdx.scraper.utilities.reader import Read
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.downloader import DownloadError
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.main import setup_indicators
+from scrapers.utilities import configurable
+
+
+def get_scrapers(configuration, cls, today, countries, adminlevel):
+    scrapers = list()
+    for level_name in "national", "subnational":
+        for name, datasetinfo in configuration[f"scraper_{level_name}"].items():
+            scrapers.append(
+                cls(
+                    name,
+                    datasetinfo,
+                    level_name,
+                    countries,
+                    adminlevel,
+                    level_name,
+                    today=today,
+                )
+            )
+    return scrapers
+
+
+def time_scraper(scraper, file_headers, rows, repeats):
+    # Rows are read once so that only parsing and expressions are timed
+    scraper.get_iterator = lambda name: (file_headers, iter(rows))
+    times = list()
+    for _ in range(repeats):
+        scraper.values = {
+            key: tuple({} for _ in values) for key, values in scraper.values.items()
+        }
+        start = timer()
+        scraper.run()
+        times.append(timer() - start)
+    return min(times)
+
+
+def main(folder, repeats):
+    UserAgent.set_global("benchmark")
+    Configuration._create(
+        hdx_read_only=True,
+        hdx_site="prod",
+        project_config_yaml=join("config", "project_configuration.yml"),
+    )
+    configuration = Configuration.read()
+    today = parse_date("2022-05-02")
+    with temp_dir("ConfigurableBenchmark") as temp_folder:
+        Read.create_readers(
+            temp_folder, folder, temp_folder, save=False, use_saved=True, today=today
+        )
+        countries, _, adminlevel = setup_indicators(configuration, use_live=False)
+        old_scrapers = get_scrapers(
+            configuration, ConfigurableScraper, today, countries, adminlevel
+        )
+        new_scrapers = get_scrapers(
+            configuration,
+            configurable.ConfigurableScraper,
+            today,
+            countries,
+            adminlevel,
+        )
+        total_rows = 0
+        total_old = 0
+        total_new = 0
+        for old_scraper, new_scraper in zip(old_scrapers, new_scrapers):
+            try:
+                file_headers, iterator = old_scraper.get_iterator(old_scraper.name)
+                rows = list(iterator)
+            except DownloadError:
+                print(f"{old_scraper.name}: no saved data")
+                continue
+            if not rows:
+                continue
+            # Reading fills in dataset information like the url
+            new_scraper.get_iterator(new_scraper.name)
+            old_time = time_scraper(old_scraper, file_headers, rows, repeats)
+            new_time = time_scraper(new_scraper, file_headers, rows, repeats)
+            if old_scraper.values != new_scraper.values:
+                raise ValueError(f"{old_scraper.name} values differ!")
+            print(
+                f"{old_scraper.name}: {len(rows)} rows, {old_time / len(rows) * 1e6:.1f}us -> {new_time / len(rows) * 1e6:.1f}us per row"
+            )
+            total_rows += len(rows)
+            total_old += old_time
+            total_new += new_time
+        print(
+            f"All: {total_rows} rows, {total_old / total_rows * 1e6:.1f}us -> {total_new / total_rows * 1e6:.1f}us per row"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark configurable scraper expressions"
+    )
+    parser.add_argument(
+        "-f", "--folder", default=join("tests", "fixtures", "input"), help="Saved data"
+    )
+    parser.add_argument("-r", "--repeats", default=5, type=int, help="Repeats")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    main(args.folder, args.repeats)
@@ -0,0 +1,116 @@
+import argparse
+import logging
+import re
+from copy import deepcopy
+from os.path import join
+from time import process_time
+
+from hdx.api.configuration import Configuration
+from hdx.scraper.outputs.base import BaseOutput
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.loader import load_json
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.fts import FTS
+
+
+def load_data(folder, filename):
+    return load_json(join(folder, f"fts_{filename}.json"))["data"]
+
+
+def scale_responses(folder, scale):
+    # Copies of the saved plans with new ids so there are scale times as many
+    plans = load_data(folder, "progress-2022")["plans"]
+    funding_filename = "flow-custom-search-emergencyid-911-planid-{}-groupby-plan"
+    plan_ids = "".join(str(plan["id"]) for plan in plans)
+    funding = load_data(folder, funding_filename.format(plan_ids))
+    breakdown = funding["report3"]["fundingTotals"]["objects"][0]["objectsBreakdown"]
+    locations = dict()
+    scaled_plans = list()
+    scaled_breakdown = list()
+    for copy in range(scale):
+        offset = copy * 100000
+        for plan in plans:
+            plan = deepcopy(plan)
+            plan_id = plan["id"]
+            plan["id"] = plan_id + offset
+            if copy:
+                plan["name"] = f"{plan['name']} {copy}"
+            scaled_plans.append(plan)
+            if len(plan["countries"]) > 1:
+                filename = f"flow-custom-search-planid-{plan_id}-groupby-location"
+                locations[str(plan["id"])] = load_data(folder, filename)
+        for fundobj in breakdown:
+            fundobj = dict(fundobj)
+            fund_id = fundobj.get("id")
+            if fund_id:
+                fundobj["id"] = str(int(fund_id) + offset)
+            scaled_breakdown.append(fundobj)
+    scaled_funding = deepcopy(funding)
+    scaled_funding["report3"]["fundingTotals"]["objects"][0][
+        "objectsBreakdown"
+    ] = scaled_breakdown
+    return {"plans": scaled_plans}, scaled_funding, locations
+
+
+def time_run(fts, responses, repeats):
+    plans, funding, locations = responses
+    plan_id_regex = re.compile(r"planid=(\d+)&groupby=location")
+
+    async def download_data(url, reader, projection=None):
+        if "overview/progress" in url:
+            return plans
+        match = plan_id_regex.search(url)
+        if match:
+            return locations[match.group(1)]
+        return funding
+
+    fts.download_data = download_data
+    fts.get_reader = lambda name: None
+    times = list()
+    for _ in range(repeats):
+        fts.values = {
+            key: tuple({} for _ in values) for key, values in fts.values.items()
+        }
+        start = process_time()
+        fts.run()
+        times.append(process_time() - start)
+    return min(times)
+
+
+def main(folder, scales, repeats):
+    UserAgent.set_global("benchmark")
+    Configuration._create(
+        hdx_read_only=True,
+        hdx_site="prod",
+        project_config_yaml=join("config", "project_configuration.yml"),
+    )
+    configuration = Configuration.read()
+    today = parse_date("2022-05-02")
+    countries = configuration["countries"]
+    for scale in scales:
+        responses = scale_responses(folder, scale)
+        fts = FTS(configuration["fts"], today, {"none": BaseOutput([])}, countries)
+        elapsed = time_run(fts, responses, repeats)
+        print(
+            f"{len(responses[0]['plans'])} plans: {elapsed * 1000:.1f}ms CPU time per run"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark FTS plan processing")
+    parser.add_argument(
+        "-f", "--folder", default=join("tests", "fixtures", "input"), help="Saved data"
+    )
+    parser.add_argument(
+        "-s",
+        "--scales",
+        default="1,10",
+        help="Comma separated multiples of the saved plans to time",
+    )
+    parser.add_argument(
+        "-r", "--repeats", default=5, type=int, help="Times to run each scale"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    main(args.folder, [int(scale) for scale in args.scales.split(",")], args.repeats)
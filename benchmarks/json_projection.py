@@ -0,0 +1,123 @@
+import argparse
+import json
+import logging
+import tracemalloc
+from os.path import basename, exists, join
+from timeit import default_timer as timer
+
+from hdx.api.configuration import Configuration
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.fts import FTS
+from scrapers.inform import Inform
+from scrapers.ipc import IPC
+from scrapers.main import setup_indicators
+from scrapers.utilities.projection import project_json
+from scrapers.utilities.reader import Read
+
+download_json = Read.download_json
+
+
+def run_scraper(scraper, calls, use_projection):
+    def recording_download_json(
+        self, url, filename=None, logstr=None, *args, projection=None, **kwargs
+    ):
+        if projection is not None:
+            name, _ = self.get_filename(url, filename, ("json",), **kwargs)
+            calls[join(self.saved_dir, name)] = projection
+        if not use_projection:
+            projection = None
+        return download_json(
+            self, url, filename, logstr, *args, projection=projection, **kwargs
+        )
+
+    scraper.values = {
+        key: tuple({} for _ in values) for key, values in scraper.values.items()
+    }
+    Read.download_json = recording_download_json
+    try:
+        scraper.run()
+    except Exception as ex:
+        # Values up to the failure are still compared
+        print(f"{scraper.name}: {ex!r}")
+    finally:
+        Read.download_json = download_json
+    return scraper.values
+
+
+def parse(path, projection):
+    with open(path, "rb") as f:
+        if projection is None:
+            return json.load(f)
+        return project_json(f, projection, path)
+
+
+def measure(path, projection, repeats=5):
+    times = list()
+    for _ in range(repeats):
+        start = timer()
+        parse(path, projection)
+        times.append(timer() - start)
+    elapsed = min(times)
+    # Timed separately as tracing memory slows parsing down
+    tracemalloc.start()
+    rjson = parse(path, projection)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rjson
+    return elapsed, peak
+
+
+def main(folder):
+    UserAgent.set_global("benchmark")
+    Configuration._create(
+        hdx_read_only=True,
+        hdx_site="prod",
+        project_config_yaml=join("config", "project_configuration.yml"),
+    )
+    configuration = Configuration.read()
+    today = parse_date("2022-05-02")
+    with temp_dir("JsonProjectionBenchmark") as temp_folder:
+        Read.create_readers(
+            temp_folder, folder, temp_folder, save=False, use_saved=True, today=today
+        )
+        countries, all_countries, adminlevel = setup_indicators(
+            configuration, use_live=False
+        )
+        scrapers = (
+            Inform(configuration["inform"], today, countries),
+            IPC(configuration["ipc"], today, countries, adminlevel),
+            FTS(configuration["fts"], today, dict(), countries, all_countries),
+        )
+        for scraper in scrapers:
+            calls = dict()
+            full_values = run_scraper(scraper, calls, False)
+            projected_values = run_scraper(scraper, calls, True)
+            if projected_values != full_values:
+                print(f"{scraper.name}: values differ with projection!")
+            totals = [0, 0, 0, 0]
+            for path, projection in calls.items():
+                if not exists(path):
+                    continue
+                full = measure(path, None)
+                projected = measure(path, projection)
+                print(
+                    f"  {basename(path)}: {full[0] * 1000:.1f}ms -> {projected[0] * 1000:.1f}ms, peak memory {full[1] / 1e6:.2f}MB -> {projected[1] / 1e6:.2f}MB"
+                )
+                for i, value in enumerate(full + projected):
+                    totals[i] += value
+            print(
+                f"{scraper.name}: {len(calls)} files, {totals[0]:.2f}s -> {totals[2]:.2f}s, sum of peak memory {totals[1] / 1e6:.1f}MB -> {totals[3] / 1e6:.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark projected JSON parsing")
+    parser.add_argument(
+        "-f", "--folder", default=join("tests", "fixtures", "input"), help="Saved data"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    main(args.folder)
@@ -0,0 +1,68 @@
+import argparse
+import random
+from os import listdir
+from os.path import getsize, isfile, join
+from timeit import default_timer as timer
+
+from hdx.utilities.path import temp_dir
+
+from scrapers.utilities.saved_archive import SavedArchive, pack_directory
+
+
+def read_folder(folder, filenames):
+    total = 0
+    for filename in filenames:
+        with open(join(folder, filename), "rb") as f:
+            total += len(f.read())
+    return total
+
+
+def read_archive(archive_path, filenames):
+    total = 0
+    with SavedArchive(archive_path) as archive:
+        for filename in filenames:
+            total += len(archive.read(filename))
+    return total
+
+
+def main(folder, repeats):
+    filenames = [x for x in listdir(folder) if isfile(join(folder, x))]
+    random.Random(0).shuffle(filenames)
+    folder_size = sum(getsize(join(folder, x)) for x in filenames)
+    with temp_dir("SavedArchiveBenchmark") as temp_folder:
+        archive_path = join(temp_folder, "saved_data.arc")
+        start = timer()
+        pack_directory(folder, archive_path)
+        pack_time = timer() - start
+        archive_size = getsize(archive_path)
+        print(f"Files: {len(filenames)}")
+        print(f"Folder size: {folder_size:,} bytes")
+        print(f"Archive size: {archive_size:,} bytes ({pack_time:.2f}s to pack)")
+        for name, fn, source in (
+            ("folder", read_folder, folder),
+            ("archive", read_archive, archive_path),
+        ):
+            times = list()
+            for _ in range(repeats):
+                start = timer()
+                fn(source, filenames)
+                times.append(timer() - start)
+            print(f"Replay all from {name}: best {min(times):.3f}s of {repeats}")
+        lookups = filenames[:10]
+        start = timer()
+        for _ in range(repeats):
+            with SavedArchive(archive_path) as archive:
+                for filename in lookups:
+                    archive.find(filename)
+        lookup_time = (timer() - start) / (repeats * len(lookups))
+        print(f"Archive index lookup: {lookup_time * 1e6:.1f}us per entry")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark saved data replay")
+    parser.add_argument(
+        "-f", "--folder", default=join("tests", "fixtures", "input"), help="Saved data"
+    )
+    parser.add_argument("-r", "--repeats", default=5, type=int, help="Repeats")
+    args = parser.parse_args()
+    main(args.folder, args.repeats)
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import tracemalloc
+from os.path import join
+from timeit import default_timer as timer
+
+from hdx.api.configuration import Configuration
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.downloader import DownloadError
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.main import setup_indicators
+from scrapers.utilities.configurable import ConfigurableScraper
+from scrapers.utilities.reader import Read
+
+
+def read_rows(scraper, streaming):
+    Read.spreadsheet_streaming = streaming
+    start = timer()
+    _, iterator = scraper.get_iterator(scraper.name)
+    norows = sum(1 for _ in iterator)
+    elapsed = timer() - start
+    # Timed separately as tracing memory slows reading down. Rows are kept as
+    # the row parser keeps them.
+    tracemalloc.start()
+    _, iterator = scraper.get_iterator(scraper.name)
+    rows = list(iterator)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return norows, elapsed, peak
+
+
+def main(folder):
+    UserAgent.set_global("benchmark")
+    Configuration._create(
+        hdx_read_only=True,
+        hdx_site="prod",
+        project_config_yaml=join("config", "project_configuration.yml"),
+    )
+    configuration = Configuration.read()
+    today = parse_date("2022-05-02")
+    with temp_dir("SpreadsheetBenchmark") as temp_folder:
+        Read.create_readers(
+            temp_folder, folder, temp_folder, save=False, use_saved=True, today=today
+        )
+        countries, _, adminlevel = setup_indicators(configuration, use_live=False)
+        for level_name in "national", "subnational":
+            for name, datasetinfo in configuration[f"scraper_{level_name}"].items():
+                if datasetinfo.get("format") not in ("xls", "xlsx"):
+                    continue
+                scraper = ConfigurableScraper(
+                    name,
+                    datasetinfo,
+                    level_name,
+                    countries,
+                    adminlevel,
+                    level_name,
+                    today=today,
+                )
+                try:
+                    full = read_rows(scraper, False)
+                    streamed = read_rows(scraper, True)
+                except DownloadError:
+                    print(f"{name} ({level_name}): no saved data")
+                    continue
+                print(
+                    f"{name} ({level_name}): {full[0]} rows, {full[1]:.2f}s -> {streamed[1]:.2f}s, peak memory {full[2] / 1e6:.1f}MB -> {streamed[2] / 1e6:.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark spreadsheet reading")
+    parser.add_argument(
+        "-f", "--folder", default=join("tests", "fixtures", "input"), help="Saved data"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    main(args.folder)
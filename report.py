@@ -0,0 +1,105 @@
+import argparse
+import sys
+
+from scrapers.utilities.history import get_report
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Report trends and regressions of scrapers from the run history"
+    )
+    parser.add_argument("history_db", help="SQLite file given to run.py")
+    parser.add_argument(
+        "-w",
+        "--window",
+        default=10,
+        type=int,
+        help="Number of earlier runs to use as the baseline",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        default=1.5,
+        type=float,
+        help="Times slower than the baseline a scraper must be to have regressed",
+    )
+    parser.add_argument(
+        "-md",
+        "--min_duration",
+        default=1.0,
+        type=float,
+        help="Seconds below which scrapers are never regressed",
+    )
+    parser.add_argument(
+        "-f",
+        "--fail",
+        default=False,
+        action="store_true",
+        help="Exit with an error if any scraper regressed",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    return f"{seconds:.2f}"
+
+
+def main(history_db, window, threshold, min_duration, fail):
+    report = get_report(history_db, window, threshold, min_duration)
+    columns = (
+        "Scraper",
+        "Shard",
+        "Runs",
+        "Status",
+        "Latest s",
+        "Baseline s",
+        "Ratio",
+        "p50 s",
+        "p90 s",
+        "p95 s",
+        "Requests",
+        "Hits",
+        "MB",
+        "Peak rise MB",
+    )
+    rows = list()
+    for scraper in sorted(report, key=lambda scraper: -(scraper["ratio"] or 0)):
+        ratio = scraper["ratio"]
+        rows.append(
+            (
+                f"{scraper['scraper']}{' REGRESSED' if scraper['regressed'] else ''}",
+                scraper["shard"] or "-",
+                str(scraper["runs"]),
+                scraper["status"],
+                format_seconds(scraper["duration"]),
+                format_seconds(scraper["baseline"]),
+                "-" if ratio is None else f"{ratio:.2f}x",
+                format_seconds(scraper["p50"]),
+                format_seconds(scraper["p90"]),
+                format_seconds(scraper["p95"]),
+                str(scraper["requests"]),
+                str(scraper["cache_hits"]),
+                f"{scraper['bytes'] / 1e6:.1f}",
+                f"{scraper['peak_memory_rise'] / 1e6:.0f}",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows + [columns]) for i in range(len(columns))]
+    for row in [columns] + rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+    regressed = [scraper["scraper"] for scraper in report if scraper["regressed"]]
+    print(
+        f"{len(regressed)} of {len(report)} scraper runs regressed beyond {threshold}x the median of their last {window} runs"
+    )
+    if fail and regressed:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(
+        main(args.history_db, args.window, args.threshold, args.min_duration, args.fail)
+    )
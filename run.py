@@ -1,21 +1,28 @@
 import argparse
 import logging
+from copy import deepcopy
 from os import getenv
 from os.path import join, expanduser
+from timeit import default_timer as timer
 
 from hdx.api.configuration import Configuration
 from hdx.facades.keyword_arguments import facade
 from hdx.scraper.outputs.base import BaseOutput
 from hdx.scraper.outputs.excelfile import ExcelFile
-from hdx.scraper.outputs.googlesheets import GoogleSheets
-from hdx.scraper.outputs.json import JsonFile
 from hdx.scraper.utilities import string_params_to_dict
-from hdx.scraper.utilities.reader import Read
 from hdx.utilities.dateparse import now_utc
 from hdx.utilities.easy_logging import setup_logging
 from hdx.utilities.errors_onexit import ErrorsOnExit
 from hdx.utilities.path import temp_dir
-from scrapers.main import get_indicators
+from scrapers.main import get_indicators, setup_indicators
+from scrapers.outputs.columnar import ColumnarFile
+from scrapers.outputs.excelfile import StreamingExcelFile
+from scrapers.outputs.googlesheets import GoogleSheets
+from scrapers.outputs.json import JsonFile
+from scrapers.outputs.pipeline import OutputPipeline
+from scrapers.utilities.reader import Read
+from scrapers.utilities.saved_archive import pack_directory
+from scrapers.utilities.scheduler import Scheduler
 
 setup_logging()
 logger = logging.getLogger()
@@ -30,6 +37,26 @@ def parse_args():
     parser.add_argument(
         "-xl", "--excel_path", default=None, help="Path for Excel output"
     )
+    parser.add_argument(
+        "-xs",
+        "--excel_streaming",
+        default=False,
+        action="store_true",
+        help="Stream rows to Excel output as tabs are updated",
+    )
+    parser.add_argument(
+        "-cf",
+        "--columnar_folder",
+        default=None,
+        help="Folder for Parquet or Arrow output",
+    )
+    parser.add_argument(
+        "-cfo",
+        "--columnar_format",
+        default="parquet",
+        choices=ColumnarFile.formats,
+        help="Format for columnar output",
+    )
     parser.add_argument(
         "-gs",
         "--gsheet_auth",
@@ -51,6 +78,13 @@ def parse_args():
         action="store_true",
         help="Do not update json",
     )
+    parser.add_argument(
+        "-js",
+        "--json_shards",
+        default=False,
+        action="store_true",
+        help="Also write json split into an index and a file per country",
+    )
     parser.add_argument(
         "-ha",
         "--header_auths",
@@ -86,12 +120,145 @@ def parse_args():
         action="store_true",
         help="Use saved data",
     )
+    parser.add_argument(
+        "-sa",
+        "--saved_archive",
+        default=None,
+        help="Archive file to save downloaded data into or to use saved data from",
+    )
+    parser.add_argument(
+        "-sh",
+        "--shard",
+        default=None,
+        help="Scrape only shard I of N of the countries given as I/N where I is 0 to N-1",
+    )
+    parser.add_argument(
+        "-sb",
+        "--shard_bundle",
+        default=None,
+        help="File to save shard scraper results to instead of writing outputs",
+    )
+    parser.add_argument(
+        "-mb",
+        "--merge_bundles",
+        default=None,
+        help="Shard bundles to merge into outputs instead of scraping",
+    )
+    parser.add_argument(
+        "-mf",
+        "--memo_file",
+        default=None,
+        help="File to keep scraper results in to reuse when their inputs are unchanged",
+    )
+    parser.add_argument(
+        "-fps",
+        "--fts_plan_store",
+        default=None,
+        help="Json file to keep FTS plan locations in to reuse when plan totals are unchanged",
+    )
+    parser.add_argument(
+        "-hd",
+        "--history_db",
+        default=None,
+        help="SQLite file to append the performance of each run to",
+    )
+    parser.add_argument(
+        "-di",
+        "--daemon_interval",
+        default=None,
+        type=int,
+        help="Keep running and scrape every this many seconds",
+    )
+    parser.add_argument(
+        "-dt",
+        "--daemon_trigger",
+        default=None,
+        help="File which when created makes the daemon scrape immediately",
+    )
     args = parser.parse_args()
     return args
 
 
+def run_indicators(
+    configuration,
+    today,
+    errors_on_exit,
+    tabs,
+    updatetabs,
+    excel_path,
+    excel_streaming,
+    columnar_folder,
+    columnar_format,
+    gsheets,
+    nojson,
+    json_shards,
+    scrapers_to_run,
+    countries_override,
+    shard=None,
+    shard_bundle=None,
+    merge_bundles=None,
+    setup=None,
+    memo_file=None,
+    fts_plan_store=None,
+    history_db=None,
+):
+    noout = BaseOutput(updatetabs)
+    if excel_path:
+        if excel_streaming:
+            excelout = StreamingExcelFile(excel_path, tabs, updatetabs)
+        else:
+            excelout = ExcelFile(excel_path, tabs, updatetabs)
+    else:
+        excelout = noout
+    if columnar_folder:
+        columnarout = ColumnarFile(columnar_folder, updatetabs, columnar_format)
+    else:
+        columnarout = noout
+    if gsheets is None:
+        gsheets = noout
+    if nojson:
+        jsonout = noout
+    else:
+        jsonout = JsonFile(configuration["json"], updatetabs, shards=json_shards)
+    outputs = {
+        "gsheets": gsheets,
+        "excel": excelout,
+        "json": jsonout,
+        "columnar": columnarout,
+    }
+    with OutputPipeline(outputs) as pipeline:
+        outputs = pipeline.outputs
+        countries_to_save = get_indicators(
+            configuration,
+            today,
+            outputs,
+            updatetabs,
+            scrapers_to_run,
+            countries_override,
+            errors_on_exit,
+            shard=shard,
+            shard_bundle=shard_bundle,
+            merge_bundles=merge_bundles,
+            setup=setup,
+            memo_file=memo_file,
+            fts_plan_store=fts_plan_store,
+            history_db=history_db,
+        )
+        if not shard_bundle:
+            outputs["gsheets"].save()
+            outputs["json"].save(countries_to_save=countries_to_save)
+            outputs["excel"].save()
+            outputs["columnar"].save()
+    Read.requests.log()
+    if Read.connection_pool:
+        Read.connection_pool.log_stats()
+
+
 def main(
     excel_path,
+    excel_streaming,
+    columnar_folder,
+    columnar_format,
     gsheet_auth,
     updatesheets,
     updatetabs,
@@ -100,9 +267,19 @@ def main(
     basic_auths,
     param_auths,
     nojson,
+    json_shards,
     countries_override,
     save,
     use_saved,
+    saved_archive=None,
+    shard=None,
+    shard_bundle=None,
+    merge_bundles=None,
+    memo_file=None,
+    fts_plan_store=None,
+    history_db=None,
+    daemon_interval=None,
+    daemon_trigger=None,
     **ignore,
 ):
     logger.info(f"##### {lookup} version {VERSION:.1f} ####")
@@ -116,6 +293,9 @@ def main(
                 temp_folder,
                 save,
                 use_saved,
+                saved_archive=saved_archive,
+                connection_pool=configuration.get("connection_pool"),
+                spreadsheet_streaming=configuration.get("spreadsheet_streaming", False),
                 hdx_auth=configuration.get_api_key(),
                 header_auths=header_auths,
                 basic_auths=basic_auths,
@@ -130,11 +310,6 @@ def main(
                 logger.info("Updating all tabs")
             else:
                 logger.info(f"Updating only these tabs: {updatetabs}")
-            noout = BaseOutput(updatetabs)
-            if excel_path:
-                excelout = ExcelFile(excel_path, tabs, updatetabs)
-            else:
-                excelout = noout
             if gsheet_auth:
                 gsheets = GoogleSheets(
                     configuration["googlesheets"],
@@ -144,23 +319,73 @@ def main(
                     updatetabs,
                 )
             else:
-                gsheets = noout
-            if nojson:
-                jsonout = noout
-            else:
-                jsonout = JsonFile(configuration["json"], updatetabs)
-            outputs = {"gsheets": gsheets, "excel": excelout, "json": jsonout}
-            countries_to_save = get_indicators(
-                configuration,
-                today,
-                outputs,
-                updatetabs,
-                scrapers_to_run,
-                countries_override,
-                errors_on_exit,
-            )
-            jsonout.save(countries_to_save=countries_to_save)
-            excelout.save()
+                gsheets = None
+            options = {
+                "excel_path": excel_path,
+                "excel_streaming": excel_streaming,
+                "columnar_folder": columnar_folder,
+                "columnar_format": columnar_format,
+                "nojson": nojson,
+                "json_shards": json_shards,
+                "scrapers_to_run": scrapers_to_run,
+                "countries_override": countries_override,
+                "shard": shard,
+                "shard_bundle": shard_bundle,
+                "merge_bundles": merge_bundles,
+                "memo_file": memo_file,
+                "fts_plan_store": fts_plan_store,
+                "history_db": history_db,
+            }
+            if not daemon_interval:
+                run_indicators(
+                    configuration,
+                    today,
+                    errors_on_exit,
+                    tabs,
+                    updatetabs,
+                    gsheets=gsheets,
+                    **options,
+                )
+                if save and saved_archive:
+                    pack_directory("saved_data", saved_archive)
+                return
+            start = timer()
+            setup = setup_indicators(configuration, countries_override, shard=shard)
+            logger.info(f"Initialised in {timer() - start:.2f}s")
+            scheduler = Scheduler(daemon_interval, daemon_trigger)
+            for today in scheduler:
+                start = timer()
+                Read.refresh_readers(today)
+                if gsheets:
+                    gsheets = GoogleSheets(
+                        configuration["googlesheets"],
+                        gsheet_auth,
+                        updatesheets,
+                        tabs,
+                        updatetabs,
+                        gc=gsheets.gc,
+                    )
+                try:
+                    # Scrapers can modify the configuration they are given
+                    run_indicators(
+                        deepcopy(configuration.data),
+                        today,
+                        errors_on_exit,
+                        tabs,
+                        updatetabs,
+                        gsheets=gsheets,
+                        setup=setup,
+                        **options,
+                    )
+                    if save and saved_archive:
+                        pack_directory("saved_data", saved_archive)
+                except Exception:
+                    logger.exception(f"Cycle {scheduler.cycles} failed!")
+                errors_on_exit.log()
+                errors_on_exit.errors = list()
+                logger.info(
+                    f"Cycle {scheduler.cycles} finished in {timer() - start:.2f}s"
+                )
 
 
 if __name__ == "__main__":
@@ -208,6 +433,18 @@ if __name__ == "__main__":
         countries_override = args.countries_override.split(",")
     else:
         countries_override = None
+    if args.shard:
+        shard = tuple(int(x) for x in args.shard.split("/"))
+        shard_bundle = args.shard_bundle
+        if shard_bundle is None:
+            shard_bundle = f"shard_{shard[0]}_of_{shard[1]}.json"
+    else:
+        shard = None
+        shard_bundle = args.shard_bundle
+    if args.merge_bundles:
+        merge_bundles = args.merge_bundles.split(",")
+    else:
+        merge_bundles = None
     facade(
         main,
         hdx_read_only=True,
@@ -215,6 +452,9 @@ if __name__ == "__main__":
         user_agent_lookup=lookup,
         project_config_yaml=join("config", "project_configuration.yml"),
         excel_path=args.excel_path,
+        excel_streaming=args.excel_streaming,
+        columnar_folder=args.columnar_folder,
+        columnar_format=args.columnar_format,
         gsheet_auth=gsheet_auth,
         updatesheets=updatesheets,
         updatetabs=updatetabs,
@@ -223,7 +463,17 @@ if __name__ == "__main__":
         basic_auths=basic_auths,
         param_auths=param_auths,
         nojson=args.nojson,
+        json_shards=args.json_shards,
         countries_override=countries_override,
         save=args.save,
         use_saved=args.use_saved,
+        saved_archive=args.saved_archive,
+        shard=shard,
+        shard_bundle=shard_bundle,
+        merge_bundles=merge_bundles,
+        memo_file=args.memo_file,
+        fts_plan_store=args.fts_plan_store,
+        history_db=args.history_db,
+        daemon_interval=args.daemon_interval,
+        daemon_trigger=args.daemon_trigger,
     )
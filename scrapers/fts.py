@@ -1,20 +1,66 @@
+import asyncio
 import logging
 import re
+from functools import lru_cache
 
 from dateutil.relativedelta import relativedelta
 from hdx.scraper.base_scraper import BaseScraper
 from hdx.utilities.dictandlist import dict_of_lists_add
 from hdx.utilities.text import earliest_index, get_fraction_str, multiple_replace
 
+from .utilities.deadlines import finish
+from .utilities.projection import First, fields
+
 logger = logging.getLogger(__name__)
 
+funding_projection = {
+    "fundingTotals": {
+        "objects": First({"objectsBreakdown": [fields("id", "totalFunding")]})
+    }
+}
+plan_projection = fields(
+    "id",
+    "name",
+    "funding",
+    "customLocationCode",
+    requirements=fields("revisedRequirements"),
+    countries=[fields("id", "iso3")],
+    planType=fields("name"),
+)
+
+
+date_regex = re.compile(r"\d\d\d\d(-\d\d\d\d)?")
+brackets_regex = re.compile(r"[\(\[].*?[\)\]]")
+
+
+def index_funding(fundingobjects):
+    # Total funding by id from the first funding object keeping the first
+    # value for an id as it is the one a search of the breakdown would find
+    funding = dict()
+    if len(fundingobjects) != 0:
+        objectsbreakdown = fundingobjects[0].get("objectsBreakdown")
+        if objectsbreakdown:
+            for fundobj in objectsbreakdown:
+                fund_id = fundobj.get("id")
+                if fund_id and fund_id not in funding:
+                    funding[fund_id] = fundobj["totalFunding"]
+    return funding
+
 
 class FTSException(Exception):
     pass
 
 
 class FTS(BaseScraper):
-    def __init__(self, datasetinfo, today, outputs, countryiso3s):
+    def __init__(
+        self,
+        datasetinfo,
+        today,
+        outputs,
+        countryiso3s,
+        regional_countryiso3s=None,
+        plan_store=None,
+    ):
         base_hxltags = [
             "#value+funding+hrp+required+usd",
             "#value+funding+hrp+total+usd",
@@ -56,36 +102,70 @@ class FTS(BaseScraper):
         self.today = today
         self.outputs = outputs
         self.countryiso3s = countryiso3s
+        if regional_countryiso3s is None:
+            regional_countryiso3s = countryiso3s
+        self.regional_countryiso3s = regional_countryiso3s
+        self.plan_store = plan_store
 
-    def download(self, url, reader):
-        json = reader.download_json(url)
+    async def download(self, url, reader, projection=None):
+        if projection is not None:
+            projection = {"status": None, "data": projection}
+        json = await reader.download_json_async(url, projection=projection)
         status = json["status"]
         if status != "ok":
             raise FTSException(f"{url} gives status {status}")
         return json
 
-    def download_data(self, url, reader):
-        return self.download(url, reader)["data"]
+    async def download_data(self, url, reader, projection=None):
+        return (await self.download(url, reader, projection))["data"]
 
-    def get_covid_funding(self, plan_id, plan_name, fundingobjects):
-        if len(fundingobjects) != 0:
-            objectsbreakdown = fundingobjects[0].get("objectsBreakdown")
-            if objectsbreakdown:
-                for fundobj in objectsbreakdown:
-                    fund_id = fundobj.get("id")
-                    fund = fundobj["totalFunding"]
-                    if fund_id and fund_id == plan_id:
-                        logger.info(f"{plan_name}: Funding={fund}")
-                        return fund
-        return None
+    def get_covid_funding(self, plan_id, plan_name, covid_funding):
+        fund = covid_funding.get(plan_id)
+        if fund is not None:
+            logger.info(f"{plan_name}: Funding={fund}")
+        return fund
+
+    @staticmethod
+    def get_countryid_iso3mapping(plan):
+        countryid_iso3mapping = dict()
+        for country in plan["countries"]:
+            countryiso = country["iso3"]
+            if countryiso:
+                countryid = country["id"]
+                countryid_iso3mapping[str(countryid)] = countryiso
+        return countryid_iso3mapping
+
+    async def get_location_data(self, base_url, plan, reader):
+        plan_id = plan["id"]
+        if self.plan_store:
+            # Locations only need downloading again if the plan totals changed
+            allreq = plan["requirements"]["revisedRequirements"]
+            funding = plan.get("funding")
+            allfund = funding["totalFunding"] if funding else None
+            data = self.plan_store.get(plan_id, allreq, allfund)
+            if data is not None:
+                logger.info(f"{plan_id} totals unchanged, using stored locations")
+                return data
+        url = f"{base_url}1/fts/flow/custom-search?planid={plan_id}&groupby=location"
+        data = await self.download_data(
+            url,
+            reader,
+            {
+                "requirements": fields(
+                    "totalRevisedReqs",
+                    objects=[fields("id", "revisedRequirements")],
+                ),
+                "report3": funding_projection,
+            },
+        )
+        if self.plan_store:
+            self.plan_store.add(plan_id, allreq, allfund, data)
+        return data
 
     def get_requirements_and_funding_location(
-        self, base_url, plan, countryid_iso3mapping, reader
+        self, plan_id, data, countryid_iso3mapping
     ):
         allreqs, allfunds = dict(), dict()
-        plan_id = plan["id"]
-        url = f"{base_url}1/fts/flow/custom-search?planid={plan_id}&groupby=location"
-        data = self.download_data(url, reader)
         requirements = data["requirements"]
         totalreq = requirements["totalRevisedReqs"]
         countryreq_is_totalreq = True
@@ -126,14 +206,15 @@ class FTS(BaseScraper):
         return allreqs, allfunds
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def map_planname(origname):
+        # Plan names repeat across plans and runs so are only mapped and
+        # logged once
         name = None
         origname_simplified = origname.replace("  ", " ")
-        origname_simplified = re.sub(
-            r"\d\d\d\d(-\d\d\d\d)?", "", origname_simplified
-        )  # strip date
-        origname_simplified = re.sub(
-            r"[\(\[].*?[\)\]]", "", origname_simplified
+        origname_simplified = date_regex.sub("", origname_simplified)  # strip date
+        origname_simplified = brackets_regex.sub(
+            "", origname_simplified
         )  # strip stuff in brackets
         origname_simplified = origname_simplified.strip()
         origname_lower = origname_simplified.lower()
@@ -169,6 +250,9 @@ class FTS(BaseScraper):
         return name
 
     def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
         (
             hrp_requirements,
             hrp_funding,
@@ -200,13 +284,30 @@ class FTS(BaseScraper):
         reader = self.get_reader(self.name)
         curdate = self.today - relativedelta(months=1)
         url = f"{base_url}2/fts/flow/plan/overview/progress/{curdate.year}"
-        data = self.download_data(url, reader)
+        data = await self.download_data(url, reader, {"plans": [plan_projection]})
         plans = data["plans"]
         plan_ids = ",".join([str(plan["id"]) for plan in plans])
         url = f"{base_url}1/fts/flow/custom-search?emergencyid=911&planid={plan_ids}&groupby=plan"
-        funding_data = self.download_data(url, reader)
+        # Plans covering several countries need their location breakdowns
+        location_plans = [
+            plan
+            for plan in plans
+            if plan.get("customLocationCode") != "COVD"
+            and len(self.get_countryid_iso3mapping(plan)) > 1
+        ]
+        funding_data, *locations = await asyncio.gather(
+            self.download_data(url, reader, {"report3": funding_projection}),
+            *(
+                self.get_location_data(base_url, plan, reader)
+                for plan in location_plans
+            ),
+        )
+        locations = {
+            str(plan["id"]): location_data
+            for plan, location_data in zip(location_plans, locations)
+        }
         fundingtotals = funding_data["report3"]["fundingTotals"]
-        fundingobjects = fundingtotals["objects"]
+        covid_funding = index_funding(fundingtotals["objects"])
         reg_reqfund_output = [
             list(self.reg_reqfund_hxltags.keys()),
             list(self.reg_reqfund_hxltags.values()),
@@ -225,20 +326,23 @@ class FTS(BaseScraper):
             if plan.get("customLocationCode") == "COVD":
                 continue
 
-            countries = plan["countries"]
-            countryid_iso3mapping = dict()
-            for country in countries:
-                countryiso = country["iso3"]
-                if countryiso:
-                    countryid = country["id"]
-                    countryid_iso3mapping[str(countryid)] = countryiso
+            countryid_iso3mapping = self.get_countryid_iso3mapping(plan)
             if len(countryid_iso3mapping) == 0:
                 continue
             if len(countryid_iso3mapping) == 1:
                 countryiso = countryid_iso3mapping.popitem()[1]
-                if not countryiso or countryiso not in self.countryiso3s:
+                if not countryiso:
                     continue
                 plan_type = plan["planType"]["name"].lower()
+                if countryiso not in self.countryiso3s:
+                    # A shard of the countries still outputs all regional plans
+                    if (
+                        plan_type == "regional response plan"
+                        and countryiso in self.regional_countryiso3s
+                    ):
+                        plan_name = self.map_planname(plan_name)
+                        reg_reqfund_output.append([plan_name, allreq, allfund, allpct])
+                    continue
                 if plan_type == "humanitarian response plan":
                     if allreq:
                         hrp_requirements[countryiso] = allreq
@@ -248,7 +352,7 @@ class FTS(BaseScraper):
                         hrp_funding[countryiso] = allfund
                         hrp_percentage[countryiso] = allpct
                     covidfund = self.get_covid_funding(
-                        plan_id, plan_name, fundingobjects
+                        plan_id, plan_name, covid_funding
                     )
                     if covidfund is not None:
                         hrp_covid_funding[countryiso] = covidfund
@@ -261,7 +365,7 @@ class FTS(BaseScraper):
                         reg_reqfund_output.append([plan_name, allreq, allfund, allpct])
             else:
                 allreqs, allfunds = self.get_requirements_and_funding_location(
-                    base_url, plan, countryid_iso3mapping, reader
+                    plan["id"], locations[plan_id], countryid_iso3mapping
                 )
                 plan_name = self.map_planname(plan_name)
                 reg_reqfund_output.append([plan_name, allreq, allfund, allpct])
@@ -298,7 +402,10 @@ class FTS(BaseScraper):
             )
             other_funding[countryiso] = create_output(other_funding[countryiso])
             other_percentage[countryiso] = create_output(other_percentage[countryiso])
+        finish()
         tabname = "regional_reqfund"
         for output in self.outputs.values():
             output.update_tab(tabname, reg_reqfund_output)
+        if self.plan_store:
+            self.plan_store.save()
         self.datasetinfo["source_date"] = self.today
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from dateutil.relativedelta import relativedelta
@@ -5,6 +6,9 @@ from hdx.scraper.base_scraper import BaseScraper
 from hdx.utilities.dateparse import default_date, parse_date
 from hdx.utilities.dictandlist import dict_of_lists_add
 
+from .utilities.deadlines import finish
+from .utilities.projection import fields
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,11 +35,24 @@ class Inform(BaseScraper):
         self.today = today
         self.countryiso3s = countryiso3s
 
-    def download_data(self, date, base_url, input_cols, reader):
+    async def download_data(self, date, base_url, input_cols, reader):
         url = base_url % date.strftime("%b%Y")
         countries_index = dict()
+        projection = {
+            "results": [
+                fields(
+                    "iso3",
+                    "country_level",
+                    "individual_aggregated",
+                    "drivers",
+                    "Last updated",
+                    *input_cols,
+                )
+            ],
+            "next": None,
+        }
         while url:
-            json = reader.download_json(url)
+            json = await reader.download_json_async(url, projection=projection)
             for result in json["results"]:
                 countryiso3 = result["iso3"]
                 if len(countryiso3) != 1:
@@ -65,9 +82,8 @@ class Inform(BaseScraper):
             url = json["next"]
         return countries_index
 
-    def get_columns_by_date(self, date, base_url, reader, crisis_drivers, not_found):
+    def get_columns_by_date(self, countries_index, crisis_drivers, not_found):
         input_col = self.get_headers("national")[0][0]
-        countries_index = self.download_data(date, base_url, [input_col], reader)
         valuedict = dict()
         for countryiso3, driver in crisis_drivers.items():
             country_index = countries_index.get(countryiso3)
@@ -82,9 +98,8 @@ class Inform(BaseScraper):
             valuedict[countryiso3] = val
         return valuedict
 
-    def get_latest_columns(self, date, base_url, reader):
+    def get_latest_columns(self, countries_index):
         input_cols = self.get_headers("national")[0][:2]
-        countries_index = self.download_data(date, base_url, input_cols, reader)
         valuedicts = self.get_values("national")[:2]
         crisis_drivers = dict()
         max_date = default_date
@@ -104,21 +119,36 @@ class Inform(BaseScraper):
         return valuedicts, crisis_drivers, max_date
 
     def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
         reader = self.get_reader(self.name)
         reader.read_hdx_metadata(self.datasetinfo)
         base_url = self.datasetinfo["url"]
         start_date = self.today - relativedelta(months=1)
+        # The latest month has two columns and the five before it one
+        input_cols = self.get_headers("national")[0]
+        countries_indexes = await asyncio.gather(
+            self.download_data(start_date, base_url, input_cols[:2], reader),
+            *(
+                self.download_data(
+                    start_date - relativedelta(months=i),
+                    base_url,
+                    input_cols[:1],
+                    reader,
+                )
+                for i in range(1, 6, 1)
+            ),
+        )
+        finish()
         valuedictsfortoday, crisis_drivers, max_date = self.get_latest_columns(
-            start_date, base_url, reader
+            countries_indexes[0]
         )
         severity_indices = [valuedictsfortoday[0]]
         not_found = set()
-        for i in range(1, 6, 1):
-            prevdate = start_date - relativedelta(months=i)
+        for countries_index in countries_indexes[1:]:
             valuedictfordate = self.get_columns_by_date(
-                prevdate,
-                base_url,
-                reader,
+                countries_index,
                 crisis_drivers,
                 not_found,
             )
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 import hxl
@@ -5,6 +6,8 @@ from hdx.data.dataset import Dataset
 from hdx.scraper.base_scraper import BaseScraper
 from hdx.utilities.dictandlist import dict_of_lists_add
 
+from .utilities.deadlines import finish
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,29 +20,50 @@ class IOMDTM(BaseScraper):
         )
         self.today = today
         self.adminone = adminone
+        self.columns = (
+            "#adm1+code",
+            "#adm2+code",
+            "#adm1+name",
+            "#loc",
+            "#affected+idps+ind",
+        )
+
+    async def read_country_data(self, reader, ds_row):
+        countryiso3 = ds_row["Country ISO"]
+        dataset_name = ds_row["Dataset Name"]
+        if not dataset_name:
+            logger.warning(f"No IOM DTM data for {countryiso3}.")
+            return None
+        dataset = await reader.read_dataset_async(dataset_name)
+        if not dataset:
+            logger.warning(f"No IOM DTM data for {countryiso3}.")
+            return None
+        resource = dataset.get_resource()
+        return await reader.read_hxl_resource_async(
+            countryiso3, resource, "IOM DTM data", columns=self.columns
+        )
 
     def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
         iom_url = self.datasetinfo["url"]
         reader = self.get_reader()
         headers, iterator = reader.get_tabular_rows(
             iom_url, headers=1, dict_form=True, format="csv"
         )
         rows = list(iterator)
+        reader.read_datasets(ds_row["Dataset Name"] for ds_row in rows)
+        # Countries are downloaded together and their rows read in order
+        countries_data = await asyncio.gather(
+            *(self.read_country_data(reader, ds_row) for ds_row in rows)
+        )
+        finish()
         idpsdict = dict()
-        for ds_row in rows:
-            countryiso3 = ds_row["Country ISO"]
-            dataset_name = ds_row["Dataset Name"]
-            if not dataset_name:
-                logger.warning(f"No IOM DTM data for {countryiso3}.")
-                continue
-            dataset = reader.read_dataset(dataset_name)
-            if not dataset:
-                logger.warning(f"No IOM DTM data for {countryiso3}.")
-                continue
-            resource = dataset.get_resource()
-            data = reader.read_hxl_resource(countryiso3, resource, "IOM DTM data")
+        for ds_row, data in zip(rows, countries_data):
             if data is None:
                 continue
+            countryiso3 = ds_row["Country ISO"]
             pcodes_found = False
             for row in data:
                 pcode = row.get("#adm1+code")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime
 
@@ -5,6 +6,9 @@ from dateutil.relativedelta import relativedelta
 from hdx.location.country import Country
 from hdx.scraper.base_scraper import BaseScraper
 
+from .utilities.deadlines import finish
+from .utilities.projection import First, fields
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,10 +63,15 @@ class IPC(BaseScraper):
         return projection_number, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
 
     def run(self):
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
         base_url = self.datasetinfo["url"]
         reader = self.get_reader(self.name)
         countryisos = set()
-        json = reader.download_json(f"{base_url}/analyses?type=A")
+        json = await reader.download_json_async(
+            f"{base_url}/analyses?type=A", projection=[fields("country")]
+        )
         for analysis in json:
             countryiso2 = analysis["country"]
             countryiso3 = Country.get_iso3_from_iso2(countryiso2)
@@ -83,9 +92,40 @@ class IPC(BaseScraper):
         projection_names = ["Current", "First Projection", "Second Projection"]
         projection_mappings = ["", "_projected", "_second_projected"]
         analysis_dates = set()
-        for countryiso3, countryiso2 in sorted(countryisos):
-            url = f"{base_url}/population?country={countryiso2}"
-            country_data = reader.download_json(url)
+        population_keys = [
+            f"phase{phase}_population{projection_mapping}"
+            for projection_mapping in projection_mappings
+            for phase in self.phases
+        ]
+        area_projection = [fields("name", *population_keys)]
+        projection = First(
+            fields(
+                "analysis_date",
+                "current_period_dates",
+                "projected_period_dates",
+                "second_projected_period_dates",
+                *population_keys,
+                *[
+                    f"estimated_population{projection_mapping}"
+                    for projection_mapping in projection_mappings
+                ],
+                areas=area_projection,
+                groups=area_projection,
+            )
+        )
+        countryisos = sorted(countryisos)
+        countries_data = await asyncio.gather(
+            *(
+                reader.download_json_async(
+                    f"{base_url}/population?country={countryiso2}",
+                    projection=projection,
+                )
+                for _, countryiso2 in countryisos
+            )
+        )
+        reader.read_hdx_metadata(self.datasetinfo)
+        finish()
+        for (countryiso3, _), country_data in zip(countryisos, countries_data):
             if country_data:
                 country_data = country_data[0]
             else:
@@ -127,4 +167,3 @@ class IPC(BaseScraper):
                         subnational_populations[pcode] = cur_sum + sum
                     else:
                         subnational_populations[pcode] = sum
-        reader.read_hdx_metadata(self.datasetinfo)
@@ -3,8 +3,6 @@ from os.path import join
 
 from hdx.location.adminlevel import AdminLevel
 from hdx.location.country import Country
-from hdx.scraper.runner import Runner
-from hdx.scraper.utilities.fallbacks import Fallbacks
 from hdx.scraper.utilities.region_lookup import RegionLookup
 from hdx.scraper.utilities.sources import Sources
 from hdx.scraper.utilities.writer import Writer
@@ -14,22 +12,36 @@ from .inform import Inform
 from .iom_dtm import IOMDTM
 from .ipc import IPC
 from .unhcr import UNHCR
+from .utilities.aggregation import AggregationEngine
+from .utilities.deadlines import Deadlines
+from .utilities.fallbacks import add_fallbacks
+from .utilities.history import RunHistory
+from .utilities.memo import Memo
+from .utilities.planstore import PlanStore
+from .utilities.reader import Read
+from .utilities.runner import Runner
+from .utilities.shards import TabRecorder, get_shard, load_bundles, save_bundle
+from .utilities.valuestore import ValueStore
 from .whowhatwhere import WhoWhatWhere
 
 logger = logging.getLogger(__name__)
 
+# Run first as other scrapers use their populations
+population_scrapers = (
+    "population_national",
+    "population_subnational",
+    "population_allregions",
+)
 
-def get_indicators(
-    configuration,
-    today,
-    outputs,
-    tabs,
-    scrapers_to_run=None,
-    countries_override=None,
-    errors_on_exit=None,
-    use_live=True,
-    fallbacks_root="",
-):
+fallbacks_levels_mapping = {
+    "global": "allregions_data",
+    "regional": "regional_data",
+    "national": "national_data",
+    "subnational": "subnational_data",
+}
+
+
+def setup_indicators(configuration, countries_override=None, use_live=True, shard=None):
     Country.countriesdata(
         use_live=use_live,
         country_name_overrides=configuration["country_name_overrides"],
@@ -40,32 +52,29 @@ def get_indicators(
         countries = countries_override
     else:
         countries = configuration["countries"]
+    all_countries = countries
+    if shard:
+        countries = get_shard(countries, *shard)
+        logger.info(f"Scraping shard {shard[0]} of {shard[1]}: {countries}")
     hrp_countries = configuration["HRPs"]
     configuration["countries_fuzzy_try"] = countries
     adminlevel = AdminLevel(configuration)
     adminlevel.setup_from_admin_info(configuration["admin_info"])
     regional_configuration = configuration["regional"]
     RegionLookup.load(regional_configuration, countries, {"HRPs": hrp_countries})
-    if fallbacks_root is not None:
-        fallbacks_path = join(fallbacks_root, configuration["json"]["output"])
-        levels_mapping = {
-            "global": "allregions_data",
-            "regional": "regional_data",
-            "national": "national_data",
-            "subnational": "subnational_data",
-        }
-        Fallbacks.add(
-            fallbacks_path,
-            levels_mapping=levels_mapping,
-            sources_key="sources_data",
-        )
-    Sources.set_default_source_date_format("%Y-%m-%d")
-    runner = Runner(
-        countries,
-        today,
-        errors_on_exit=errors_on_exit,
-        scrapers_to_run=scrapers_to_run,
-    )
+    return countries, all_countries, adminlevel
+
+
+def add_scrapers(
+    runner,
+    configuration,
+    today,
+    outputs,
+    countries,
+    all_countries,
+    adminlevel,
+    plan_store=None,
+):
     configurable_scrapers = dict()
     for level_name in "national", "subnational", "allregions":
         if level_name == "allregions":
@@ -81,8 +90,9 @@ def get_indicators(
             suffix=suffix,
         )
     ipc = IPC(configuration["ipc"], today, countries, adminlevel)
-
-    fts = FTS(configuration["fts"], today, outputs, countries)
+    fts = FTS(
+        configuration["fts"], today, outputs, countries, all_countries, plan_store
+    )
     unhcr = UNHCR(configuration["unhcr"], today, countries)
     inform = Inform(configuration["inform"], today, countries)
     national_names = configurable_scrapers["national"] + [
@@ -111,23 +121,124 @@ def get_indicators(
             iomdtm,
         )
     )
+    return configurable_scrapers, national_names, subnational_names
 
-    regional_names = runner.add_aggregators(
-        True,
-        regional_configuration["aggregate"],
-        "national",
-        "regional",
-        RegionLookup.iso3_to_regions["ALL"],
-        force_add_to_run=True,
-    )
 
-    runner.run(
-        prioritise_scrapers=(
-            "population_national",
-            "population_subnational",
-            "population_allregions",
+def get_indicators(
+    configuration,
+    today,
+    outputs,
+    tabs,
+    scrapers_to_run=None,
+    countries_override=None,
+    errors_on_exit=None,
+    use_live=True,
+    fallbacks_root="",
+    shard=None,
+    shard_bundle=None,
+    merge_bundles=None,
+    setup=None,
+    memo_file=None,
+    fts_plan_store=None,
+    history_db=None,
+):
+    if setup is None:
+        setup = setup_indicators(configuration, countries_override, use_live, shard)
+    countries, all_countries, adminlevel = setup
+    adminlevel.init_matches_errors()
+    if shard_bundle:
+        # Only the scraper results are needed from a shard
+        recorder = TabRecorder(tabs)
+        outputs = {"bundle": recorder}
+    hrp_countries = configuration["HRPs"]
+    regional_configuration = configuration["regional"]
+    if fallbacks_root is not None:
+        fallbacks_path = join(fallbacks_root, configuration["json"]["output"])
+        add_fallbacks(
+            fallbacks_path,
+            levels_mapping=fallbacks_levels_mapping,
+            sources_key="sources_data",
         )
+    Sources.set_default_source_date_format("%Y-%m-%d")
+    runner = Runner(
+        countries,
+        today,
+        errors_on_exit=errors_on_exit,
+        scrapers_to_run=scrapers_to_run,
     )
+    if fts_plan_store:
+        plan_store = PlanStore(fts_plan_store)
+    else:
+        plan_store = None
+    configurable_scrapers, national_names, subnational_names = add_scrapers(
+        runner,
+        configuration,
+        today,
+        outputs,
+        countries,
+        all_countries,
+        adminlevel,
+        plan_store,
+    )
+
+    if merge_bundles:
+        tab_updates, merged_countries = load_bundles(runner, merge_bundles, adminlevel)
+        missing = [country for country in countries if country not in merged_countries]
+        if missing:
+            logger.warning(f"No bundle has countries {missing}")
+        for tabname, rows in tab_updates.items():
+            for output in outputs.values():
+                output.update_tab(tabname, rows)
+
+    if memo_file:
+        memo = Memo(
+            memo_file, today, countries, configuration.get("memo_scrapers", tuple())
+        )
+        memo.install(runner)
+    else:
+        memo = None
+
+    timeouts = configuration.get("timeouts")
+    if timeouts:
+        Deadlines(timeouts).wrap_runner(runner)
+
+    if shard_bundle:
+        # Regions span shards so are aggregated when the bundles are merged
+        regional_names = list()
+    else:
+        regional_names = runner.add_aggregators(
+            True,
+            regional_configuration["aggregate"],
+            "national",
+            "regional",
+            RegionLookup.iso3_to_regions["ALL"],
+            force_add_to_run=True,
+        )
+        AggregationEngine(runner, regional_names, "national").install()
+    if configuration.get("value_store"):
+        ValueStore({"national": countries, "subnational": adminlevel.pcodes}).install(
+            runner
+        )
+
+    if history_db:
+        history = RunHistory(history_db, today, shard)
+        history.install(runner)
+    else:
+        history = None
+
+    if merge_bundles:
+        runner.run(what_to_run=regional_names)
+    else:
+        runner.run(prioritise_scrapers=population_scrapers)
+
+    if memo:
+        memo.save()
+    if history:
+        history.save(Read.requests)
+
+    if shard_bundle:
+        save_bundle(shard_bundle, runner, countries, recorder.tabs)
+        return countries
 
     writer = Writer(runner, outputs)
     if "national" in tabs:
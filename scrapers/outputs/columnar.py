@@ -0,0 +1,107 @@
+import logging
+from os import makedirs
+from os.path import exists, join
+
+from hdx.scraper.outputs.base import BaseOutput
+from hdx.utilities.text import get_numeric_if_possible
+
+try:
+    import pyarrow
+    from pyarrow import feather, parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_column_type(values):
+    column_type = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return "string"
+        if isinstance(value, float):
+            column_type = "float"
+        elif column_type is None:
+            column_type = "int"
+    return column_type or "string"
+
+
+def get_column(values):
+    values = [None if value in (None, "") else value for value in values]
+    # Only columns with numbers are numeric so that strings like codes keep
+    # their zero padding
+    if not any(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in values
+    ):
+        column_type = "string"
+    else:
+        numbers = [
+            None if value is None else get_numeric_if_possible(value)
+            for value in values
+        ]
+        column_type = get_column_type(numbers)
+    if column_type == "int":
+        return pyarrow.array(numbers, type=pyarrow.int64())
+    if column_type == "float":
+        numbers = [None if value is None else float(value) for value in numbers]
+        return pyarrow.array(numbers, type=pyarrow.float64())
+    values = [None if value is None else str(value) for value in values]
+    return pyarrow.array(values, type=pyarrow.string())
+
+
+class ColumnarFile(BaseOutput):
+    formats = ("parquet", "arrow")
+
+    def __init__(self, folder, updatetabs, format="parquet"):
+        if pyarrow is None:
+            raise ImportError("pyarrow is needed for Parquet/Arrow output!")
+        if format not in self.formats:
+            raise ValueError(f"Invalid columnar format {format}!")
+        super().__init__(updatetabs)
+        self.folder = folder
+        self.format = format
+        self.tables = dict()
+
+    def update_tab(self, tabname, values, hxltags=None, **kwargs):
+        if tabname not in self.updatetabs:
+            return
+        if isinstance(values, list):
+            headers = [str(header) for header in values[0]]
+            tags = list(values[1])
+            rows = values[2:]
+            columns = [[row[i] for row in rows] for i in range(len(headers))]
+        else:
+            headers = list(values.columns.values)
+            if hxltags:
+                tags = [hxltags.get(header, "") for header in headers]
+            else:
+                tags = ["" for _ in headers]
+            columns = [values[header].tolist() for header in headers]
+        fields = list()
+        arrays = list()
+        for header, hxltag, column in zip(headers, tags, columns):
+            array = get_column(column)
+            arrays.append(array)
+            fields.append(
+                pyarrow.field(header, array.type, metadata={"hxltag": hxltag or ""})
+            )
+        self.tables[tabname] = pyarrow.Table.from_arrays(
+            arrays, schema=pyarrow.schema(fields)
+        )
+
+    def save(self, **kwargs):
+        if not exists(self.folder):
+            makedirs(self.folder)
+        filepaths = list()
+        for tabname, table in self.tables.items():
+            filepath = join(self.folder, f"{tabname}.{self.format}")
+            logger.info(f"Writing {self.format} to {filepath}")
+            if self.format == "parquet":
+                parquet.write_table(table, filepath)
+            else:
+                feather.write_feather(table, filepath, compression="uncompressed")
+            filepaths.append(filepath)
+        return filepaths
@@ -0,0 +1,52 @@
+import logging
+from timeit import default_timer as timer
+
+from hdx.scraper.outputs import excelfile
+from hdx.scraper.outputs.base import BaseOutput
+from openpyxl import Workbook
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingExcelFile(excelfile.ExcelFile):
+    def __init__(self, excel_path, tabs, updatetabs):
+        BaseOutput.__init__(self, updatetabs)
+        # Rows of write only worksheets are streamed to temporary files
+        self.workbook = Workbook(write_only=True)
+        self.excel_path = excel_path
+        self.tabs = tabs
+        self.worksheets = dict()
+        self.build_time = 0.0
+
+    def update_tab(self, tabname, values, hxltags=None):
+        if tabname not in self.updatetabs:
+            return
+        start = timer()
+        sheetname = self.tabs[tabname]
+        tab = self.worksheets.get(sheetname)
+        if tab is not None:
+            logger.warning(f"Replacing tab {sheetname} written earlier")
+            tab.close()
+            self.workbook.remove(tab)
+        tab = self.workbook.create_sheet(sheetname)
+        self.worksheets[sheetname] = tab
+        if isinstance(values, list):
+            for row in values:
+                tab.append(row)
+        else:
+            headers = list(values.columns.values)
+            tab.append(headers)
+            if hxltags:
+                tab.append([hxltags.get(header, "") for header in headers])
+            for row in dataframe_to_rows(values, index=False, header=False):
+                tab.append(row)
+        self.build_time += timer() - start
+
+    def save(self):
+        start = timer()
+        self.workbook.save(self.excel_path)
+        self.build_time += timer() - start
+        logger.info(
+            f"Built workbook {self.excel_path} with {len(self.worksheets)} tabs in {self.build_time:.2f}s"
+        )
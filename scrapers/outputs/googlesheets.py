@@ -0,0 +1,195 @@
+import json
+import logging
+
+import gspread
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from hdx.scraper.outputs import googlesheets
+from hdx.scraper.outputs.base import BaseOutput
+
+try:
+    import numpy
+    from pandas import DataFrame
+except ImportError:
+    DataFrame = None
+
+logger = logging.getLogger(__name__)
+
+# Unchanged cells between changed ones are rewritten rather than split into
+# another range if there are no more than this many of them
+MAX_GAP = 2
+
+
+def normalise_value(value):
+    if value is None:
+        return ""
+    return value
+
+
+def get_changed_runs(old_row, new_row):
+    runs = list()
+    start = None
+    end = None
+    for i in range(max(len(old_row), len(new_row))):
+        old_value = normalise_value(old_row[i]) if i < len(old_row) else ""
+        new_value = normalise_value(new_row[i]) if i < len(new_row) else ""
+        if old_value == new_value:
+            continue
+        if start is not None and i - end - 1 <= MAX_GAP:
+            end = i
+            continue
+        if start is not None:
+            runs.append((start, end))
+        start = end = i
+    if start is not None:
+        runs.append((start, end))
+    return runs
+
+
+def get_cells(row, start, end):
+    return [
+        normalise_value(row[i]) if i < len(row) else "" for i in range(start, end + 1)
+    ]
+
+
+def get_changed_ranges(old_rows, new_rows):
+    # Returns list of (first row index, first column index, values). Rows
+    # following each other with a single identical run of changed columns are
+    # merged into one range.
+    ranges = list()
+    previous = None
+    for i in range(max(len(old_rows), len(new_rows))):
+        old_row = old_rows[i] if i < len(old_rows) else []
+        new_row = new_rows[i] if i < len(new_rows) else []
+        runs = get_changed_runs(old_row, new_row)
+        if len(runs) == 1 and previous and previous[0] == (i, runs[0]):
+            start, end = runs[0]
+            previous[1][2].append(get_cells(new_row, start, end))
+            previous[0] = (i + 1, runs[0])
+            continue
+        previous = None
+        for start, end in runs:
+            changed_range = (i, start, [get_cells(new_row, start, end)])
+            ranges.append(changed_range)
+            if len(runs) == 1:
+                previous = [(i + 1, runs[0]), changed_range]
+    return ranges
+
+
+class GoogleSheets(googlesheets.GoogleSheets):
+    def __init__(
+        self,
+        configuration,
+        gsheet_auth,
+        updatesheets,
+        tabs,
+        updatetabs,
+        gc=None,
+    ):
+        BaseOutput.__init__(self, updatetabs)
+        if gc is None:
+            info = json.loads(gsheet_auth)
+            scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+            gc = gspread.service_account_from_dict(info, scopes=scopes)
+        self.gc = gc
+        self.configuration = configuration
+        if updatesheets is None:
+            updatesheets = self.configuration.keys()
+            logger.info("Updating all spreadsheets")
+        else:
+            logger.info(f"Updating only these spreadsheets: {updatesheets}")
+        self.updatesheets = updatesheets
+        self.tabs = tabs
+        self.pending = dict()
+        self.stats = {"calls": 0, "bytes": 0, "cells": 0}
+
+    def update_tab(self, tabname, values, hxltags=None, limit=None):
+        if tabname not in self.updatetabs:
+            return
+        if not isinstance(values, list):
+            headers = list(values.columns.values)
+            rows = [headers]
+            if hxltags:
+                rows.append([hxltags.get(header, "") for header in headers])
+            if limit is not None:
+                values = values.head(limit)
+            df = values.copy(deep=True)
+            df.replace(numpy.inf, "inf", inplace=True)
+            df.replace(-numpy.inf, "-inf", inplace=True)
+            df.fillna("NaN", inplace=True)
+            rows.extend(df.values.tolist())
+            values = rows
+        self.pending[tabname] = [list(row) for row in values]
+
+    def update_spreadsheet(self, url):
+        spreadsheet = self.gc.open_by_url(url)
+        worksheets = {
+            worksheet.title: worksheet for worksheet in spreadsheet.worksheets()
+        }
+        sheetnames = [self.tabs[tabname] for tabname in self.pending]
+        response = spreadsheet.values_batch_get(
+            [absolute_range_name(sheetname) for sheetname in sheetnames],
+            params={"valueRenderOption": "UNFORMATTED_VALUE"},
+        )
+        calls = 3
+        data = list()
+        resize_requests = list()
+        cells = 0
+        full_cells = 0
+        for sheetname, rows, value_range in zip(
+            sheetnames, self.pending.values(), response["valueRanges"]
+        ):
+            worksheet = worksheets[sheetname]
+            nocols = max((len(row) for row in rows), default=0)
+            for dimension, count, length in (
+                ("ROWS", worksheet.row_count, len(rows)),
+                ("COLUMNS", worksheet.col_count, nocols),
+            ):
+                if length > count:
+                    resize_requests.append(
+                        {
+                            "appendDimension": {
+                                "sheetId": worksheet.id,
+                                "dimension": dimension,
+                                "length": length - count,
+                            }
+                        }
+                    )
+            full_cells += len(rows) * nocols
+            for rowindex, colindex, values in get_changed_ranges(
+                value_range.get("values", []), rows
+            ):
+                start = rowcol_to_a1(rowindex + 1, colindex + 1)
+                end = rowcol_to_a1(rowindex + len(values), colindex + len(values[0]))
+                data.append(
+                    {
+                        "range": absolute_range_name(sheetname, f"{start}:{end}"),
+                        "values": values,
+                    }
+                )
+                cells += len(values) * len(values[0])
+        nobytes = 0
+        if resize_requests:
+            body = {"requests": resize_requests}
+            spreadsheet.batch_update(body)
+            calls += 1
+            nobytes += len(json.dumps(body))
+        if data:
+            body = {"valueInputOption": "RAW", "data": data}
+            spreadsheet.values_batch_update(body)
+            calls += 1
+            nobytes += len(json.dumps(body))
+        logger.info(
+            f"Updated {cells} of {full_cells} cells in {len(data)} ranges using {calls} API calls sending {nobytes} bytes"
+        )
+        self.stats["calls"] += calls
+        self.stats["bytes"] += nobytes
+        self.stats["cells"] += cells
+
+    def save(self, **kwargs):
+        if not self.pending:
+            return
+        for sheet in self.configuration:
+            if sheet not in self.updatesheets:
+                continue
+            self.update_spreadsheet(self.configuration[sheet])
+        self.pending = dict()
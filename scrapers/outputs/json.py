@@ -0,0 +1,217 @@
+import gzip
+import json
+import logging
+from hashlib import sha256
+from os import makedirs, remove, replace
+from os.path import exists, join, relpath
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from hdx.scraper.outputs import json as hdx_json
+from hdx.utilities.saver import save_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+def escape_pointer(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def get_patch(old, new, path=""):
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    if isinstance(new, dict):
+        patch = list()
+        for key, value in old.items():
+            keypath = f"{path}/{escape_pointer(key)}"
+            if key not in new:
+                patch.append({"op": "remove", "path": keypath})
+            else:
+                patch.extend(get_patch(value, new[key], keypath))
+        for key, value in new.items():
+            if key not in old:
+                keypath = f"{path}/{escape_pointer(key)}"
+                patch.append({"op": "add", "path": keypath, "value": value})
+        return patch
+    if isinstance(new, list):
+        patch = list()
+        common = min(len(old), len(new))
+        for i in range(common):
+            patch.extend(get_patch(old[i], new[i], f"{path}/{i}"))
+        # Remove from the end so that indices stay valid
+        for i in reversed(range(common, len(old))):
+            patch.append({"op": "remove", "path": f"{path}/{i}"})
+        for value in new[common:]:
+            patch.append({"op": "add", "path": f"{path}/-", "value": value})
+        return patch
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def read_bytes(path):
+    if not exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_bytes(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    replace(temp_path, path)
+
+
+def dump_json(object):
+    # Same formatting as save_json
+    return json.dumps(object, separators=(", ", ": ")).encode("utf-8")
+
+
+class JsonFile(hdx_json.JsonFile):
+    def __init__(self, configuration, updatetabs, suffix="_data", shards=False):
+        super().__init__(configuration, updatetabs, suffix)
+        self.shards = shards
+
+    def save(self, folder=None, **kwargs):
+        filepaths = list()
+        if folder and not exists(folder):
+            makedirs(folder)
+        # Unique to this save so that runs writing at the same time, like
+        # shards, do not share it
+        staging_folder = mkdtemp(prefix=".staging_", dir=folder or ".")
+        try:
+            staged_paths = super().save(folder=staging_folder, **kwargs)
+            for i, staged_path in enumerate(staged_paths):
+                filepath = relpath(staged_path, staging_folder)
+                if folder:
+                    filepath = join(folder, filepath)
+                new_bytes = read_bytes(staged_path)
+                old_bytes = read_bytes(filepath)
+                filepaths.append(filepath)
+                if i == 0:
+                    # Empty when nothing changed so an old delta is not reapplied
+                    self.save_delta(filepath, old_bytes, new_bytes, folder)
+                if new_bytes == old_bytes:
+                    logger.info(f"{filepath} is unchanged so not writing it")
+                    continue
+                write_bytes(filepath, new_bytes)
+        finally:
+            rmtree(staging_folder, ignore_errors=True)
+        if self.shards:
+            filepaths.extend(self.save_shards(folder))
+        return filepaths
+
+    def save_delta(self, filepath, old_bytes, new_bytes, folder=None):
+        delta_path = self.configuration.get("delta_output")
+        if not delta_path:
+            return
+        if folder:
+            delta_path = join(folder, delta_path)
+        old = {}
+        if old_bytes is not None:
+            try:
+                old = json.loads(old_bytes)
+            except ValueError:
+                # The delta is then a full snapshot of the new output
+                logger.warning(f"{filepath} is unreadable so writing a full delta")
+                old_bytes = None
+        new = json.loads(new_bytes)
+        changed = [key for key in new if old.get(key) != new[key]]
+        changed.extend(key for key in old if key not in new)
+        if changed:
+            logger.info(f"Sections changed in {filepath}: {', '.join(changed)}")
+        delta = {
+            "base": sha256(old_bytes).hexdigest() if old_bytes else None,
+            "target": sha256(new_bytes).hexdigest(),
+            "patch": get_patch(old, new),
+        }
+        logger.info(f"Writing JSON delta to {delta_path}")
+        temp_path = f"{delta_path}.tmp"
+        save_json(delta, temp_path)
+        replace(temp_path, delta_path)
+
+    def save_shard(self, filepath, object, compress):
+        filepaths = [filepath]
+        data = dump_json(object)
+        variants = [(filepath, data)]
+        if "gzip" in compress:
+            variants.append((f"{filepath}.gz", gzip.compress(data, mtime=0)))
+        if "brotli" in compress:
+            if brotli is None:
+                logger.warning("brotli is not installed so not compressing with it")
+            else:
+                variants.append((f"{filepath}.br", brotli.compress(data)))
+        for path, data in variants:
+            if path != filepath:
+                filepaths.append(path)
+            if read_bytes(path) == data:
+                continue
+            write_bytes(path, data)
+        return filepaths
+
+    def remove_old_shards(self, shards_folder, index_path, countries):
+        # Shards of countries in the previous index that are no longer output
+        old_index = read_bytes(index_path)
+        if old_index is None:
+            return
+        try:
+            old_countries = json.loads(old_index).get("countries", {})
+        except (ValueError, AttributeError):
+            logger.warning(f"{index_path} is unreadable so not removing old shards")
+            return
+        for countryiso3, filename in old_countries.items():
+            if countryiso3 in countries:
+                continue
+            filepath = join(shards_folder, filename)
+            for path in (filepath, f"{filepath}.gz", f"{filepath}.br"):
+                if exists(path):
+                    logger.info(f"Removing shard {path}")
+                    remove(path)
+
+    def save_shards(self, folder=None):
+        configuration = self.configuration["shards"]
+        shards_folder = configuration["folder"]
+        if folder:
+            shards_folder = join(folder, shards_folder)
+        if not exists(shards_folder):
+            makedirs(shards_folder)
+        compress = configuration.get("compress", [])
+        index = {}
+        for key in configuration["index"]:
+            fullname = f"{key}{self.suffix}"
+            if fullname in self.json:
+                index[fullname] = self.json[fullname]
+        countries = dict()
+        for key in configuration["countries"]:
+            fullname = f"{key}{self.suffix}"
+            for row in self.json.get(fullname, []):
+                countryiso3 = row.get("#country+code")
+                if not countryiso3:
+                    continue
+                country = countries.get(countryiso3)
+                if country is None:
+                    country = countries[countryiso3] = {}
+                rows = country.get(fullname)
+                if rows is None:
+                    rows = country[fullname] = []
+                rows.append(row)
+        index["countries"] = {
+            countryiso3: f"{countryiso3}.json" for countryiso3 in countries
+        }
+        logger.info(f"Writing {len(countries)} country shards to {shards_folder}")
+        index_path = join(shards_folder, configuration["index_output"])
+        self.remove_old_shards(shards_folder, index_path, countries)
+        filepaths = self.save_shard(index_path, index, compress)
+        for countryiso3, country in countries.items():
+            filepaths.extend(
+                self.save_shard(
+                    join(shards_folder, f"{countryiso3}.json"), country, compress
+                )
+            )
+        return filepaths
@@ -0,0 +1,66 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from hdx.scraper.outputs.base import BaseOutput
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedOutput(BaseOutput):
+    def __init__(self, pipeline, name, output):
+        super().__init__(output.updatetabs)
+        self.pipeline = pipeline
+        self.name = name
+        self.output = output
+
+    def update_tab(self, tabname, values, *args, **kwargs):
+        if tabname not in self.updatetabs:
+            return
+        # Callers may keep modifying their rows after handing them over
+        if isinstance(values, list):
+            values = [list(row) for row in values]
+        else:
+            values = values.copy()
+        self.pipeline.submit(
+            self.name, self.output.update_tab, tabname, values, *args, **kwargs
+        )
+
+    def save(self, **kwargs):
+        self.pipeline.submit(self.name, self.output.save, **kwargs)
+
+
+class OutputPipeline:
+    def __init__(self, outputs):
+        # One worker per output so that each output sees its calls in order
+        # while different outputs are written concurrently
+        self.executors = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"output_{name}")
+            for name in outputs
+        }
+        self.outputs = {
+            name: QueuedOutput(self, name, output) for name, output in outputs.items()
+        }
+        self.futures = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.join(raise_errors=exc_type is None)
+
+    def submit(self, name, fn, *args, **kwargs):
+        future = self.executors[name].submit(fn, *args, **kwargs)
+        future.name = name
+        self.futures.append(future)
+        return future
+
+    def join(self, raise_errors=True):
+        wait(self.futures)
+        for executor in self.executors.values():
+            executor.shutdown()
+        errors = [future for future in self.futures if future.exception()]
+        self.futures = list()
+        for future in errors:
+            logger.error(f"Output {future.name} failed: {future.exception()}")
+        if errors and raise_errors:
+            raise errors[0].exception()
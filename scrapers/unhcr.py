@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from os.path import join
 
@@ -5,6 +6,8 @@ from dateutil.relativedelta import relativedelta
 from hdx.scraper.base_scraper import BaseScraper
 from hdx.utilities.dateparse import parse_date
 
+from .utilities.deadlines import finish
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +27,9 @@ class UNHCR(BaseScraper):
         self.countryiso3s = countryiso3s
 
     def run(self):
+        asyncio.run(self.run_async())
+
+    async def run_async(self):
         reader = self.get_reader()
         iso3tocode = reader.downloader.download_tabular_key_value(
             join("config", "UNHCR_geocode.csv")
@@ -32,6 +38,7 @@ class UNHCR(BaseScraper):
         population_collections = self.datasetinfo["population_collections"]
         exclude = self.datasetinfo["exclude"]
         valuedicts = self.get_values("national")
+        urls = list()
         for countryiso3 in self.countryiso3s:
             if countryiso3 in exclude:
                 continue
@@ -41,18 +48,23 @@ class UNHCR(BaseScraper):
             for population_collection in population_collections:
                 url = base_url % (population_collection, code)
                 logger.info(f"Downloading {url}")
-                json = reader.download_json(url)
-                data = json["data"][0]
-                individuals = data["individuals"]
-                if individuals is None:
-                    continue
-                date = data["date"]
-                if parse_date(date) < self.today - relativedelta(years=2):
-                    continue
-                existing_individuals = valuedicts[0].get(countryiso3)
-                if existing_individuals is None:
-                    valuedicts[0][countryiso3] = int(individuals)
-                    valuedicts[1][countryiso3] = date
-                else:
-                    valuedicts[0][countryiso3] += int(individuals)
+                urls.append((countryiso3, url))
+        jsons = await asyncio.gather(
+            *(reader.download_json_async(url) for _, url in urls)
+        )
+        finish()
+        for (countryiso3, _), json in zip(urls, jsons):
+            data = json["data"][0]
+            individuals = data["individuals"]
+            if individuals is None:
+                continue
+            date = data["date"]
+            if parse_date(date) < self.today - relativedelta(years=2):
+                continue
+            existing_individuals = valuedicts[0].get(countryiso3)
+            if existing_individuals is None:
+                valuedicts[0][countryiso3] = int(individuals)
+                valuedicts[1][countryiso3] = date
+            else:
+                valuedicts[0][countryiso3] += int(individuals)
         self.datasetinfo["source_date"] = self.today
@@ -0,0 +1,244 @@
+import logging
+from ast import literal_eval
+
+import numpy
+from hdx.scraper.configurable import aggregator
+from hdx.scraper.configurable.aggregator import Aggregator
+from hdx.utilities.text import number_format
+
+logger = logging.getLogger(__name__)
+
+# Integers are summed as floats when a column has floats, which is only the
+# same as summing them as integers first while they are exact as floats
+MAX_EXACT = 2**53
+
+
+def get_number(value):
+    # Same conversion as Aggregator.process, "" means no value
+    if isinstance(value, (int, float)):
+        return value
+    if not value:
+        return ""
+    return Aggregator.get_numeric(value)
+
+
+def get_eval_value(value):
+    # Values that eval gives back unchanged from their string can be passed
+    # straight to a compiled formula
+    valuestr = str(value)
+    if valuestr.startswith("-"):
+        return None
+    try:
+        value = literal_eval(valuestr)
+    except (ValueError, SyntaxError):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class AggregationEngine:
+    def __init__(self, runner, names, input_level, use_hxl=True):
+        self.runner = runner
+        self.aggregators = [runner.get_scraper(name) for name in names]
+        self.input_level = input_level
+        self.use_hxl = use_hxl
+        self.input_values = None
+        self.input_sourcesinfo = None
+        self.results = dict()
+
+    def install(self):
+        for scraper in self.aggregators:
+            self.install_one(scraper)
+
+    def install_one(self, scraper):
+        def pre_run():
+            self.prepare()
+            scraper.set_input_values_sources(self.input_values, self.input_sourcesinfo)
+
+        scraper.pre_run = pre_run
+        scraper.run = lambda: self.run_one(scraper)
+
+    def prepare(self):
+        if self.input_values is not None:
+            return
+        # Every aggregator would otherwise gather the same input values
+        (
+            self.input_values,
+            self.input_sourcesinfo,
+        ) = self.runner.get_values_sourcesinfo_by_header(
+            self.input_level, None, {}, True, self.use_hxl
+        )
+        self.results = self.aggregate(
+            [
+                scraper
+                for scraper in self.aggregators
+                if scraper.datasetinfo["action"] in ("sum", "mean")
+            ]
+        )
+
+    def get_input(self, scraper):
+        # Country order and first non None value over the inputs as in
+        # Aggregator.run
+        values = dict()
+        for input_header_or_hxltag in scraper.datasetinfo["input"]:
+            for input_adm, value in self.input_values[input_header_or_hxltag].items():
+                if input_adm in values or value is None:
+                    continue
+                values[input_adm] = value
+        return values
+
+    def aggregate(self, scrapers):
+        rows = list()
+        regions = dict()
+        for scraper in scrapers:
+            values = self.get_input(scraper)
+            try:
+                numbers = [get_number(value) for value in values.values()]
+                adms = [scraper.adm_aggregation[adm] for adm in values]
+            except (KeyError, ValueError):
+                # Left to Aggregator.run to handle or report
+                continue
+            if any(
+                number != ""
+                and (isinstance(number, bool) or not isinstance(number, (int, float)))
+                for number in numbers
+            ):
+                continue
+            ints = sum(abs(number) for number in numbers if isinstance(number, int))
+            if ints >= MAX_EXACT:
+                continue
+            output_adms = dict()
+            for adm_output_adms in adms:
+                for output_adm in adm_output_adms:
+                    regions.setdefault(output_adm, len(regions))
+                    output_adms[output_adm] = regions[output_adm]
+            rows.append((scraper, numbers, adms, output_adms))
+        if not rows:
+            return dict()
+
+        # aggregators x regions x countries with each aggregator's own
+        # country order so that floats are added in the same order
+        noaggregators = len(rows)
+        nocountries = max(len(numbers) for _, numbers, _, _ in rows)
+        membership = numpy.zeros((noaggregators, len(regions), nocountries), dtype=bool)
+        counted = numpy.zeros((noaggregators, nocountries), dtype=bool)
+        isfloat = numpy.zeros((noaggregators, nocountries), dtype=bool)
+        int_values = numpy.zeros((noaggregators, nocountries), dtype=numpy.int64)
+        float_values = numpy.zeros((noaggregators, nocountries), dtype=numpy.float64)
+        for i, (_, numbers, adms, _) in enumerate(rows):
+            for j, (number, output_adms) in enumerate(zip(numbers, adms)):
+                for output_adm in output_adms:
+                    membership[i, regions[output_adm], j] = True
+                if number == "":
+                    continue
+                counted[i, j] = True
+                if isinstance(number, float):
+                    isfloat[i, j] = True
+                else:
+                    int_values[i, j] = number
+                float_values[i, j] = number
+
+        mask = membership & counted[:, None, :]
+        novals = mask.sum(axis=2)
+        hasfloats = (mask & isfloat[:, None, :]).any(axis=2)
+        int_totals = numpy.where(mask, int_values[:, None, :], 0).sum(axis=2)
+        # cumsum adds in order unlike sum which adds pairwise
+        float_totals = numpy.cumsum(
+            numpy.where(mask, float_values[:, None, :], 0.0), axis=2
+        )[:, :, -1]
+
+        results = dict()
+        for i, (scraper, _, _, output_adms) in enumerate(rows):
+            mean = scraper.datasetinfo["action"] == "mean"
+            output_values = dict()
+            for output_adm, j in output_adms.items():
+                count = int(novals[i, j])
+                if count == 0:
+                    output_values[output_adm] = ""
+                    continue
+                if hasfloats[i, j]:
+                    total = float(float_totals[i, j])
+                    if mean:
+                        total /= count
+                else:
+                    total = int(int_totals[i, j])
+                    if mean:
+                        quotient, remainder = divmod(total, count)
+                        if remainder == 0:
+                            total = quotient
+                        else:
+                            total /= count
+                if isinstance(total, float):
+                    total = number_format(total, trailing_zeros=False)
+                output_values[output_adm] = total
+            results[scraper.name] = output_values
+        return results
+
+    def get_output_adms(self, scraper):
+        output_adms = dict()
+        for input_adm in self.get_input(scraper):
+            for output_adm in scraper.adm_aggregation[input_adm]:
+                output_adms[output_adm] = None
+        return output_adms
+
+    def evaluate(self, scraper, output_level, output_adms):
+        # The formula is compiled once with the values of other aggregators as
+        # variables instead of substituting them into the text for each region
+        datasetinfo = scraper.datasetinfo
+        population_key = datasetinfo.get("population_key")
+        if population_key is None:
+            population_str = "self.population_lookup[output_adm]"
+        else:
+            population_str = "self.population_lookup[population_key]"
+        index = 1 if scraper.use_hxl else 0
+        headers_or_hxltags = [
+            aggregation_scraper.get_headers(output_level)[index][0]
+            for aggregation_scraper in scraper.aggregation_scrapers
+        ]
+        sorted_len_indices = sorted(
+            range(len(headers_or_hxltags)),
+            key=lambda k: len(headers_or_hxltags[k]),
+            reverse=True,
+        )
+        toeval = datasetinfo["formula"].replace("#population", "_population")
+        for i in sorted_len_indices:
+            toeval = toeval.replace(headers_or_hxltags[i], f"_value{i}")
+        toeval = toeval.replace("_population", population_str)
+        code = compile(toeval, "<formula>", "eval")
+        variables = {
+            f"_value{i}": aggregation_scraper.get_values(output_level)[0]
+            for i, aggregation_scraper in enumerate(scraper.aggregation_scrapers)
+        }
+        results = dict()
+        for output_adm in output_adms:
+            local_variables = {
+                "self": scraper,
+                "output_adm": output_adm,
+                "output_level": output_level,
+                "population_key": population_key,
+            }
+            for name, values in variables.items():
+                value = get_eval_value(values.get(output_adm, ""))
+                if value is None:
+                    return None
+                local_variables[name] = value
+            results[output_adm] = eval(code, aggregator.__dict__, local_variables)
+        return results
+
+    def run_one(self, scraper):
+        output_level = next(iter(scraper.headers.keys()))
+        output_values = scraper.get_values(output_level)[0]
+        results = self.results.get(scraper.name)
+        if results is None and scraper.datasetinfo["action"] == "eval":
+            try:
+                output_adms = self.get_output_adms(scraper)
+            except KeyError:
+                output_adms = None
+            if output_adms is not None:
+                results = self.evaluate(scraper, output_level, output_adms)
+        if results is None:
+            Aggregator.run(scraper)
+            return
+        output_values.update(results)
+        scraper.aggregation_scrapers.append(scraper)
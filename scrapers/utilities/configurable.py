@@ -0,0 +1,238 @@
+from functools import lru_cache
+
+import regex
+from hdx.scraper.configurable import rowparser, scraper
+from hdx.scraper.utilities import get_rowval
+from hdx.scraper.utilities.sources import Sources
+from hdx.utilities.dictandlist import dict_of_lists_add
+from hdx.utilities.text import (  # noqa: F401
+    get_fraction_str,
+    get_numeric_if_possible,
+    number_format,
+)
+
+from .deadlines import finish
+
+
+@lru_cache(maxsize=None)
+def compile_expression(expression):
+    return compile(expression, "<expression>", "eval")
+
+
+class RowParser(rowparser.RowParser):
+    def __init__(self, *args, **kwargs):
+        self.filters_for_eval = dict()
+        super().__init__(*args, **kwargs)
+
+    def get_filter_str_for_eval(self, filter):
+        # Called for each subset filter of every row
+        code = self.filters_for_eval.get(filter)
+        if code is None:
+            code = compile_expression(super().get_filter_str_for_eval(filter))
+            self.filters_for_eval[filter] = code
+        return code
+
+    def filter_sort_rows(self, iterator):
+        yield from super().filter_sort_rows(iterator)
+        # Values are written once all rows are added
+        finish()
+
+
+class ConfigurableScraper(scraper.ConfigurableScraper):
+    def run_scraper(self, iterator):
+        # Copy of run_scraper in hdx-python-scraper 2.1.9 evaluating transforms
+        # compiled once rather than their text for every value. Check it
+        # matches when upgrading.
+        transforms = [
+            {
+                valcol: compile_expression(transform.replace(valcol, "val"))
+                for valcol, transform in subset.get("transform", {}).items()
+            }
+            for subset in self.subsets
+        ]
+
+        valuedicts = {}
+        for subset in self.subsets:
+            for _ in subset["input"]:
+                dict_of_lists_add(valuedicts, subset["filter"], {})
+
+        def add_row(row):
+            adm, should_process_subset = self.rowparser.parse(row)
+            if not adm:
+                return
+            for i, subset in enumerate(self.subsets):
+                if not should_process_subset[i]:
+                    continue
+                filter = subset["filter"]
+                input_ignore_vals = subset.get("input_ignore_vals", [])
+                input_transforms = transforms[i]
+                sum_cols = subset.get("sum")
+                process_cols = subset.get("process")
+                input_append = subset.get("input_append", [])
+                input_keep = subset.get("input_keep", [])
+                for i, valcol in enumerate(subset["input"]):
+                    valuedict = valuedicts[filter][i]
+                    val = get_rowval(row, valcol)
+                    input_transform = input_transforms.get(valcol)
+                    if input_transform and val not in input_ignore_vals:
+                        val = eval(input_transform)
+                    if sum_cols or process_cols:
+                        dict_of_lists_add(valuedict, adm, val)
+                    else:
+                        curval = valuedict.get(adm)
+                        if valcol in input_append:
+                            if curval:
+                                val = curval + val
+                        elif valcol in input_keep:
+                            if curval:
+                                val = curval
+                        valuedict[adm] = val
+
+        for row in self.rowparser.filter_sort_rows(iterator):
+            add_row(row)
+
+        values = self.values[self.level_name]
+        values_pos = 0
+        for subset in self.subsets:
+            valdicts = valuedicts[subset["filter"]]
+            population_key = subset.get("population_key")
+            if population_key is None:
+                population_str = "self.population_lookup[adm]"
+            else:
+                population_str = "self.population_lookup[population_key]"
+            process_cols = subset.get("process")
+            input_keep = subset.get("input_keep", [])
+            sum_cols = subset.get("sum")
+            input_ignore_vals = subset.get("input_ignore_vals", [])
+            valcols = subset["input"]
+            # Indices of list sorted by length
+            sorted_len_indices = sorted(
+                range(len(valcols)),
+                key=lambda k: len(valcols[k]),
+                reverse=True,
+            )
+
+            if process_cols:
+
+                def text_replacement(string, adm):
+                    # pzbgvjh is arbitrary! It is simply to prevent accidental replacement
+                    # of all or parts of #population (if it is in the string).
+                    arbitrary_string = "#pzbgvjh"
+                    string = string.replace("#population", arbitrary_string)
+                    hasvalues = False
+                    for j in sorted_len_indices:
+                        valcol = valcols[j]
+                        if valcol not in string:
+                            continue
+                        if valcol in input_keep:
+                            input_keep_index = 0
+                        else:
+                            input_keep_index = -1
+                        val = valdicts[j][adm][input_keep_index]
+                        if val is None or val == "" or val in input_ignore_vals:
+                            val = 0
+                        else:
+                            hasvalues = True
+                        string = string.replace(valcol, str(val))
+                    string = string.replace(arbitrary_string, "#population")
+                    return string, hasvalues
+
+                for i, process_col in enumerate(process_cols):
+                    valdict0 = valdicts[0]
+                    for adm in valdict0:
+                        hasvalues = True
+                        matches = regex.search(
+                            self.brackets, process_col, flags=regex.VERBOSE
+                        )
+                        if matches:
+                            for bracketed_str in matches.captures("rec"):
+                                if any(bracketed_str in x for x in valcols):
+                                    continue
+                                _, hasvalues_t = text_replacement(bracketed_str, adm)
+                                if not hasvalues_t:
+                                    hasvalues = False
+                                    break
+                        if hasvalues:
+                            formula, hasvalues_t = text_replacement(process_col, adm)
+                            if hasvalues_t:
+                                formula = formula.replace(
+                                    "#population",
+                                    population_str,
+                                )
+                                value = eval(formula)
+                            else:
+                                value = ""
+                        else:
+                            value = ""
+                        values[values_pos][adm] = value
+                    values_pos += 1
+            elif sum_cols:
+                for ind, sum_col in enumerate(sum_cols):
+                    formula = sum_col["formula"]
+                    mustbepopulated = sum_col.get("mustbepopulated", False)
+                    newvaldicts = [{} for _ in valdicts]
+                    valdict0 = valdicts[0]
+                    for adm in valdict0:
+                        for i, val in enumerate(valdict0[adm]):
+                            if not val or val in input_ignore_vals:
+                                exists = False
+                            else:
+                                exists = True
+                                for valdict in valdicts[1:]:
+                                    val = valdict[adm][i]
+                                    if (
+                                        val is None
+                                        or val == ""
+                                        or val in input_ignore_vals
+                                    ):
+                                        exists = False
+                                        break
+                            if mustbepopulated and not exists:
+                                continue
+                            for j, valdict in enumerate(valdicts):
+                                val = valdict[adm][i]
+                                if val is None or val == "" or val in input_ignore_vals:
+                                    continue
+                                newvaldicts[j][adm] = eval(
+                                    f"newvaldicts[j].get(adm, 0.0) + {str(valdict[adm][i])}"
+                                )
+                    formula = formula.replace("#population", "#pzbgvjh")
+                    for i in sorted_len_indices:
+                        formula = formula.replace(valcols[i], f"newvaldicts[{i}][adm]")
+                    formula = formula.replace("#pzbgvjh", population_str)
+                    for adm in valdicts[0].keys():
+                        try:
+                            val = eval(formula)
+                        except (ValueError, TypeError, KeyError):
+                            val = ""
+                        values[values_pos][adm] = val
+                    values_pos += 1
+            else:
+                for i, valdict in enumerate(valdicts):
+                    for adm in valdict:
+                        value = valdict[adm]
+                        values[values_pos][adm] = value
+                    values_pos += 1
+
+    def run(self):
+        file_headers, iterator = self.get_iterator(self.name)
+        header_to_hxltag = self.use_hxl(None, file_headers, iterator)
+        if "source_url" not in self.datasetinfo:
+            self.datasetinfo["source_url"] = self.datasetinfo["url"]
+        source_date = Sources.standardise_datasetinfo_source_date(self.datasetinfo)
+        if not source_date or self.datasetinfo.get("force_date_today", False):
+            source_date = self.today
+            self.datasetinfo["source_date"] = {"default_date": {"end": source_date}}
+        self.rowparser = RowParser(
+            self.name,
+            self.countryiso3s,
+            self.adminlevel,
+            self.level,
+            self.datelevel,
+            self.today,
+            self.datasetinfo,
+            file_headers,
+            header_to_hxltag,
+            self.subsets,
+        )
+        self.run_scraper(iterator)
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, calls, period):
+        self.capacity = calls
+        self.rate = calls / period
+        self.tokens = calls
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # Callers reserve a token even if it is not there yet and then
+            # wait for it so that they are served in order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class HostLimits:
+    def __init__(self, max_connections, calls=None, period=None):
+        self.semaphore = threading.BoundedSemaphore(max_connections)
+        if calls:
+            self.bucket = TokenBucket(calls, period)
+        else:
+            self.bucket = None
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.waited = 0.0
+        self.active = 0
+        self.max_active = 0
+
+    def acquire(self):
+        start = time.monotonic()
+        self.semaphore.acquire()
+        if self.bucket:
+            self.bucket.acquire()
+        with self.lock:
+            self.requests += 1
+            self.waited += time.monotonic() - start
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        return Slot(self)
+
+    def release(self):
+        with self.lock:
+            self.active -= 1
+        self.semaphore.release()
+
+
+class Slot:
+    # A connection slot that is given back once however the response ends
+    def __init__(self, limits):
+        self.limits = limits
+        self.lock = threading.Lock()
+
+    def release(self):
+        with self.lock:
+            limits = self.limits
+            self.limits = None
+        if limits:
+            limits.release()
+
+
+class PooledAdapter(HTTPAdapter):
+    def __init__(self, pool, **kwargs):
+        self.pool = pool
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):
+        slot = self.pool.get_limits(urlsplit(request.url).hostname).acquire()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except BaseException:
+            slot.release()
+            raise
+        # Bodies are read after send returns so the slot is kept until the
+        # connection is released by reading to the end or closing the response
+        raw = response.raw
+        release_conn = raw.release_conn
+
+        def release():
+            try:
+                release_conn()
+            finally:
+                slot.release()
+
+        raw.release_conn = release
+        weakref.finalize(response, slot.release)
+        return response
+
+
+class ConnectionPool:
+    # One keep alive connection pool shared by the sessions of all downloaders
+    # with limits on the connections and request rate per host
+    def __init__(self, configuration):
+        self.default = configuration.get("default", {"max_connections": 4})
+        self.hosts = configuration.get("hosts", {})
+        self.limits = dict()
+        self.lock = threading.Lock()
+        max_connections = max(
+            limits["max_connections"]
+            for limits in [self.default] + list(self.hosts.values())
+        )
+        self.max_connections = max_connections
+        self.adapter = None
+
+    def get_limits(self, host):
+        with self.lock:
+            limits = self.limits.get(host)
+            if limits is None:
+                limits = HostLimits(**self.hosts.get(host, self.default))
+                self.limits[host] = limits
+            return limits
+
+    def mount(self, sessions):
+        for session in sessions:
+            if self.adapter is None:
+                # Keep the retry policy the sessions were created with
+                retries = session.get_adapter("https://").max_retries
+                self.adapter = PooledAdapter(
+                    self,
+                    max_retries=retries,
+                    pool_connections=100,
+                    pool_maxsize=self.max_connections,
+                )
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+
+    def get_stats(self):
+        stats = dict()
+        with self.lock:
+            for host, limits in self.limits.items():
+                stats[host] = {
+                    "requests": limits.requests,
+                    "waited": limits.waited,
+                    "max_active": limits.max_active,
+                    "connections": 0,
+                }
+        if self.adapter:
+            poolmanager = self.adapter.poolmanager
+            for key in poolmanager.pools.keys():
+                pool = poolmanager.pools.get(key)
+                if pool is None or pool.host not in stats:
+                    continue
+                stats[pool.host]["connections"] += pool.num_connections
+        return stats
+
+    def log_stats(self):
+        for host, stats in sorted(self.get_stats().items()):
+            logger.info(
+                f"{host}: {stats['requests']} requests over {stats['connections']} connections, {stats['max_active']} at once, waited {stats['waited']:.2f}s"
+            )
@@ -0,0 +1,120 @@
+import contextvars
+import logging
+import threading
+import time
+
+from hdx.scraper.configurable.aggregator import Aggregator
+
+logger = logging.getLogger(__name__)
+
+# Threads of scrapers that ran out of time and of scrapers writing their
+# results. Threads are removed when they exit.
+cancelled = set()
+finishing = set()
+lock = threading.Lock()
+
+
+class ScraperTimeoutError(Exception):
+    pass
+
+
+def check_cancelled(thread=None):
+    # Python threads cannot be killed so reads by scrapers that ran out of time
+    # fail instead
+    if thread is None:
+        thread = threading.current_thread()
+    if thread in cancelled:
+        raise ScraperTimeoutError("Scraper was cancelled!")
+
+
+class ScraperThread(threading.Thread):
+    pass
+
+
+def finish():
+    # Scrapers call this before writing their results. Finishing scrapers are
+    # waited for rather than cancelled so that results are never written after
+    # fallbacks are used.
+    thread = threading.current_thread()
+    if not isinstance(thread, ScraperThread):
+        return
+    with lock:
+        check_cancelled(thread)
+        finishing.add(thread)
+
+
+class Deadlines:
+    def __init__(self, configuration):
+        self.default = configuration.get("default")
+        self.scrapers = configuration.get("scrapers", {})
+        self.total = configuration.get("total")
+        # How much longer scrapers writing their results are waited for
+        self.grace = configuration.get("grace", 60)
+        self.start = time.monotonic()
+
+    def get_timeout(self, name):
+        timeout = self.scrapers.get(name, self.default)
+        if self.total is not None:
+            remaining = self.total - (time.monotonic() - self.start)
+            if timeout is None or remaining < timeout:
+                timeout = remaining
+        return timeout
+
+    def wrap(self, scraper):
+        run = scraper.run
+
+        def run_with_deadline():
+            timeout = self.get_timeout(scraper.name)
+            if timeout is None:
+                return run()
+            if timeout <= 0:
+                raise ScraperTimeoutError(f"No time left to run {scraper.name}!")
+            error = list()
+            # The scraper thread sees what is being recorded for the scraper
+            context = contextvars.copy_context()
+
+            def target():
+                try:
+                    context.run(run)
+                except BaseException as ex:
+                    error.append(ex)
+                finally:
+                    with lock:
+                        cancelled.discard(thread)
+                        finishing.discard(thread)
+                        done.append(True)
+
+            done = list()
+            thread = ScraperThread(
+                target=target, name=f"scraper_{scraper.name}", daemon=True
+            )
+            thread.start()
+            thread.join(timeout)
+            with lock:
+                timed_out = not done and thread not in finishing
+                if timed_out:
+                    cancelled.add(thread)
+            if timed_out:
+                raise ScraperTimeoutError(
+                    f"{scraper.name} did not finish within {timeout:.0f}s!"
+                )
+            thread.join(self.grace)
+            with lock:
+                timed_out = not done
+                if timed_out:
+                    cancelled.add(thread)
+            if timed_out:
+                raise ScraperTimeoutError(
+                    f"{scraper.name} did not finish writing within {self.grace:.0f}s of its deadline!"
+                )
+            if error:
+                raise error[0]
+
+        scraper.run = run_with_deadline
+
+    def wrap_runner(self, runner):
+        for name in runner.scraper_names:
+            scraper = runner.get_scraper(name)
+            if isinstance(scraper, Aggregator):
+                continue
+            self.wrap(scraper)
@@ -0,0 +1,91 @@
+import logging
+import sys
+from collections.abc import Mapping
+from os.path import exists
+
+import ijson
+from hdx.scraper.utilities.fallbacks import Fallbacks
+from hdx.utilities.loader import LoadError
+
+logger = logging.getLogger(__name__)
+
+sources_hxltags = ["#indicator+name", "#date", "#meta+source", "#meta+url"]
+
+
+def read_section(path, key):
+    # Stops reading as soon as the value under the top level key is built
+    with open(path, "rb") as f:
+        try:
+            for value in ijson.items(f, key, use_float=True):
+                return value
+        except ijson.JSONError as ex:
+            raise LoadError(f"JSON file: {path} is invalid! ({ex})")
+    raise LoadError(f"JSON file: {path} has no {key}!")
+
+
+class LazyFallbacks(Mapping):
+    def __init__(
+        self,
+        path,
+        levels_mapping=Fallbacks.default_levels_mapping,
+        sources_key="sources",
+        admin_name_mapping=Fallbacks.default_admin_name_mapping,
+    ):
+        self.path = path
+        self.levels_mapping = levels_mapping
+        self.sources_key = sources_key
+        self.admin_name_mapping = admin_name_mapping
+        self.sections = dict()
+        self.levels = dict()
+
+    def get_section(self, key):
+        section = self.sections.get(key)
+        if section is None:
+            logger.info(f"Reading {key} fallbacks from {self.path}")
+            section = read_section(self.path, key)
+            self.sections[key] = section
+        return section
+
+    def __getitem__(self, level):
+        fallbacks = self.levels.get(level)
+        if fallbacks is None:
+            # Fallbacks are read while the runner handles a scraper's error
+            error = sys.exc_info()[1]
+            try:
+                fallbacks = {
+                    "data": self.get_section(self.levels_mapping[level]),
+                    "admin name": self.admin_name_mapping[level],
+                    "sources": self.get_section(self.sources_key),
+                    "sources hxltags": sources_hxltags,
+                }
+            except LoadError:
+                # Unreadable fallbacks are treated like missing ones so the
+                # scraper fails with its own error
+                logger.exception(f"Not using fallbacks from {self.path}!")
+                Fallbacks.fallbacks = None
+                if error is None:
+                    raise
+                raise error
+            self.levels[level] = fallbacks
+        return fallbacks
+
+    def __iter__(self):
+        return iter(self.levels_mapping)
+
+    def __len__(self):
+        return len(self.levels_mapping)
+
+
+def add_fallbacks(
+    path,
+    levels_mapping=Fallbacks.default_levels_mapping,
+    sources_key="sources",
+    admin_name_mapping=Fallbacks.default_admin_name_mapping,
+):
+    # Like Fallbacks.add but nothing is read until a scraper needs fallbacks
+    if exists(path):
+        Fallbacks.fallbacks = LazyFallbacks(
+            path, levels_mapping, sources_key, admin_name_mapping
+        )
+    else:
+        Fallbacks.fallbacks = None
@@ -0,0 +1,228 @@
+import logging
+import sqlite3
+import sys
+from contextlib import closing
+from contextvars import ContextVar
+from timeit import default_timer as timer
+
+import numpy
+from hdx.scraper.configurable.aggregator import Aggregator
+from hdx.utilities.dateparse import now_utc
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows where peak memory is not recorded
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Reads of the scraper running in each thread or task
+current_stats = ContextVar("current_stats", default=None)
+
+schema = (
+    """CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        started TEXT,
+        today TEXT,
+        shard TEXT,
+        duration REAL,
+        requests INTEGER,
+        cache_hits INTEGER,
+        peak_memory INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS scraper_runs (
+        run_id INTEGER REFERENCES runs(id),
+        scraper TEXT,
+        status TEXT,
+        duration REAL,
+        requests INTEGER,
+        bytes INTEGER,
+        cache_hits INTEGER,
+        peak_memory_rise INTEGER
+    )""",
+    "CREATE INDEX IF NOT EXISTS scraper_runs_scraper ON scraper_runs(scraper, run_id)",
+)
+
+# Columns added since the tables were first created which older files lack
+added_columns = {"scraper_runs": {"peak_memory_rise": "INTEGER"}}
+
+
+def migrate(connection):
+    for statement in schema:
+        connection.execute(statement)
+    for table, columns in added_columns.items():
+        existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+        for column, column_type in columns.items():
+            if column not in existing:
+                connection.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
+                )
+
+
+def get_peak_memory():
+    # Peak resident memory of the process so far in bytes
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak
+    return peak * 1024
+
+
+def record_read(size, cache_hit=False):
+    stats = current_stats.get()
+    if stats is None:
+        return
+    stats["requests"] += 1
+    if cache_hit:
+        stats["cache_hits"] += 1
+    else:
+        stats["bytes"] += size
+
+
+class RunHistory:
+    # Appends a record of each run with the duration, reads and memory of
+    # each scraper to a SQLite file so performance can be followed over time
+    def __init__(self, path, today, shard=None):
+        self.path = path
+        self.today = today
+        self.shard = shard
+        self.started = now_utc()
+        self.start = timer()
+        self.scrapers = dict()
+
+    def install(self, runner):
+        # Installed last so durations include waiting for deadlines and memos
+        for name in runner.scraper_names:
+            scraper = runner.get_scraper(name)
+            if isinstance(scraper, Aggregator):
+                continue
+            self.wrap(name, scraper)
+
+    def wrap(self, name, scraper):
+        run = scraper.run
+
+        def run_with_history():
+            stats = {
+                "status": "failed",
+                "requests": 0,
+                "bytes": 0,
+                "cache_hits": 0,
+            }
+            token = current_stats.set(stats)
+            start = timer()
+            start_peak = get_peak_memory()
+            try:
+                run()
+                stats["status"] = "ok"
+            finally:
+                current_stats.reset(token)
+                stats["duration"] = timer() - start
+                # The process peak only grows so scrapers are given how much
+                # they raised it. Scrapers that stay under an earlier peak get 0.
+                end_peak = get_peak_memory()
+                if start_peak is None or end_peak is None:
+                    stats["peak_memory_rise"] = None
+                else:
+                    stats["peak_memory_rise"] = end_peak - start_peak
+                self.scrapers[name] = stats
+
+        scraper.run = run_with_history
+
+    def save(self, requests=None):
+        if requests:
+            fetched = sum(requests.fetched.values())
+            coalesced = sum(requests.coalesced.values())
+        else:
+            fetched = coalesced = None
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            migrate(connection)
+            cursor = connection.execute(
+                "INSERT INTO runs (started, today, shard, duration, requests, cache_hits, peak_memory) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.started.isoformat(),
+                    self.today.date().isoformat(),
+                    "/".join(str(part) for part in self.shard) if self.shard else None,
+                    timer() - self.start,
+                    fetched,
+                    coalesced,
+                    get_peak_memory(),
+                ),
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO scraper_runs (run_id, scraper, status, duration, requests, bytes, cache_hits, peak_memory_rise) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        name,
+                        stats["status"],
+                        stats["duration"],
+                        stats["requests"],
+                        stats["bytes"],
+                        stats["cache_hits"],
+                        stats["peak_memory_rise"],
+                    )
+                    for name, stats in self.scrapers.items()
+                ),
+            )
+        logger.info(
+            f"Recorded run {run_id} of {len(self.scrapers)} scrapers in {self.path}"
+        )
+        return run_id
+
+
+def get_report(path, window=10, threshold=1.5, min_duration=1.0):
+    # Compares the latest run of each scraper with the median of the window
+    # runs before it. Scrapers are regressed if they took more than threshold
+    # times as long and at least min_duration seconds. Runs of each shard and
+    # full runs are compared only with runs of the same shard.
+    with closing(sqlite3.connect(path)) as connection:
+        rows = connection.execute(
+            "SELECT scraper_runs.scraper, runs.shard, scraper_runs.status, scraper_runs.duration, scraper_runs.requests, scraper_runs.bytes, scraper_runs.cache_hits, scraper_runs.peak_memory_rise FROM scraper_runs JOIN runs ON runs.id = scraper_runs.run_id ORDER BY scraper_runs.run_id"
+        ).fetchall()
+    scraper_rows = dict()
+    for row in rows:
+        scraper_rows.setdefault(row[:2], []).append(row[2:])
+    report = list()
+    for (scraper, shard), rows in scraper_rows.items():
+        latest = rows[-1]
+        durations = [row[1] for row in rows if row[0] == "ok"]
+        recent = durations[-window:]
+        previous = [row[1] for row in rows[-window - 1 : -1] if row[0] == "ok"]
+        if previous:
+            baseline = float(numpy.median(previous))
+        else:
+            baseline = None
+        duration = latest[1]
+        if baseline:
+            ratio = duration / baseline
+        else:
+            ratio = None
+        if recent:
+            p50, p90, p95 = numpy.percentile(recent, (50, 90, 95)).tolist()
+        else:
+            p50 = p90 = p95 = None
+        report.append(
+            {
+                "scraper": scraper,
+                "shard": shard,
+                "runs": len(rows),
+                "status": latest[0],
+                "duration": duration,
+                "baseline": baseline,
+                "ratio": ratio,
+                "p50": p50,
+                "p90": p90,
+                "p95": p95,
+                "requests": latest[2],
+                "bytes": latest[3],
+                "cache_hits": latest[4],
+                "peak_memory_rise": latest[5],
+                "regressed": ratio is not None
+                and ratio > threshold
+                and duration >= min_duration,
+            }
+        )
+    return report
@@ -0,0 +1,234 @@
+import json
+import logging
+import pickle
+from contextvars import ContextVar
+from copy import deepcopy
+from hashlib import blake2b
+from os import replace
+from os.path import exists
+
+from hdx.scraper.base_scraper import BaseScraper
+from hdx.scraper.configurable.scraper import ConfigurableScraper
+from hdx.scraper.utilities.reader import Read
+
+from .deadlines import finish
+
+logger = logging.getLogger(__name__)
+
+MEMO_VERSION = 1
+
+# Inputs read by the scraper running in each thread, including reads it makes
+# in worker threads from async code
+recording = ContextVar("recording", default=None)
+
+
+def hash_file(path):
+    digest = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1048576), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_value(value):
+    text = json.dumps(value, sort_keys=True, default=str)
+    return blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_content_hash(kind, result):
+    if kind == "file":
+        if not exists(result):
+            return None
+        return hash_file(result)
+    if kind == "dataset":
+        if result is None:
+            return None
+        return hash_value(
+            [result.data, [resource.data for resource in result.get_resources()]]
+        )
+    if kind == "archive":
+        return blake2b(result, digest_size=16).hexdigest()
+    return hash_value(result)
+
+
+def get_reader_name(reader):
+    for name, retriever in Read.retrievers.items():
+        if retriever is reader:
+            return name
+    return None
+
+
+def record_input(kind, reader, args, kwargs, result):
+    inputs = recording.get()
+    if inputs is None:
+        return
+    if kind != "dataset":
+        # Scrapers set the prefix of shared readers before using them
+        kwargs = {"file_prefix": reader.prefix, **kwargs}
+    inputs.append(
+        (kind, get_reader_name(reader), args, kwargs, get_content_hash(kind, result))
+    )
+
+
+def record_fetch(fetch):
+    # Inputs of a shared read are recorded for every scraper sharing it, not
+    # only the one that fetched it
+    inputs = list()
+    token = recording.set(inputs)
+    try:
+        return fetch(), inputs
+    finally:
+        recording.reset(token)
+
+
+def add_inputs(inputs):
+    recorded = recording.get()
+    if recorded is not None:
+        recorded.extend(inputs)
+
+
+def fetch_input(kind, reader_name, args, kwargs):
+    reader = Read.get_reader(reader_name)
+    if kind == "dataset":
+        return reader.read_dataset(*args)
+    if kind == "archive":
+        return reader.archive.read(*args)
+    return getattr(reader, f"download_{kind}")(*args, **kwargs)
+
+
+def replace_today(value, old_today, today):
+    if isinstance(value, dict):
+        return {key: replace_today(val, old_today, today) for key, val in value.items()}
+    if value == old_today:
+        return today
+    return value
+
+
+class Memo:
+    # Results of scrapers whose inputs and configuration are unchanged since
+    # they were saved are restored instead of running the scrapers. Inputs are
+    # still downloaded to check their hashes but are not parsed. JSON and YAML
+    # are checked by the hashes of their files.
+    def __init__(self, path, today, countries, scraper_names=tuple()):
+        self.path = path
+        self.today = today
+        self.context = [MEMO_VERSION, list(countries)]
+        self.scraper_names = scraper_names
+        self.entries = self.load()
+        self.hits = list()
+        self.misses = list()
+
+    def load(self):
+        if not exists(self.path):
+            return dict()
+        try:
+            with open(self.path, "rb") as f:
+                memo = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            logger.warning(f"Ignoring unreadable memo {self.path}!")
+            return dict()
+        if memo.get("version") != MEMO_VERSION:
+            logger.info(f"Ignoring memo {self.path} from another version")
+            return dict()
+        return memo["entries"]
+
+    def save(self):
+        total = len(self.hits) + len(self.misses)
+        if total:
+            logger.info(
+                f"Memo hits {len(self.hits)} of {total} scrapers ({100 * len(self.hits) / total:.0f}%): {', '.join(self.hits)}"
+            )
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(
+                {"version": MEMO_VERSION, "entries": self.entries},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        replace(temp_path, self.path)
+
+    def install(self, runner):
+        for name in runner.scraper_names:
+            scraper = runner.get_scraper(name)
+            if isinstance(scraper, ConfigurableScraper) or name in self.scraper_names:
+                self.wrap(name, scraper)
+
+    def get_key(self, scraper, configuration):
+        key = [configuration]
+        # Values from formulas depend on the populations of other scrapers
+        if "population" in configuration:
+            key.append(sorted(BaseScraper.population_lookup.items()))
+        # Rows dated after today are ignored
+        if "date" in scraper.datasetinfo:
+            key.append(self.today.date().isoformat())
+        return hash_value(key)
+
+    def inputs_unchanged(self, inputs):
+        for kind, reader_name, args, kwargs, content_hash in inputs:
+            try:
+                result = fetch_input(kind, reader_name, args, kwargs)
+                if get_content_hash(kind, result) != content_hash:
+                    return False
+            except Exception:
+                return False
+        return True
+
+    def get_entry(self, scraper, key, inputs):
+        return {
+            "key": key,
+            "inputs": inputs,
+            "today": self.today,
+            "values": {
+                level: [dict(header_values) for header_values in values]
+                for level, values in scraper.values.items()
+            },
+            "datasetinfo": deepcopy(scraper.datasetinfo),
+            "source_urls": set(scraper.source_urls),
+        }
+
+    def restore(self, scraper, entry):
+        for level, values in entry["values"].items():
+            for header_values, saved_values in zip(scraper.values[level], values):
+                header_values.update(saved_values)
+        # Source dates that were the day the results were saved become today
+        datasetinfo = deepcopy(entry["datasetinfo"])
+        source_date = datasetinfo.get("source_date")
+        if source_date is not None:
+            datasetinfo["source_date"] = replace_today(
+                source_date, entry["today"], self.today
+            )
+        scraper.datasetinfo.clear()
+        scraper.datasetinfo.update(datasetinfo)
+        scraper.source_urls.update(entry["source_urls"])
+
+    def wrap(self, name, scraper):
+        # Scrapers are kept under their names in the runner as configurable
+        # scrapers for different levels can have the same name
+        run = scraper.run
+        configuration = json.dumps(
+            [type(scraper).__name__, scraper.datasetinfo, scraper.headers]
+            + self.context,
+            sort_keys=True,
+            default=str,
+        )
+
+        def run_with_memo():
+            key = self.get_key(scraper, configuration)
+            entry = self.entries.get(name)
+            if entry and entry["key"] == key and self.inputs_unchanged(entry["inputs"]):
+                finish()
+                self.restore(scraper, entry)
+                self.hits.append(name)
+                logger.info(f"Inputs of {name} unchanged, using memo")
+                return
+            self.misses.append(name)
+            inputs = list()
+            token = recording.set(inputs)
+            try:
+                run()
+            finally:
+                recording.reset(token)
+            finish()
+            self.entries[name] = self.get_entry(scraper, key, inputs)
+
+        scraper.run = run_with_memo
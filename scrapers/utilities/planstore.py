@@ -0,0 +1,65 @@
+import logging
+from json import JSONDecodeError
+from os import replace
+from os.path import exists
+
+from hdx.utilities.loader import load_json
+from hdx.utilities.saver import save_json
+
+logger = logging.getLogger(__name__)
+
+
+class PlanStore:
+    # Last requirements and funding totals of each multi-country FTS plan with
+    # its location breakdown, kept as json so it can be inspected. The location
+    # breakdown is only downloaded again when the totals of a plan change.
+    def __init__(self, path):
+        self.path = path
+        self.plans = self.load()
+        self.used_plans = dict()
+        self.calls = 0
+        self.saved_calls = 0
+
+    def load(self):
+        if not exists(self.path):
+            return dict()
+        try:
+            return load_json(self.path, loaderror_if_empty=False) or dict()
+        except (JSONDecodeError, UnicodeDecodeError):
+            logger.warning(f"Ignoring unreadable FTS plan store {self.path}!")
+            return dict()
+
+    def get(self, plan_id, requirements, funding):
+        plan_id = str(plan_id)
+        plan = self.plans.get(plan_id)
+        if (
+            plan is None
+            or plan["requirements"] != requirements
+            or plan["funding"] != funding
+        ):
+            return None
+        self.used_plans[plan_id] = plan
+        self.saved_calls += 1
+        return plan["locations"]
+
+    def add(self, plan_id, requirements, funding, locations):
+        plan = {
+            "requirements": requirements,
+            "funding": funding,
+            "locations": locations,
+        }
+        self.used_plans[str(plan_id)] = plan
+        self.calls += 1
+
+    def save(self):
+        total = self.calls + self.saved_calls
+        if total:
+            logger.info(
+                f"FTS plan store saved {self.saved_calls} of {total} location calls"
+            )
+        # Plans no longer in the FTS overview are dropped
+        self.plans = self.used_plans
+        self.used_plans = dict()
+        temp_path = f"{self.path}.tmp"
+        save_json(self.plans, temp_path, pretty=True, sortkeys=True)
+        replace(temp_path, self.path)
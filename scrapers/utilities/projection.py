@@ -0,0 +1,89 @@
+import ijson
+from hdx.utilities.loader import LoadError
+
+# A projection says which parts of a JSON value are built:
+#   None            the whole value
+#   dict            only the given keys of an object, each with its projection
+#   list [p]        every item of an array with projection p
+#   First(p)        only the first item of an array with projection p
+# Values that are not of the type the projection expects are built whole.
+
+
+class First:
+    def __init__(self, projection=None):
+        self.projection = projection
+
+    def __repr__(self):
+        # Used in the keys of shared requests
+        return f"First({self.projection!r})"
+
+
+def fields(*keys, **projections):
+    projection = {key: None for key in keys}
+    projection.update(projections)
+    return projection
+
+
+def skip(events, event):
+    depth = 1 if event in ("start_map", "start_array") else 0
+    while depth:
+        event, _ = next(events)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+
+
+def build(events, event, value, projection):
+    if event == "start_map":
+        if not isinstance(projection, dict):
+            projection = None
+        result = dict()
+        for event, key in events:
+            if event == "end_map":
+                return result
+            event, value = next(events)
+            if projection is None or key in projection:
+                result[key] = build(
+                    events,
+                    event,
+                    value,
+                    None if projection is None else projection[key],
+                )
+            else:
+                skip(events, event)
+        return result
+    if event == "start_array":
+        first = isinstance(projection, First)
+        if first:
+            projection = projection.projection
+        elif isinstance(projection, list):
+            projection = projection[0]
+        else:
+            projection = None
+        result = list()
+        for event, value in events:
+            if event == "end_array":
+                return result
+            if first and result:
+                skip(events, event)
+            else:
+                result.append(build(events, event, value, projection))
+        return result
+    return value
+
+
+def project_json(f, projection, name=None):
+    # Builds only the projected parts of the JSON in the binary file object f
+    # as it is read
+    # Events are parsed a buffer at a time so a smaller buffer keeps fewer of
+    # them in memory
+    events = ijson.basic_parse(f, buf_size=16384, use_float=True)
+    try:
+        event, value = next(events)
+        result = build(events, event, value, projection)
+        for _ in events:
+            raise LoadError(f"JSON file: {name or f} has extra data!")
+    except (ijson.JSONError, StopIteration) as ex:
+        raise LoadError(f"JSON file: {name or f} is invalid! ({ex})")
+    return result
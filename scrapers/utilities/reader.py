@@ -0,0 +1,448 @@
+import asyncio
+import json
+import logging
+import threading
+from copy import deepcopy
+from io import BytesIO
+from os import makedirs
+from os.path import exists, getsize, join
+
+import hxl
+from hdx.api.configuration import Configuration, ConfigurationError
+from hdx.data.dataset import Dataset
+from hdx.scraper.utilities import reader
+from hdx.utilities.downloader import Download
+from hdx.utilities.loader import LoadError, load_yaml
+from hxl.input import InputOptions
+
+from .connectionpool import ConnectionPool
+from .deadlines import check_cancelled
+from .history import record_read
+from .memo import add_inputs, record_fetch, record_input
+from .projection import project_json
+from .saved_archive import SavedArchive
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def search_datasets(fq, rows):
+    return Dataset.search_in_hdx(fq=fq, rows=rows)
+
+
+def get_expressions(datasetinfo):
+    # Expressions that configurable scrapers evaluate, which can read any
+    # column of the row
+    expressions = list()
+    prefilter = datasetinfo.get("prefilter")
+    if prefilter:
+        expressions.append(prefilter)
+    for subset in datasetinfo.get("subsets") or [datasetinfo]:
+        filter = subset.get("filter")
+        if filter:
+            expressions.append(filter)
+        expressions.extend((subset.get("transform") or {}).values())
+        expressions.extend(subset.get("process") or [])
+    return [str(expression) for expression in expressions]
+
+
+def get_columns(datasetinfo, headers=None):
+    # Columns that configurable scrapers can use, None if they can use others.
+    # Given the headers, only those in them are returned along with any
+    # headers in expressions.
+    if any(datasetinfo.get(key) for key in ("use_hxl", "flatten", "external_filter")):
+        return None
+    columns = list()
+
+    def add(cols):
+        if cols is None:
+            return True
+        if isinstance(cols, str):
+            cols = [cols]
+        for col in cols:
+            if isinstance(col, dict):
+                continue
+            if isinstance(col, list):
+                if not add(col):
+                    return False
+                continue
+            if not isinstance(col, str) or "{{" in col:
+                return False
+            if col not in columns:
+                columns.append(col)
+        return True
+
+    subsets = datasetinfo.get("subsets") or [datasetinfo]
+    to_add = [
+        datasetinfo.get("admin"),
+        datasetinfo.get("date"),
+        datasetinfo.get("filter_cols"),
+        datasetinfo.get("sort", {}).get("keys"),
+        list(datasetinfo.get("stop_row", {}).keys()),
+    ]
+    to_add.extend(subset.get("input") for subset in subsets)
+    for cols in to_add:
+        if not add(cols):
+            return None
+    if not columns:
+        return None
+    if headers is None:
+        return columns
+    columns = [column for column in columns if column in headers]
+    expressions = get_expressions(datasetinfo)
+    for header in headers:
+        if not isinstance(header, str) or header in columns:
+            continue
+        if any(header in expression for expression in expressions):
+            columns.append(header)
+    return columns
+
+
+class Read(reader.Read):
+    archive = None
+    connection_pool = None
+    spreadsheet_streaming = False
+    requests = SingleFlight()
+
+    @classmethod
+    def create_readers(
+        cls,
+        fallback_dir,
+        saved_dir,
+        temp_dir,
+        save=False,
+        use_saved=False,
+        saved_archive=None,
+        connection_pool=None,
+        spreadsheet_streaming=False,
+        **kwargs,
+    ):
+        if cls.archive:
+            cls.archive.close()
+            cls.archive = None
+        if use_saved and saved_archive:
+            logger.info(f"Using saved data archive {saved_archive}")
+            cls.archive = SavedArchive(saved_archive)
+            saved_dir = join(temp_dir, "saved_archive")
+            if not exists(saved_dir):
+                makedirs(saved_dir)
+        if connection_pool:
+            # Rates are limited per host by the connection pool instead
+            kwargs["rate_limit"] = None
+        super().create_readers(
+            fallback_dir, saved_dir, temp_dir, save, use_saved, **kwargs
+        )
+        if connection_pool:
+            cls.connection_pool = ConnectionPool(connection_pool)
+            sessions = [
+                downloader.session for downloader in Download.downloaders.values()
+            ]
+            try:
+                # Datasets are read from HDX through the configuration's session
+                sessions.append(Configuration.read().get_session())
+            except ConfigurationError:
+                pass
+            cls.connection_pool.mount(sessions)
+        else:
+            cls.connection_pool = None
+        cls.spreadsheet_streaming = spreadsheet_streaming
+        # Scrapers get their readers from the base class
+        reader.Read.retrievers = cls.retrievers
+        cls.requests.reset()
+
+    @classmethod
+    def refresh_readers(cls, today):
+        # Keeps the downloaders and so their sessions from create_readers
+        default = cls.get_reader()
+        cls.generate_retrievers(
+            default.fallback_dir,
+            default.saved_dir,
+            default.temp_dir,
+            default.save,
+            default.use_saved,
+            today=today,
+        )
+        reader.Read.retrievers = cls.retrievers
+        cls.requests.reset()
+
+    def clone(self, downloader):
+        return Read(
+            downloader,
+            fallback_dir=self.fallback_dir,
+            saved_dir=self.saved_dir,
+            temp_dir=self.temp_dir,
+            save=self.save,
+            use_saved=self.use_saved,
+            prefix=self.prefix,
+            delete=False,
+            today=self.today,
+        )
+
+    def extract_saved(self, filename):
+        path = join(self.saved_dir, filename)
+        if not exists(path):
+            self.archive.extract(filename, self.saved_dir)
+        return path
+
+    def get_request_key(self, url, filename, args, kwargs):
+        # Readers with different downloaders can get different responses
+        return (
+            id(self.downloader),
+            str(url),
+            self.get_filename(url, filename, **kwargs)[0],
+            repr(args),
+            repr(sorted(kwargs.items())),
+        )
+
+    def share(self, kind, key, fetch, copy=False):
+        # Returns whether this read fetched the result or got it from another.
+        # Results that callers can change are copied so that each caller gets
+        # its own while the shared one stays as it was read.
+        fetched = list()
+
+        def fetch_and_mark():
+            result = fetch()
+            fetched.append(result)
+            if copy:
+                return deepcopy(result)
+            return result
+
+        result = self.requests.do(kind, key, fetch_and_mark)
+        if fetched:
+            return fetched[0], True
+        if copy:
+            result = deepcopy(result)
+        return result, False
+
+    def download_file(self, url, filename=None, *args, **kwargs):
+        check_cancelled()
+
+        def fetch():
+            if self.use_saved and self.archive:
+                self.extract_saved(self.get_filename(url, filename, **kwargs)[0])
+            return super(Read, self).download_file(url, filename, *args, **kwargs)
+
+        key = self.get_request_key(url, filename, args, kwargs)
+        path, fetched = self.share("file", key, fetch)
+        record_read(getsize(path) if fetched and exists(path) else 0, not fetched)
+        record_input("file", self, (url, filename, *args), kwargs, path)
+        return path
+
+    def download_text(self, url, filename=None, *args, **kwargs):
+        check_cancelled()
+
+        def fetch():
+            if self.use_saved and self.archive:
+                self.extract_saved(self.get_filename(url, filename, **kwargs)[0])
+            return super(Read, self).download_text(url, filename, *args, **kwargs)
+
+        key = self.get_request_key(url, filename, args, kwargs)
+        text, fetched = self.share("text", key, fetch)
+        record_read(len(text.encode("utf-8")) if fetched else 0, not fetched)
+        record_input("text", self, (url, filename, *args), kwargs, text)
+        return text
+
+    def download_yaml(self, url, filename=None, *args, **kwargs):
+        check_cancelled()
+
+        def fetch():
+            # Same filename as download_yaml would save to, which download_file
+            # prefixes again
+            yaml_filename, _ = self.get_filename(
+                url, filename, ("yaml", "yml"), **{**kwargs, "file_prefix": ""}
+            )
+            path = self.download_file(url, yaml_filename, *args, **kwargs)
+            return load_yaml(path)
+
+        key = self.get_request_key(url, filename, args, kwargs)
+        (ryaml, inputs), fetched = self.share(
+            "yaml", key, lambda: record_fetch(fetch), copy=True
+        )
+        if not fetched:
+            record_read(0, True)
+        add_inputs(inputs)
+        return ryaml
+
+    def download_json(
+        self, url, filename=None, logstr=None, *args, projection=None, **kwargs
+    ):
+        check_cancelled()
+
+        def fetch():
+            return self.fetch_json(url, filename, logstr, projection, *args, **kwargs)
+
+        # Projections build different JSON from the same response
+        key = (*self.get_request_key(url, filename, args, kwargs), repr(projection))
+        (rjson, inputs), fetched = self.share(
+            "json", key, lambda: record_fetch(fetch), copy=True
+        )
+        if not fetched:
+            record_read(0, True)
+        add_inputs(inputs)
+        return rjson
+
+    def fetch_json(self, url, filename, logstr, projection, *args, **kwargs):
+        # The JSON is parsed as it is read from file building only the parts
+        # in the projection if there is one. Downloads are written to file
+        # unchanged so saved files are complete and memos check the file
+        # rather than the JSON.
+        saved_filename, _ = self.get_filename(url, filename, ("json",), **kwargs)
+        if not logstr:
+            logstr = saved_filename
+        if self.use_saved and self.archive:
+            logger.log(self.log_level, f"Using saved {logstr} in {self.archive.path}")
+            data = self.archive.read(saved_filename)
+            record_read(len(data))
+            record_input("archive", self, (saved_filename,), {}, data)
+            f = BytesIO(data)
+        else:
+            # Same filename as download_json would save to, which download_file
+            # prefixes again
+            filename, _ = self.get_filename(
+                url, filename, ("json",), **{**kwargs, "file_prefix": ""}
+            )
+            path = self.download_file(url, filename, logstr, *args, **kwargs)
+            f = open(path, "rb")
+        with f:
+            if projection is None:
+                try:
+                    rjson = json.load(f)
+                except ValueError as ex:
+                    raise LoadError(f"JSON file: {saved_filename} is invalid! ({ex})")
+            else:
+                rjson = project_json(f, projection, saved_filename)
+        if self.use_saved and not rjson:
+            raise LoadError(f"JSON file: {saved_filename} is empty!")
+        return rjson
+
+    async def read_async(self, read, *args, **kwargs):
+        # The downloaders block so reads run in worker threads going through
+        # the sync reads, which save, use saved data and share requests
+        thread = threading.current_thread()
+        check_cancelled(thread)
+
+        def read_in_thread():
+            # Reads stop when the scraper that started them runs out of time
+            check_cancelled(thread)
+            return read(*args, **kwargs)
+
+        return await asyncio.to_thread(read_in_thread)
+
+    async def download_file_async(self, url, filename=None, *args, **kwargs):
+        return await self.read_async(self.download_file, url, filename, *args, **kwargs)
+
+    async def download_text_async(self, url, filename=None, *args, **kwargs):
+        return await self.read_async(self.download_text, url, filename, *args, **kwargs)
+
+    async def download_yaml_async(self, url, filename=None, *args, **kwargs):
+        return await self.read_async(self.download_yaml, url, filename, *args, **kwargs)
+
+    async def download_json_async(
+        self, url, filename=None, logstr=None, *args, projection=None, **kwargs
+    ):
+        return await self.read_async(
+            self.download_json,
+            url,
+            filename,
+            logstr,
+            *args,
+            projection=projection,
+            **kwargs,
+        )
+
+    async def read_dataset_async(self, dataset_name):
+        return await self.read_async(self.read_dataset, dataset_name)
+
+    async def read_hxl_resource_async(
+        self, identifier, resource, data_type, columns=None
+    ):
+        return await self.read_async(
+            self.read_hxl_resource, identifier, resource, data_type, columns
+        )
+
+    def read_tabular(self, datasetinfo, **kwargs):
+        if self.spreadsheet_streaming and datasetinfo.get("format") in ("xls", "xlsx"):
+            # Sources without merged cells can set fill_merged_cells to False
+            # so that xlsx sheets are read row by row by openpyxl in read only
+            # mode and xls without formatting. Multi row headers still fill
+            # merged cells.
+            kwargs["fill_merged_cells"] = datasetinfo.get("fill_merged_cells", True)
+            headers, iterator = super().read_tabular(datasetinfo, **kwargs)
+            columns = get_columns(datasetinfo, headers)
+            if not columns:
+                return headers, iterator
+            # Rows are kept by the row parser so only the columns used are kept
+            return headers, (
+                {column: row[column] for column in columns} for row in iterator
+            )
+        return super().read_tabular(datasetinfo, **kwargs)
+
+    def read_hxl_resource(self, identifier, resource, data_type, columns=None):
+        if not columns:
+            return super().read_hxl_resource(identifier, resource, data_type)
+        # Only the columns matching the given tags are kept. Rows are read here
+        # so that data that cannot be parsed is handled like missing tags.
+        try:
+            _, path = self.download_resource(identifier, resource)
+            data = hxl.data(path, InputOptions(allow_local=True)).with_columns(columns)
+            return list(data)
+        except hxl.HXLException:
+            logger.warning(
+                f"Could not process {data_type} for {identifier}. Maybe there are no HXL tags?"
+            )
+            return None
+        except Exception:
+            logger.exception(f"Error reading {data_type} for {identifier}!")
+            raise
+
+    def read_datasets(self, dataset_names, search=search_datasets, batch_size=25):
+        # Gets metadata for many datasets in a few searches, keeping it for
+        # read_dataset. Saved datasets are read from files as usual.
+        if self.use_saved:
+            return
+        names = list()
+        for dataset_name in dataset_names:
+            if not dataset_name or dataset_name in names:
+                continue
+            if self.requests.has("dataset", dataset_name):
+                continue
+            names.append(dataset_name)
+        if not names:
+            return
+        searches = 0
+        found = 0
+        for i in range(0, len(names), batch_size):
+            batch = names[i : i + batch_size]
+            fq = " OR ".join(f'"{name}"' for name in batch)
+            datasets = {
+                dataset["name"]: dataset
+                for dataset in search(f"name:({fq})", len(batch))
+            }
+            searches += 1
+            for dataset_name in batch:
+                dataset = datasets.get(dataset_name)
+                # Datasets not found are left for read_dataset to report
+                if dataset is None:
+                    continue
+                if self.save:
+                    saved_path = join(self.saved_dir, f"{dataset_name}.json")
+                    logger.info(f"Saving dataset {dataset_name} in {saved_path}")
+                    dataset.save_to_json(saved_path, follow_urls=True)
+                self.requests.put("dataset", dataset_name, dataset)
+                found += 1
+        logger.info(
+            f"Read {found} of {len(names)} datasets in {searches} searches instead of {len(names)} requests"
+        )
+
+    def read_dataset(self, dataset_name):
+        check_cancelled()
+
+        def fetch():
+            if self.use_saved and self.archive:
+                self.extract_saved(f"{dataset_name}.json")
+            return super(Read, self).read_dataset(dataset_name)
+
+        dataset, fetched = self.share("dataset", dataset_name, fetch)
+        record_read(0, not fetched)
+        record_input("dataset", self, (dataset_name,), {}, dataset)
+        return dataset
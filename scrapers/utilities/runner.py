@@ -0,0 +1,85 @@
+import numpy
+from hdx.scraper import runner
+
+from .configurable import ConfigurableScraper
+from .valuestore import ValueColumn, get_column
+
+
+class Runner(runner.Runner):
+    value_store = None
+
+    def add_configurable(
+        self,
+        name,
+        datasetinfo,
+        level,
+        adminlevel=None,
+        level_name=None,
+        source_configuration={},
+        suffix=None,
+        force_add_to_run=False,
+    ):
+        # Copy of add_configurable in hdx-python-scraper 2.1.9 creating our
+        # ConfigurableScraper. Check it matches when upgrading.
+        if suffix:
+            scraper_name = f"{name}{suffix}"
+        else:
+            scraper_name = name
+        self.scrapers[scraper_name] = ConfigurableScraper(
+            name,
+            datasetinfo,
+            level,
+            self.countryiso3s,
+            adminlevel,
+            level_name,
+            source_configuration,
+            self.today,
+            self.errors_on_exit,
+        )
+        if scraper_name not in self.scraper_names:
+            self.scraper_names.append(scraper_name)
+        if (
+            force_add_to_run
+            and self.scrapers_to_run is not None
+            and scraper_name not in self.scrapers_to_run
+        ):
+            self.scrapers_to_run.append(scraper_name)
+        return scraper_name
+
+    def get_rows(
+        self,
+        level,
+        adms,
+        headers=(tuple(), tuple()),
+        row_fns=tuple(),
+        names=None,
+        overrides={},
+    ):
+        if self.value_store is None:
+            return super().get_rows(level, adms, headers, row_fns, names, overrides)
+        results = self.get_results(names, [level], overrides=overrides).get(level)
+        rows = []
+        if results:
+            all_headers = results["headers"]
+            rows.append(list(headers[0]) + all_headers[0])
+            rows.append(list(headers[1]) + all_headers[1])
+            # Rows are built from a table filled a column at a time taking
+            # values from arrays by row index instead of looking up each cell
+            all_values = results["values"]
+            table = numpy.empty((len(adms), len(row_fns) + len(all_values)), object)
+            for i, fn in enumerate(row_fns):
+                table[:, i] = get_column((fn(adm) for adm in adms), len(adms))
+            index_rows = dict()
+            for i, values in enumerate(all_values, len(row_fns)):
+                if isinstance(values, ValueColumn):
+                    rows_for_index = index_rows.get(id(values.index))
+                    if rows_for_index is None:
+                        rows_for_index = values.index.get_rows(adms)
+                        index_rows[id(values.index)] = rows_for_index
+                    table[:, i] = values.take(rows_for_index)
+                else:
+                    table[:, i] = get_column(
+                        (values.get(adm) for adm in adms), len(adms)
+                    )
+            rows.extend(table.tolist())
+        return rows
@@ -0,0 +1,168 @@
+import argparse
+import logging
+import mmap
+import struct
+import zlib
+from hashlib import blake2b
+from os import listdir, makedirs, replace
+from os.path import exists, isfile, join
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HDXSAV01"
+# magic, number of entries
+HEADER = struct.Struct("<8sI")
+# name hash, offset of entry, name length, stored length, length, flags
+INDEX_ENTRY = struct.Struct("<QQIIII")
+COMPRESSED = 1
+
+
+class SavedArchiveError(Exception):
+    pass
+
+
+def hash_name(name):
+    return int.from_bytes(
+        blake2b(name.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def pack_directory(folder, archive_path, compresslevel=6):
+    entries = list()
+    for filename in sorted(listdir(folder)):
+        path = join(folder, filename)
+        if not isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        compressed = zlib.compress(data, compresslevel)
+        # Already compressed formats like xlsx are stored as is
+        if len(compressed) < len(data) * 0.9:
+            stored, flags = compressed, COMPRESSED
+        else:
+            stored, flags = data, 0
+        entries.append(
+            (hash_name(filename), filename.encode("utf-8"), stored, len(data), flags)
+        )
+    entries.sort(key=lambda x: (x[0], x[1]))
+    offset = HEADER.size + len(entries) * INDEX_ENTRY.size
+    index = list()
+    for namehash, name, stored, length, flags in entries:
+        index.append(
+            INDEX_ENTRY.pack(namehash, offset, len(name), len(stored), length, flags)
+        )
+        offset += len(name) + len(stored)
+    temp_path = f"{archive_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        f.write(b"".join(index))
+        for _, name, stored, _, _ in entries:
+            f.write(name)
+            f.write(stored)
+    replace(temp_path, archive_path)
+    logger.info(f"Packed {len(entries)} files from {folder} into {archive_path}")
+    return len(entries)
+
+
+def unpack_archive(archive_path, folder):
+    if not exists(folder):
+        makedirs(folder)
+    with SavedArchive(archive_path) as archive:
+        for name in archive.names():
+            archive.extract(name, folder)
+        count = len(archive)
+    logger.info(f"Unpacked {count} files from {archive_path} into {folder}")
+    return count
+
+
+class SavedArchive:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.count = HEADER.unpack_from(self.mmap, 0)
+        except (ValueError, struct.error):
+            self.file.close()
+            raise SavedArchiveError(f"{path} is not a saved data archive!")
+        if magic != MAGIC:
+            self.close()
+            raise SavedArchiveError(f"{path} is not a saved data archive!")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, name):
+        return self.find(name) is not None
+
+    def close(self):
+        self.mmap.close()
+        self.file.close()
+
+    def get_index_entry(self, i):
+        return INDEX_ENTRY.unpack_from(self.mmap, HEADER.size + i * INDEX_ENTRY.size)
+
+    def get_name(self, index_entry):
+        _, offset, name_length, _, _, _ = index_entry
+        return self.mmap[offset : offset + name_length].decode("utf-8")
+
+    def find(self, name):
+        namehash = hash_name(name)
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_index_entry(middle)[0] < namehash:
+                low = middle + 1
+            else:
+                high = middle
+        for i in range(low, self.count):
+            index_entry = self.get_index_entry(i)
+            if index_entry[0] != namehash:
+                break
+            if self.get_name(index_entry) == name:
+                return index_entry
+        return None
+
+    def names(self):
+        return [self.get_name(self.get_index_entry(i)) for i in range(self.count)]
+
+    def read(self, name):
+        index_entry = self.find(name)
+        if index_entry is None:
+            raise KeyError(f"{name} not found in {self.path}!")
+        _, offset, name_length, stored_length, length, flags = index_entry
+        start = offset + name_length
+        data = self.mmap[start : start + stored_length]
+        if flags & COMPRESSED:
+            data = zlib.decompress(data)
+        if len(data) != length:
+            raise SavedArchiveError(f"{name} in {self.path} is corrupt!")
+        return data
+
+    def extract(self, name, folder):
+        path = join(folder, name)
+        with open(path, "wb") as f:
+            f.write(self.read(name))
+        return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert between saved data folders and archives"
+    )
+    parser.add_argument("command", choices=("pack", "unpack"))
+    parser.add_argument("source", help="Folder to pack or archive to unpack")
+    parser.add_argument("destination", help="Archive to create or folder to fill")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "pack":
+        pack_directory(args.source, args.destination)
+    else:
+        unpack_archive(args.source, args.destination)
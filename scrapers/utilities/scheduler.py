@@ -0,0 +1,48 @@
+import logging
+import time
+from os import remove
+from os.path import exists
+
+from hdx.utilities.dateparse import now_utc
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    # Yields the time each cycle should run. Cycles run every interval seconds
+    # aligned to the clock like cron (eg. on the hour for 3600) or as soon as
+    # the trigger file is created.
+    def __init__(self, interval, trigger_path=None, max_cycles=None, poll=1.0):
+        if interval <= 0:
+            raise ValueError("Interval must be positive!")
+        self.interval = interval
+        self.trigger_path = trigger_path
+        self.max_cycles = max_cycles
+        self.poll = poll
+        self.cycles = 0
+
+    def get_next_time(self, now):
+        return (now // self.interval + 1) * self.interval
+
+    def triggered(self):
+        if not self.trigger_path or not exists(self.trigger_path):
+            return False
+        remove(self.trigger_path)
+        logger.info(f"Cycle triggered by {self.trigger_path}")
+        return True
+
+    def wait(self):
+        next_time = self.get_next_time(time.time())
+        logger.info(f"Next cycle in {next_time - time.time():.0f}s")
+        while True:
+            remaining = next_time - time.time()
+            if remaining <= 0 or self.triggered():
+                return
+            time.sleep(min(self.poll, remaining))
+
+    def __iter__(self):
+        while self.max_cycles is None or self.cycles < self.max_cycles:
+            if self.cycles:
+                self.wait()
+            self.cycles += 1
+            yield now_utc()
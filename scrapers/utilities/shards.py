@@ -0,0 +1,206 @@
+import json
+import logging
+from datetime import datetime
+from os import replace
+
+from hdx.scraper.configurable.aggregator import Aggregator
+from hdx.scraper.outputs.base import BaseOutput
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_VERSION = 2
+DATASETINFO_KEYS = ("source", "source_url", "source_date")
+
+
+class BundleError(Exception):
+    pass
+
+
+def get_shard(countries, index, count):
+    if count < 1 or not 0 <= index < count:
+        raise BundleError(f"Invalid shard {index} of {count}!")
+    return countries[index::count]
+
+
+class TabRecorder(BaseOutput):
+    # Keeps tabs that scrapers write while running so that the merge can
+    # replay them
+    def __init__(self, updatetabs):
+        super().__init__(updatetabs)
+        self.tabs = dict()
+
+    def update_tab(self, tabname, values, hxltags=None, **kwargs):
+        if tabname not in self.updatetabs:
+            return
+        self.tabs[tabname] = values
+
+
+def encode_date(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} cannot be saved in a bundle!")
+
+
+def decode_date(value):
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def save_bundle(path, runner, countries, tabs):
+    scrapers = dict()
+    for name in runner.scraper_names:
+        scraper = runner.get_scraper(name)
+        if not scraper.has_run or isinstance(scraper, Aggregator):
+            continue
+        scrapers[name] = {
+            "headers": scraper.headers,
+            "values": {
+                level: [dict(value_dict) for value_dict in values]
+                for level, values in scraper.values.items()
+            },
+            "sources": scraper.sources,
+            "source_urls": sorted(scraper.source_urls),
+            "fallbacks_used": scraper.fallbacks_used,
+            "datasetinfo": {
+                key: scraper.datasetinfo[key]
+                for key in DATASETINFO_KEYS
+                if key in scraper.datasetinfo
+            },
+        }
+    bundle = {
+        "version": BUNDLE_VERSION,
+        "countries": list(countries),
+        "scrapers": scrapers,
+        "tabs": tabs,
+    }
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, default=encode_date)
+    replace(temp_path, path)
+    logger.info(
+        f"Saved {len(scrapers)} scrapers for {len(countries)} countries to {path}"
+    )
+
+
+def read_bundle(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            bundle = json.load(f, object_hook=decode_date)
+    except ValueError:
+        raise BundleError(f"{path} is not a bundle!")
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise BundleError(f"{path} is not a version {BUNDLE_VERSION} bundle!")
+    # JSON has no tuples or sets so restore the types the scrapers use
+    for scraper in bundle["scrapers"].values():
+        scraper["headers"] = {
+            level: tuple(tuple(x) for x in headers)
+            for level, headers in scraper["headers"].items()
+        }
+        scraper["values"] = {
+            level: tuple(values) for level, values in scraper["values"].items()
+        }
+        scraper["sources"] = {
+            level: [tuple(source) for source in sources]
+            for level, sources in scraper["sources"].items()
+        }
+        scraper["source_urls"] = set(scraper["source_urls"])
+    return bundle
+
+
+def merge_tabs(bundles, paths):
+    # Shards write the same tabs so any that differ cannot be merged
+    merged = dict()
+    for bundle, path in zip(bundles, paths):
+        for tabname, rows in bundle["tabs"].items():
+            if tabname in merged and merged[tabname] != rows:
+                raise BundleError(f"{path} has a different {tabname} tab!")
+            merged[tabname] = rows
+    return merged
+
+
+def merge_values(shards, level, owns):
+    # Values come from the shard that owns the admin unit. Values of admin units
+    # outside all shards come from the first shard.
+    merged = None
+    for countries, scraper in shards:
+        values = scraper["values"][level]
+        if merged is None:
+            merged = tuple(dict() for _ in values)
+        for merged_dict, value_dict in zip(merged, values):
+            for adm, value in value_dict.items():
+                if adm not in merged_dict or owns(countries, adm):
+                    merged_dict[adm] = value
+    return merged
+
+
+def get_latest_date(sources):
+    return max((source[1] or "" for source in sources), default="")
+
+
+def merge_sources(sources_list):
+    # Shards can see different dates for the same indicator so the latest wins
+    merged = dict()
+    for sources in sources_list:
+        for source in sources:
+            current = merged.get(source[0])
+            if current is None or (source[1] or "") > (current[1] or ""):
+                merged[source[0]] = source
+    return list(merged.values())
+
+
+def load_bundles(runner, paths, adminlevel):
+    bundles = [read_bundle(path) for path in paths]
+    for bundle in bundles:
+        bundle["countries"] = set(bundle["countries"])
+    countries = set()
+    for bundle, path in zip(bundles, paths):
+        overlap = countries & bundle["countries"]
+        if overlap:
+            raise BundleError(f"{path} has countries also in other bundles: {overlap}")
+        countries.update(bundle["countries"])
+
+    def owns(countries, adm):
+        iso3 = adminlevel.pcode_to_iso3.get(adm, adm)
+        return iso3 in countries
+
+    names = list()
+    for bundle in bundles:
+        for name in bundle["scrapers"]:
+            if name not in names:
+                names.append(name)
+    for name in names:
+        scraper = runner.get_scraper(name)
+        shards = [
+            (bundle["countries"], bundle["scrapers"][name])
+            for bundle in bundles
+            if name in bundle["scrapers"]
+        ]
+        # A single run would have failed for all countries if it failed for some
+        fallback_shards = [shard for shard in shards if shard[1]["fallbacks_used"]]
+        if fallback_shards:
+            shards = fallback_shards[:1]
+        latest = max(
+            (shard[1] for shard in shards),
+            key=lambda x: max(
+                (get_latest_date(sources) for sources in x["sources"].values()),
+                default="",
+            ),
+        )
+        scraper.headers = latest["headers"]
+        scraper.values = {
+            level: merge_values(shards, level, owns) for level in scraper.headers
+        }
+        scraper.sources = {
+            level: merge_sources(shard[1]["sources"][level] for shard in shards)
+            for level in scraper.headers
+        }
+        scraper.source_urls = set().union(
+            *(shard[1]["source_urls"] for shard in shards)
+        )
+        scraper.fallbacks_used = bool(fallback_shards)
+        scraper.datasetinfo.update(latest["datasetinfo"])
+        scraper.add_population()
+        scraper.has_run = True
+    logger.info(f"Merged {len(names)} scrapers from {len(bundles)} bundles")
+    return merge_tabs(bundles, paths), countries
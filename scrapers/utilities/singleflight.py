@@ -0,0 +1,62 @@
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    # Each key is fetched once per run. Callers asking for a key that is being
+    # fetched wait for that fetch rather than starting their own.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.results = dict()
+            self.fetched = dict()
+            self.coalesced = dict()
+
+    def has(self, kind, key):
+        with self.lock:
+            return (kind, key) in self.results
+
+    def put(self, kind, key, value):
+        # Stores a result fetched some other way, for example in bulk
+        with self.lock:
+            key = (kind, key)
+            if key in self.results:
+                return
+            future = Future()
+            future.set_result(value)
+            self.results[key] = future
+            self.fetched[kind] = self.fetched.get(kind, 0) + 1
+
+    def do(self, kind, key, fetch):
+        key = (kind, key)
+        with self.lock:
+            future = self.results.get(key)
+            if future is None:
+                future = Future()
+                self.results[key] = future
+                self.fetched[kind] = self.fetched.get(kind, 0) + 1
+                owner = True
+            else:
+                self.coalesced[kind] = self.coalesced.get(kind, 0) + 1
+                owner = False
+        if owner:
+            try:
+                future.set_result(fetch())
+            except BaseException as ex:
+                # Failures are not kept so later callers can try again
+                with self.lock:
+                    del self.results[key]
+                future.set_exception(ex)
+        return future.result()
+
+    def log(self):
+        for kind in sorted(self.fetched):
+            logger.info(
+                f"Fetched {self.fetched[kind]} {kind}s, removing {self.coalesced.get(kind, 0)} duplicate requests"
+            )
@@ -0,0 +1,169 @@
+import logging
+from array import array
+from collections.abc import MutableMapping
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+MIN_INT = -(2**63)
+MAX_INT = 2**63 - 1
+
+
+def get_kind(value):
+    # Only values that come back unchanged from a typed array go in one
+    value_type = type(value)
+    if value_type is int and MIN_INT <= value <= MAX_INT:
+        return "int"
+    if value_type is float:
+        return "float"
+    return "object"
+
+
+dtypes = {"int": numpy.int64, "float": numpy.float64, "object": object}
+
+
+class RowIndex:
+    def __init__(self, adms=tuple()):
+        self.rows = dict()
+        self.adms = list()
+        for adm in adms:
+            self.add(adm)
+
+    def __len__(self):
+        return len(self.adms)
+
+    def add(self, adm):
+        row = self.rows.get(adm)
+        if row is None:
+            row = len(self.adms)
+            self.rows[adm] = row
+            self.adms.append(adm)
+        return row
+
+    def get_rows(self, adms):
+        return numpy.array([self.rows.get(adm, -1) for adm in adms], dtype=numpy.int64)
+
+
+class ValueColumn(MutableMapping):
+    # Values of one header in a typed array with a mask of which rows have
+    # values. Iterates in insertion order like the dict it replaces.
+    def __init__(self, index, values=None):
+        self.index = index
+        self.kind = None
+        self.array = numpy.empty(0, dtype=object)
+        self.valid = numpy.zeros(0, dtype=bool)
+        self.order = array("q")
+        if values:
+            self.update(values)
+
+    def grow(self, size):
+        size = max(size, len(self.index), 2 * len(self.valid))
+        array = numpy.zeros(size, dtype=self.array.dtype)
+        array[: len(self.array)] = self.array
+        self.array = array
+        valid = numpy.zeros(size, dtype=bool)
+        valid[: len(self.valid)] = self.valid
+        self.valid = valid
+
+    def __setitem__(self, adm, value):
+        row = self.index.add(adm)
+        if row >= len(self.valid):
+            self.grow(row + 1)
+        kind = get_kind(value)
+        if self.kind is None:
+            self.kind = kind
+            self.array = self.array.astype(dtypes[kind])
+        elif kind != self.kind and self.kind != "object":
+            # Mixed types are kept as the objects they were given as
+            array = numpy.empty(len(self.array), dtype=object)
+            array[self.valid] = self.array[self.valid].tolist()
+            self.array = array
+            self.kind = "object"
+        self.array[row] = value
+        if not self.valid[row]:
+            self.valid[row] = True
+            self.order.append(row)
+
+    def get_row(self, adm):
+        row = self.index.rows.get(adm)
+        if row is None or row >= len(self.valid) or not self.valid[row]:
+            return None
+        return row
+
+    def __getitem__(self, adm):
+        row = self.get_row(adm)
+        if row is None:
+            raise KeyError(adm)
+        if self.kind == "object":
+            return self.array[row]
+        return self.array[row].item()
+
+    def get(self, adm, default=None):
+        row = self.get_row(adm)
+        if row is None:
+            return default
+        if self.kind == "object":
+            return self.array[row]
+        return self.array[row].item()
+
+    def __contains__(self, adm):
+        return self.get_row(adm) is not None
+
+    def __delitem__(self, adm):
+        row = self.get_row(adm)
+        if row is None:
+            raise KeyError(adm)
+        self.valid[row] = False
+        self.array[row] = None if self.kind == "object" else 0
+        self.order.remove(row)
+
+    def __iter__(self):
+        adms = self.index.adms
+        return (adms[row] for row in self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def take(self, rows):
+        # Object array of values for rows from RowIndex.get_rows with None
+        # where there is no value
+        column = numpy.full(len(rows), None, dtype=object)
+        if len(self.valid) == 0:
+            return column
+        inside = (rows >= 0) & (rows < len(self.valid))
+        rows = numpy.where(inside, rows, 0)
+        valid = inside & self.valid[rows]
+        column[valid] = self.array[rows[valid]].astype(object)
+        return column
+
+
+def get_column(values, count):
+    return numpy.fromiter(values, dtype=object, count=count)
+
+
+class ValueStore:
+    def __init__(self, level_adms):
+        self.indexes = {level: RowIndex(adms) for level, adms in level_adms.items()}
+
+    def get_index(self, level):
+        index = self.indexes.get(level)
+        if index is None:
+            index = RowIndex()
+            self.indexes[level] = index
+        return index
+
+    def install(self, runner):
+        # Values already in the scrapers, for example from bundles, are kept
+        for name in runner.scraper_names:
+            scraper = runner.get_scraper(name)
+            for level, values in scraper.values.items():
+                index = self.get_index(level)
+                scraper.values[level] = tuple(
+                    ValueColumn(index, header_values) for header_values in values
+                )
+        runner.value_store = self
+        logger.info(f"Keeping values of {len(runner.scraper_names)} scrapers in arrays")
@@ -1,9 +1,12 @@
+import asyncio
 import logging
 
 from hdx.data.hdxobject import HDXError
 from hdx.scraper.base_scraper import BaseScraper
 from hdx.utilities.dictandlist import dict_of_sets_add
 
+from .utilities.deadlines import finish
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,32 +19,48 @@ class WhoWhatWhere(BaseScraper):
         )
         self.today = today
         self.adminone = adminone
+        self.columns = ("#adm1+code", "#adm2+code", "#adm1+name", "#loc", "#org")
+
+    async def read_country_data(self, reader, ds_row):
+        countryiso3 = ds_row["Country ISO"]
+        dataset_name = ds_row["Dataset Name"]
+        if not dataset_name:
+            logger.warning(f"No 3w data for {countryiso3}.")
+            return None, None
+        try:
+            dataset = await reader.read_dataset_async(dataset_name)
+            resource = dataset.get_resource()
+        except HDXError:
+            logger.warning(
+                f"Could not download resource data for {countryiso3}. Check dataset name."
+            )
+            return None, None
+        data = await reader.read_hxl_resource_async(
+            countryiso3, resource, "3w data", columns=self.columns
+        )
+        return dataset, data
 
     def run(self) -> None:
+        asyncio.run(self.run_async())
+
+    async def run_async(self) -> None:
         threew_url = self.datasetinfo["url"]
         reader = self.get_reader()
         headers, iterator = reader.get_tabular_rows(
             threew_url, headers=1, dict_form=True, format="csv"
         )
         rows = list(iterator)
+        reader.read_datasets(ds_row["Dataset Name"] for ds_row in rows)
+        # Countries are downloaded together and their rows read in order
+        countries_data = await asyncio.gather(
+            *(self.read_country_data(reader, ds_row) for ds_row in rows)
+        )
+        finish()
         orgdict = dict()
-        for ds_row in rows:
-            countryiso3 = ds_row["Country ISO"]
-            dataset_name = ds_row["Dataset Name"]
-            if not dataset_name:
-                logger.warning(f"No 3w data for {countryiso3}.")
-                continue
-            try:
-                dataset = reader.read_dataset(dataset_name)
-                resource = dataset.get_resource()
-            except HDXError:
-                logger.warning(
-                    f"Could not download resource data for {countryiso3}. Check dataset name."
-                )
-                continue
-            data = reader.read_hxl_resource(countryiso3, resource, "3w data")
+        for ds_row, (dataset, data) in zip(rows, countries_data):
             if data is None:
                 continue
+            countryiso3 = ds_row["Country ISO"]
             self.source_urls.add(dataset.get_hdx_url())
             pcodes_found = False
             for row in data:
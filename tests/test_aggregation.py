@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+from hdx.scraper.base_scraper import BaseScraper
+from hdx.scraper.runner import Runner
+
+from scrapers.utilities.aggregation import AggregationEngine
+
+
+class NationalScraper(BaseScraper):
+    values_by_hxltag = {
+        "#population": {"SDN": 100, "SYR": 250, "YEM": None, "LBN": 7},
+        "#value+funding+hrp+required+usd": {"SDN": 10.5, "SYR": 3, "YEM": 0.1},
+        "#value+funding+hrp+total+usd": {"SDN": 2, "SYR": "1|2.5", "YEM": ""},
+        "#value+funding+hrp+pct": {"SDN": "0.1", "SYR": "0.2"},
+        "#access+visas+pct": {"SDN": 1, "SYR": 2, "YEM": 4, "LBN": 0.3},
+        "#affected+ch+food+p3plus+num": {"SDN": 5, "SYR": None},
+        "#affected+food+ipc+p3plus+num": {"SYR": 6, "YEM": 7, "SDN": 8},
+    }
+
+    def __init__(self):
+        hxltags = tuple(self.values_by_hxltag)
+        super().__init__(
+            "national",
+            {
+                "source": "Test",
+                "source_url": "http://test",
+                "source_date": datetime(2023, 1, 1, tzinfo=timezone.utc),
+            },
+            {"national": (hxltags, hxltags)},
+        )
+
+    def run(self):
+        for i, values in enumerate(self.values_by_hxltag.values()):
+            self.get_values("national")[i].update(values)
+
+
+class TestAggregation:
+    configuration = {
+        "#population": {"action": "sum"},
+        "#value+funding+hrp+required+usd": {"action": "sum"},
+        "#value+funding+hrp+total+usd": {"action": "sum"},
+        "#value+funding+hrp+pct": {
+            "action": "eval",
+            "formula": "get_fraction_str(#value+funding+hrp+total+usd, #value+funding+hrp+required+usd)",
+        },
+        "#access+visas+pct": {"action": "mean"},
+        "#affected+food+ipc+p3plus+num": {
+            "output": "FoodInsecurityP3+",
+            "action": "sum",
+            "input": [
+                "#affected+ch+food+p3plus+num",
+                "#affected+food+ipc+p3plus+num",
+            ],
+        },
+    }
+    adm_aggregation = {
+        "SDN": ("NA", "ALL"),
+        "SYR": ("ME", "ALL"),
+        "YEM": ("ME", "ALL"),
+        "LBN": ("ME", "ALL"),
+    }
+
+    def run(self, engine):
+        runner = Runner(("SDN", "SYR", "YEM", "LBN"), datetime.now(timezone.utc))
+        runner.add_custom(NationalScraper())
+        names = runner.add_aggregators(
+            True, self.configuration, "national", "regional", self.adm_aggregation
+        )
+        if engine:
+            engine = AggregationEngine(runner, names, "national")
+            engine.install()
+        runner.run()
+        return engine, {
+            name: runner.get_scraper(name).get_values("regional") for name in names
+        }
+
+    def test_aggregation(self):
+        _, expected = self.run(False)
+        engine, results = self.run(True)
+        assert results == expected
+        assert len(engine.results) == 5
+        assert results["value_funding_hrp_pct_regional"][0]["NA"] == "0.1905"
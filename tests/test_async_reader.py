@@ -0,0 +1,52 @@
+import asyncio
+import threading
+from os.path import join
+
+import pytest
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+from scrapers.utilities.deadlines import ScraperTimeoutError, cancelled
+from scrapers.utilities.memo import recording
+from scrapers.utilities.reader import Read
+
+
+class TestAsyncReader:
+    def test_download_json_async(self):
+        UserAgent.set_global("test")
+        folder = join("tests", "fixtures", "input")
+        with temp_dir("TestAsyncReader") as temp_folder:
+            Read.create_readers(temp_folder, folder, temp_folder, use_saved=True)
+            reader = Read.get_reader()
+            filenames = [
+                f"fts_flow-custom-search-planid-{plan_id}-groupby-location.json"
+                for plan_id in (1061, 1066, 1069)
+            ]
+
+            async def download_all():
+                return await asyncio.gather(
+                    *(
+                        reader.download_json_async("https://test/api", filename)
+                        for filename in filenames
+                    )
+                )
+
+            inputs = list()
+            token = recording.set(inputs)
+            try:
+                jsons = asyncio.run(download_all())
+            finally:
+                recording.reset(token)
+            assert jsons == [
+                reader.download_json("https://test/api", filename)
+                for filename in filenames
+            ]
+            # Reads in worker threads are recorded for the scraper
+            assert sorted(input[2][1] for input in inputs) == filenames
+
+            thread = threading.current_thread()
+            cancelled.add(thread)
+            try:
+                with pytest.raises(ScraperTimeoutError):
+                    asyncio.run(download_all())
+            finally:
+                cancelled.discard(thread)
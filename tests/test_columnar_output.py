@@ -0,0 +1,55 @@
+from os.path import join
+
+import pytest
+from hdx.utilities.path import temp_dir
+
+pyarrow = pytest.importorskip("pyarrow")
+from pyarrow import feather, parquet  # noqa: E402
+from scrapers.outputs.columnar import ColumnarFile  # noqa: E402
+
+
+class TestColumnarFile:
+    @pytest.fixture(scope="class")
+    def rows(self):
+        return [
+            ["iso3", "Population", "PercentFunded", "ishrp", "Date", "Code"],
+            [
+                "#country+code",
+                "#population",
+                "#value+funding+hrp+pct",
+                "#meta+ishrp",
+                "#date",
+                "#adm1+code",
+            ],
+            ["SDN", 45657202, "0.2850", "Y", "2023-08-22", "0012"],
+            ["SOM", "17597511", None, "Y", "2023-08-21", "1200"],
+            ["ARE", "", 0.1, "N", None, None],
+        ]
+
+    @pytest.mark.parametrize("format", ColumnarFile.formats)
+    def test_save(self, rows, format):
+        with temp_dir("TestColumnarFile") as folder:
+            columnarout = ColumnarFile(folder, ["national"], format)
+            columnarout.update_tab("national", rows)
+            columnarout.update_tab("regional", rows)
+            filepaths = columnarout.save()
+            assert filepaths == [join(folder, f"national.{format}")]
+            if format == "parquet":
+                table = parquet.read_table(filepaths[0], memory_map=True)
+            else:
+                table = feather.read_table(filepaths[0], memory_map=True)
+            assert table.column_names == rows[0]
+            assert table.schema.field("Population").metadata == {
+                b"hxltag": b"#population"
+            }
+            assert table.schema.field("Population").type == pyarrow.int64()
+            assert table.schema.field("PercentFunded").type == pyarrow.float64()
+            assert table.schema.field("ishrp").type == pyarrow.string()
+            assert table.to_pydict() == {
+                "iso3": ["SDN", "SOM", "ARE"],
+                "Population": [45657202, 17597511, None],
+                "PercentFunded": [0.285, None, 0.1],
+                "ishrp": ["Y", "Y", "N"],
+                "Date": ["2023-08-22", "2023-08-21", None],
+                "Code": ["0012", "1200", None],
+            }
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+from hdx.scraper.configurable import scraper
+
+from scrapers.utilities.configurable import ConfigurableScraper
+
+
+class TestConfigurable:
+    datasetinfo = {
+        "source": "Test",
+        "source_url": "http://test",
+        "source_date": "2023-01-01",
+        "prefilter": "Budget is not None",
+        "filter_cols": ["FundType", "Budget"],
+        "admin": ["Country"],
+        "subsets": [
+            {
+                "filter": "FundType == 'CBPF'",
+                "input": ["Budget"],
+                "transform": {"Budget": "get_numeric_if_possible(Budget)"},
+                "sum": [{"formula": "Budget"}],
+                "output": ["CBPF"],
+                "output_hxl": ["#value+cbpf"],
+            },
+            {
+                "filter": "FundType == 'CERF'",
+                "input": ["Budget"],
+                "transform": {"Budget": "int(Budget) * 2"},
+                "output": ["CERF"],
+                "output_hxl": ["#value+cerf"],
+            },
+            {
+                "filter": "FundType == 'CERF' and Budget",
+                "input": ["Budget"],
+                "transform": {"Budget": "float(Budget)"},
+                "process": ["Budget / 4"],
+                "output": ["CERFQuarter"],
+                "output_hxl": ["#value+cerf+quarter"],
+            },
+        ],
+    }
+    rows = [
+        {"Country": "SDN", "FundType": "CBPF", "Budget": "10.5"},
+        {"Country": "SDN", "FundType": "CBPF", "Budget": "2"},
+        {"Country": "SYR", "FundType": "CERF", "Budget": "3"},
+        {"Country": "SYR", "FundType": "CBPF", "Budget": None},
+        {"Country": "YEM", "FundType": "CBPF", "Budget": "7"},
+    ]
+
+    def run(self, cls):
+        configurable = cls(
+            "allocations",
+            self.datasetinfo,
+            "national",
+            ("SDN", "SYR", "YEM"),
+            today=datetime(2023, 1, 2, tzinfo=timezone.utc),
+        )
+        headers = list(self.rows[0].keys())
+        configurable.get_iterator = lambda name: (headers, iter(self.rows))
+        configurable.run()
+        return configurable
+
+    def test_configurable(self):
+        expected = self.run(scraper.ConfigurableScraper).get_values("national")
+        configurable = self.run(ConfigurableScraper)
+        assert configurable.get_values("national") == expected
+        assert expected == ({"SDN": 12.5, "YEM": 7.0}, {"SYR": 6}, {"SYR": 0.75})
+        assert len(configurable.rowparser.filters_for_eval) == 4
+
+    def test_pinned_version(self):
+        # ConfigurableScraper.run_scraper and Runner.add_configurable are copied
+        # from this version
+        assert version("hdx-python-scraper") == "2.1.9"
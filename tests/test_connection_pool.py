@@ -0,0 +1,74 @@
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+from hdx.utilities.downloader import Download
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.utilities.connectionpool import ConnectionPool, TokenBucket
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool:
+    @pytest.fixture
+    def url(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}/"
+        server.shutdown()
+        server.server_close()
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(2, 0.2)
+        start = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        # 2 calls straight away then 2 more at 0.1s intervals
+        assert 0.15 < time.monotonic() - start < 0.5
+
+    def test_connection_pool(self, url):
+        UserAgent.set_global("test")
+        downloaders = [Download(), Download()]
+        pool = ConnectionPool(
+            {
+                "default": {"max_connections": 2},
+                "hosts": {
+                    "127.0.0.1": {"max_connections": 1, "calls": 2, "period": 0.2}
+                },
+            }
+        )
+        pool.mount(downloader.session for downloader in downloaders)
+        assert downloaders[0].session.get_adapter(url) is pool.adapter
+        assert downloaders[1].session.get_adapter(url) is pool.adapter
+        start = time.monotonic()
+        for i in range(4):
+            assert downloaders[i % 2].download_text(url) == "ok"
+        assert time.monotonic() - start > 0.15
+        stats = pool.get_stats()["127.0.0.1"]
+        assert stats["requests"] == 4
+        assert stats["connections"] == 1
+        assert stats["max_active"] == 1
+        limits = pool.get_limits("127.0.0.1")
+        assert limits.active == 0
+        # A streamed body holds its slot until the response is closed
+        response = downloaders[0].setup(url, stream=True)
+        assert limits.active == 1
+        response.close()
+        assert limits.active == 0
+        for downloader in downloaders:
+            downloader.close()
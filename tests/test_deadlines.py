@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from scrapers.utilities.deadlines import (
+    Deadlines,
+    ScraperTimeoutError,
+    cancelled,
+    check_cancelled,
+    finish,
+)
+
+
+class SlowScraper:
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.checked = threading.Event()
+        self.error = None
+
+    def run(self):
+        self.thread = threading.current_thread()
+        time.sleep(self.delay)
+        try:
+            check_cancelled()
+        except ScraperTimeoutError as ex:
+            self.error = ex
+        self.checked.set()
+
+
+class WritingScraper(SlowScraper):
+    def __init__(self, name, delay, write_delay):
+        super().__init__(name, delay)
+        self.write_delay = write_delay
+        self.written = False
+
+    def run(self):
+        self.thread = threading.current_thread()
+        time.sleep(self.delay)
+        try:
+            finish()
+        except ScraperTimeoutError as ex:
+            self.error = ex
+            return
+        finally:
+            self.checked.set()
+        time.sleep(self.write_delay)
+        self.written = True
+
+
+class TestDeadlines:
+    def test_get_timeout(self):
+        deadlines = Deadlines({"default": 10, "scrapers": {"slow": 20}})
+        assert deadlines.get_timeout("fast") == 10
+        assert deadlines.get_timeout("slow") == 20
+        deadlines = Deadlines({"total": 5})
+        assert 4 < deadlines.get_timeout("fast") <= 5
+        deadlines.start -= 10
+        assert deadlines.get_timeout("fast") < 0
+
+    def test_wrap(self):
+        deadlines = Deadlines({"default": 1})
+        scraper = SlowScraper("fast", 0)
+        deadlines.wrap(scraper)
+        scraper.run()
+        assert scraper.error is None
+
+        deadlines = Deadlines({"default": 0.05})
+        scraper = SlowScraper("slow", 0.2)
+        deadlines.wrap(scraper)
+        with pytest.raises(ScraperTimeoutError):
+            scraper.run()
+        assert scraper.checked.wait(5)
+        assert isinstance(scraper.error, ScraperTimeoutError)
+        scraper.thread.join(5)
+        assert scraper.thread not in cancelled
+
+        deadlines = Deadlines({"total": 0})
+        scraper = SlowScraper("late", 0)
+        deadlines.wrap(scraper)
+        with pytest.raises(ScraperTimeoutError):
+            scraper.run()
+        assert not scraper.checked.is_set()
+
+    def test_finish(self):
+        # Scrapers writing their results are waited for
+        deadlines = Deadlines({"default": 0.05})
+        scraper = WritingScraper("writing", 0, 0.2)
+        deadlines.wrap(scraper)
+        scraper.run()
+        assert scraper.error is None
+        assert scraper.written is True
+
+        # Scrapers that run out of time before writing their results never
+        # write them
+        scraper = WritingScraper("late", 0.2, 0)
+        deadlines.wrap(scraper)
+        with pytest.raises(ScraperTimeoutError):
+            scraper.run()
+        assert scraper.checked.wait(5)
+        scraper.thread.join(5)
+        assert isinstance(scraper.error, ScraperTimeoutError)
+        assert scraper.written is False
+        assert scraper.thread not in cancelled
+
+        # Scrapers writing their results for too long are given up on
+        deadlines = Deadlines({"default": 0.05, "grace": 0.05})
+        scraper = WritingScraper("stuck", 0, 0.5)
+        deadlines.wrap(scraper)
+        start = time.monotonic()
+        with pytest.raises(ScraperTimeoutError):
+            scraper.run()
+        assert time.monotonic() - start < 0.4
+        assert scraper.thread in cancelled
+        scraper.thread.join(5)
+        assert scraper.thread not in cancelled
+
+        # Outside of deadlines there is nothing to wait for
+        finish()
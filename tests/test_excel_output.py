@@ -0,0 +1,36 @@
+from os.path import join
+
+import pytest
+from openpyxl import load_workbook
+from pandas import DataFrame
+
+from scrapers.outputs.excelfile import StreamingExcelFile
+
+
+class TestExcelOutput:
+    @pytest.fixture(scope="class")
+    def tabs(self):
+        return {"national": "national_data", "regional": "regional_data"}
+
+    def test_save(self, tmp_path, tabs):
+        path = join(tmp_path, "test.xlsx")
+        excelout = StreamingExcelFile(path, tabs, ["national", "regional"])
+        excelout.update_tab("national", [["a", "b"], ["#a", "#b"], [1, "x"]])
+        excelout.update_tab("national", [["a", "b"], ["#a", "#b"], [2, "y"]])
+        df = DataFrame({"a": [3, 4], "b": ["z", None]})
+        excelout.update_tab("regional", df, {"a": "#a", "b": "#b"})
+        excelout.update_tab("other", [["c"], ["#c"], [5]])
+        excelout.save()
+        workbook = load_workbook(path)
+        assert workbook.sheetnames == ["national_data", "regional_data"]
+        assert list(workbook["national_data"].values) == [
+            ("a", "b"),
+            ("#a", "#b"),
+            (2, "y"),
+        ]
+        assert list(workbook["regional_data"].values) == [
+            ("a", "b"),
+            ("#a", "#b"),
+            (3, "z"),
+            (4, None),
+        ]
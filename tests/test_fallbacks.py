@@ -0,0 +1,78 @@
+from os.path import join
+
+import pytest
+from hdx.scraper.base_scraper import BaseScraper
+from hdx.scraper.runner import Runner
+from hdx.scraper.utilities.fallbacks import Fallbacks
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.loader import LoadError
+
+from scrapers.utilities.fallbacks import add_fallbacks
+
+
+class FailingScraper(BaseScraper):
+    def __init__(self):
+        super().__init__(
+            "failing",
+            {"source": "Test"},
+            {"national": (("Population",), ("#population",))},
+        )
+
+    def run(self):
+        raise ValueError("Scraper is down!")
+
+
+class TestFallbacks:
+    levels_mapping = {
+        "global": "allregions_data",
+        "regional": "regional_data",
+        "national": "national_data",
+        "subnational": "subnational_data",
+    }
+
+    fallbacks_path = join("tests", "fixtures", "all.json")
+
+    def test_add_fallbacks(self, tmp_path):
+        headers = (
+            ["Population", "Funding"],
+            ["#population", "#value+funding+total+usd"],
+        )
+        Fallbacks.add(
+            self.fallbacks_path,
+            levels_mapping=self.levels_mapping,
+            sources_key="sources_data",
+        )
+        expected = {
+            level: Fallbacks.get(level, headers) for level in self.levels_mapping
+        }
+        add_fallbacks(
+            self.fallbacks_path,
+            levels_mapping=self.levels_mapping,
+            sources_key="sources_data",
+        )
+        assert Fallbacks.exist()
+        assert Fallbacks.fallbacks.sections == {}
+        assert Fallbacks.get("national", headers) == expected["national"]
+        assert sorted(Fallbacks.fallbacks.sections) == ["national_data", "sources_data"]
+        for level in self.levels_mapping:
+            assert Fallbacks.get(level, headers) == expected[level]
+
+        add_fallbacks(join(tmp_path, "missing.json"))
+        assert not Fallbacks.exist()
+
+        path = join(tmp_path, "invalid.json")
+        with open(path, "w") as f:
+            f.write('{"national_data": [{"#country+code": "SYR"')
+        add_fallbacks(path, levels_mapping=self.levels_mapping)
+        assert Fallbacks.exist()
+        with pytest.raises(LoadError):
+            Fallbacks.get("national", headers)
+        assert not Fallbacks.exist()
+
+        # Scrapers fail with their own error when the fallbacks are unreadable
+        add_fallbacks(path, levels_mapping=self.levels_mapping)
+        runner = Runner(("SYR",), parse_date("2022-05-02"))
+        runner.add_custom(FailingScraper())
+        with pytest.raises(ValueError, match="Scraper is down!"):
+            runner.run_one("failing")
+        assert not Fallbacks.exist()
@@ -0,0 +1,168 @@
+import json
+from copy import deepcopy
+
+import pytest
+from gspread.utils import a1_range_to_grid_range
+from scrapers.outputs.googlesheets import GoogleSheets, get_changed_ranges
+
+
+class FakeWorksheet:
+    def __init__(self, id, title, row_count=1000, col_count=26):
+        self.id = id
+        self.title = title
+        self.row_count = row_count
+        self.col_count = col_count
+
+
+class FakeSpreadsheet:
+    def __init__(self, grids):
+        self.grids = grids
+        self.sheets = [FakeWorksheet(i, title, 5, 5) for i, title in enumerate(grids)]
+        self.calls = 0
+        self.bytes = 0
+
+    def call(self, body=None):
+        self.calls += 1
+        if body:
+            self.bytes += len(json.dumps(body))
+
+    @staticmethod
+    def split_range(range):
+        if "!" in range:
+            sheetname, a1 = range.rsplit("!", 1)
+        else:
+            sheetname, a1 = range, None
+        return sheetname.strip("'").replace("''", "'"), a1
+
+    def worksheets(self):
+        self.call()
+        return self.sheets
+
+    def values_batch_get(self, ranges, params=None):
+        self.call()
+        value_ranges = list()
+        for range in ranges:
+            sheetname, _ = self.split_range(range)
+            grid = self.grids[sheetname]
+            value_range = {"range": range}
+            if grid:
+                value_range["values"] = deepcopy(grid)
+            value_ranges.append(value_range)
+        return {"valueRanges": value_ranges}
+
+    def batch_update(self, body):
+        self.call(body)
+        for request in body["requests"]:
+            request = request["appendDimension"]
+            sheet = self.sheets[request["sheetId"]]
+            if request["dimension"] == "ROWS":
+                sheet.row_count += request["length"]
+            else:
+                sheet.col_count += request["length"]
+
+    def values_batch_update(self, body):
+        self.call(body)
+        for data in body["data"]:
+            sheetname, a1 = self.split_range(data["range"])
+            sheet = next(x for x in self.sheets if x.title == sheetname)
+            grid_range = a1_range_to_grid_range(a1)
+            assert grid_range["endRowIndex"] <= sheet.row_count
+            assert grid_range["endColumnIndex"] <= sheet.col_count
+            grid = self.grids[sheetname]
+            for i, row in enumerate(data["values"]):
+                rowindex = grid_range["startRowIndex"] + i
+                while len(grid) <= rowindex:
+                    grid.append([])
+                gridrow = grid[rowindex]
+                for j, value in enumerate(row):
+                    colindex = grid_range["startColumnIndex"] + j
+                    while len(gridrow) <= colindex:
+                        gridrow.append("")
+                    gridrow[colindex] = value
+            # Sheets API does not return trailing empty cells or rows
+            for gridrow in grid:
+                while gridrow and gridrow[-1] == "":
+                    gridrow.pop()
+            while grid and not grid[-1]:
+                grid.pop()
+
+
+class FakeClient:
+    def __init__(self, spreadsheets):
+        self.spreadsheets = spreadsheets
+
+    def open_by_url(self, url):
+        spreadsheet = self.spreadsheets[url]
+        spreadsheet.call()
+        return spreadsheet
+
+
+class TestGoogleSheets:
+    @pytest.fixture(scope="function")
+    def national(self):
+        return [
+            ["iso3", "countryname", "Population", "PercentFunded"],
+            ["#country+code", "#country+name", "#population", "#value+funding+pct"],
+            ["SDN", "Sudan", 45657202, "0.2850"],
+            ["SOM", "Somalia", 17597511, None],
+            ["YEM", "Yemen", 33696612, "0.3012"],
+        ]
+
+    def test_get_changed_ranges(self, national):
+        assert get_changed_ranges(national, deepcopy(national)) == []
+        new = deepcopy(national)
+        new[2][2] = 1
+        new[3][2] = 2
+        new[4][0] = "YYY"
+        new[4][3] = "0.4"
+        assert get_changed_ranges(national, new) == [
+            (2, 2, [[1], [2]]),
+            (4, 0, [["YYY", "Yemen", 33696612, "0.4"]]),
+        ]
+        assert get_changed_ranges(national, new[:3]) == [
+            (2, 2, [[1]]),
+            (3, 0, [["", "", ""]]),
+            (4, 0, [["", "", "", ""]]),
+        ]
+
+    def test_save(self, national):
+        spreadsheet = FakeSpreadsheet({"NationalData": [], "Sources": [["x"]]})
+        gc = FakeClient({"https://sheet": spreadsheet})
+        tabs = {"national": "NationalData", "sources": "Sources"}
+        gsheets = GoogleSheets(
+            {"prod": "https://sheet"}, None, None, tabs, ["national"], gc=gc
+        )
+        gsheets.update_tab("sources", [["y"]])
+        gsheets.update_tab("national", national)
+        gsheets.save()
+        assert spreadsheet.grids["NationalData"] == [
+            [x for x in row if x is not None] for row in national
+        ]
+        assert spreadsheet.grids["Sources"] == [["x"]]
+        assert spreadsheet.calls == 4
+        assert spreadsheet.sheets[0].row_count == 5
+        assert spreadsheet.sheets[0].col_count == 5
+        full_bytes = spreadsheet.bytes
+
+        national = deepcopy(national)
+        national[3][3] = "0.1"
+        national.append(["ARE", "United Arab Emirates", 9441129, None])
+        gsheets.update_tab("national", national)
+        spreadsheet.calls = 0
+        spreadsheet.bytes = 0
+        gsheets.save()
+        assert spreadsheet.grids["NationalData"][3] == [
+            "SOM",
+            "Somalia",
+            17597511,
+            "0.1",
+        ]
+        assert spreadsheet.grids["NationalData"][5] == [
+            "ARE",
+            "United Arab Emirates",
+            9441129,
+        ]
+        assert spreadsheet.calls == 5
+        assert spreadsheet.bytes < full_bytes
+        # Empty cells that are already empty are not sent
+        assert gsheets.stats["cells"] == 19 + 1 + 3
@@ -0,0 +1,109 @@
+import sqlite3
+from contextlib import closing
+from os.path import join
+
+import pytest
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.path import temp_dir
+from scrapers.utilities import history
+from scrapers.utilities.history import RunHistory, get_report, record_read
+
+
+class Scraper:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+
+    def run(self):
+        record_read(100)
+        record_read(0, cache_hit=True)
+        if self.fail:
+            raise ValueError("Failed!")
+
+
+class TestHistory:
+    def test_history(self):
+        durations = iter([1.0, 1.2, 0.8, 1.0, 3.0])
+
+        class Runner:
+            def __init__(self):
+                self.scrapers = {"fts": Scraper("fts"), "ipc": Scraper("ipc", True)}
+                self.scraper_names = list(self.scrapers)
+
+            def get_scraper(self, name):
+                return self.scrapers[name]
+
+        with temp_dir("TestHistory") as temp_folder:
+            path = join(temp_folder, "history.db")
+            for _ in range(5):
+                history = RunHistory(path, parse_date("2022-05-02"))
+                runner = Runner()
+                history.install(runner)
+                runner.get_scraper("fts").run()
+                with pytest.raises(ValueError):
+                    runner.get_scraper("ipc").run()
+                # Durations are fixed so the report is known
+                history.scrapers["fts"]["duration"] = next(durations)
+                history.save()
+            # Shard runs are only compared with runs of the same shard
+            history = RunHistory(path, parse_date("2022-05-02"), (0, 2))
+            runner = Runner()
+            history.install(runner)
+            runner.get_scraper("fts").run()
+            history.scrapers["fts"]["duration"] = 0.2
+            history.save()
+            report = {
+                (scraper["scraper"], scraper["shard"]): scraper
+                for scraper in get_report(path)
+            }
+            shard_fts = report[("fts", "0/2")]
+            assert shard_fts["runs"] == 1
+            assert shard_fts["baseline"] is None
+            assert shard_fts["regressed"] is False
+            report = {
+                scraper["scraper"]: scraper
+                for scraper in get_report(path)
+                if scraper["shard"] is None
+            }
+            fts = report["fts"]
+            assert fts["runs"] == 5
+            assert fts["status"] == "ok"
+            assert fts["baseline"] == 1.0
+            assert fts["ratio"] == 3.0
+            assert fts["regressed"] is True
+            assert fts["p50"] == 1.0
+            assert (fts["requests"], fts["cache_hits"], fts["bytes"]) == (2, 1, 100)
+            assert fts["peak_memory_rise"] >= 0
+            ipc = report["ipc"]
+            assert ipc["status"] == "failed"
+            assert ipc["baseline"] is None
+            assert ipc["regressed"] is False
+            report = {
+                scraper["scraper"]: scraper
+                for scraper in get_report(path, threshold=4.0)
+                if scraper["shard"] is None
+            }
+            assert report["fts"]["regressed"] is False
+
+    def test_migrate(self, monkeypatch):
+        with temp_dir("TestHistoryMigrate") as temp_folder:
+            path = join(temp_folder, "history.db")
+            # Files created before scrapers recorded their rise in peak memory
+            with closing(sqlite3.connect(path)) as connection, connection:
+                connection.execute(
+                    "CREATE TABLE scraper_runs (run_id INTEGER, scraper TEXT, status TEXT, duration REAL, requests INTEGER, bytes INTEGER, cache_hits INTEGER, peak_memory INTEGER)"
+                )
+                connection.execute(
+                    "INSERT INTO scraper_runs VALUES (0, 'fts', 'ok', 1.0, 1, 100, 0, 1000)"
+                )
+            # Peak memory is not recorded without the resource module
+            monkeypatch.setattr(history, "resource", None)
+            scraper = Scraper("fts")
+            run_history = RunHistory(path, parse_date("2022-05-02"))
+            run_history.wrap("fts", scraper)
+            scraper.run()
+            run_history.save()
+            report = get_report(path)
+            assert len(report) == 1
+            assert report[0]["runs"] == 1
+            assert report[0]["peak_memory_rise"] is None
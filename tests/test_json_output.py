@@ -0,0 +1,137 @@
+import gzip
+import json
+from copy import deepcopy
+from os import listdir
+from os.path import exists, getmtime, join
+
+from hdx.utilities.loader import load_json
+from hdx.utilities.path import temp_dir
+from scrapers.outputs.json import JsonFile, get_patch
+
+
+def apply_patch(document, patch):
+    document = deepcopy(document)
+    for operation in patch:
+        keys = [
+            x.replace("~1", "/").replace("~0", "~")
+            for x in operation["path"].split("/")[1:]
+        ]
+        parent = document
+        for key in keys[:-1]:
+            parent = parent[int(key) if isinstance(parent, list) else key]
+        key = keys[-1]
+        if isinstance(parent, list):
+            if operation["op"] == "add" and key == "-":
+                parent.append(operation["value"])
+                continue
+            key = int(key)
+        if operation["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = operation["value"]
+    return document
+
+
+class TestJsonFile:
+    def test_get_patch(self):
+        old = load_json(join("tests", "fixtures", "all.json"))
+        new = deepcopy(old)
+        new["national_data"][2]["#population"] = "123"
+        del new["national_data"][3]["#population"]
+        new["national_data"][4]["#new/tag"] = "1"
+        new["subnational_data"] = new["subnational_data"][:-2]
+        new["sources_data"].append({"#indicator+name": "#test"})
+        del new["regional_reqfund_data"]
+        patch = get_patch(old, new)
+        assert len(patch) == 7
+        assert patch[0] == {"op": "remove", "path": "/regional_reqfund_data"}
+        assert patch[1] == {
+            "op": "replace",
+            "path": "/national_data/2/#population",
+            "value": "123",
+        }
+        assert patch[3]["path"] == "/national_data/4/#new~1tag"
+        assert apply_patch(old, patch) == new
+        assert get_patch(old, deepcopy(old)) == []
+
+    def test_save(self):
+        configuration = {"output": "all.json", "delta_output": "all_delta.json"}
+        with temp_dir("TestJsonFile") as folder:
+            jsonout = JsonFile(configuration, ["national"])
+            jsonout.add_data_row("national", {"#country+code": "EGY", "#value": "1"})
+            jsonout.add_data_row("national", {"#country+code": "SDN", "#value": "2"})
+            jsonout.save(folder)
+            path = join(folder, "all.json")
+            delta_path = join(folder, "all_delta.json")
+            delta = load_json(delta_path)
+            assert delta["base"] is None
+            assert apply_patch({}, delta["patch"]) == load_json(path)
+            mtime = getmtime(path)
+            jsonout.save(folder)
+            assert getmtime(path) == mtime
+            delta = load_json(delta_path)
+            assert delta["base"] == delta["target"]
+            assert delta["patch"] == []
+            old = load_json(path)
+            jsonout.json["national_data"][1]["#value"] = "3"
+            jsonout.save(folder)
+            delta = load_json(delta_path)
+            assert delta["patch"] == [
+                {"op": "replace", "path": "/national_data/1/#value", "value": "3"}
+            ]
+            assert apply_patch(old, delta["patch"]) == load_json(path)
+            # A corrupt previous output gets a full delta
+            with open(path, "w") as f:
+                f.write('{"national_data": [')
+            jsonout.save(folder)
+            delta = load_json(delta_path)
+            assert delta["base"] is None
+            assert apply_patch({}, delta["patch"]) == load_json(path)
+            assert [name for name in listdir(folder) if name.startswith(".")] == []
+
+    def test_save_shards(self):
+        configuration = {
+            "output": "all.json",
+            "shards": {
+                "folder": "countries",
+                "index_output": "index.json",
+                "index": ["allregions", "regional", "regional_reqfund", "sources"],
+                "countries": ["national", "subnational"],
+                "compress": ["gzip"],
+            },
+        }
+        with temp_dir("TestJsonFileShards") as folder:
+            jsonout = JsonFile(configuration, ["national"], shards=True)
+            jsonout.json = load_json(join("tests", "fixtures", "all.json"))
+            filepaths = jsonout.save(folder)
+            shards_folder = join(folder, "countries")
+            index = load_json(join(shards_folder, "index.json"))
+            assert list(index.keys()) == [
+                "allregions_data",
+                "regional_data",
+                "regional_reqfund_data",
+                "sources_data",
+                "countries",
+            ]
+            assert len(index["countries"]) == len(jsonout.json["national_data"])
+            sdn = load_json(join(shards_folder, index["countries"]["SDN"]))
+            assert sdn["national_data"] == [
+                x for x in jsonout.json["national_data"] if x["#country+code"] == "SDN"
+            ]
+            assert len(sdn["subnational_data"]) == 19
+            with gzip.open(join(shards_folder, "SDN.json.gz")) as f:
+                assert json.load(f) == sdn
+            assert join(shards_folder, "SDN.json.gz") in filepaths
+            # Shards of countries no longer output are removed
+            jsonout.json["national_data"] = [
+                x for x in jsonout.json["national_data"] if x["#country+code"] != "SDN"
+            ]
+            jsonout.json["subnational_data"] = [
+                x
+                for x in jsonout.json["subnational_data"]
+                if x["#country+code"] != "SDN"
+            ]
+            jsonout.save(folder)
+            assert not exists(join(shards_folder, "SDN.json"))
+            assert not exists(join(shards_folder, "SDN.json.gz"))
+            assert exists(join(shards_folder, "SYR.json"))
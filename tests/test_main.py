@@ -1,15 +1,17 @@
 import filecmp
+from os import makedirs
 from os.path import join
 
 import pytest
 from hdx.api.configuration import Configuration
 from hdx.scraper.outputs.base import BaseOutput
 from hdx.scraper.outputs.json import JsonFile
-from hdx.scraper.utilities.reader import Read
+from scrapers.utilities.reader import Read
 from hdx.utilities.dateparse import parse_date
 from hdx.utilities.errors_onexit import ErrorsOnExit
 from hdx.utilities.path import temp_dir
 from hdx.utilities.useragent import UserAgent
+from scrapers.ipc import IPC
 from scrapers.main import get_indicators
 
 
@@ -61,3 +63,71 @@ class TestArabLeague:
                 )
                 filename = configuration["json"]["output"]
                 assert filecmp.cmp(filepaths[0], join(folder, filename))
+
+    def test_get_indicators_shards(self, configuration, folder, monkeypatch):
+        # IPC falls back so that shards have fallback values for countries
+        # outside them which are aggregated with Cadre Harmonise
+        scrapers_to_run = (
+            "cadre_harmonise_national",
+            "population_national",
+            "population_subnational",
+            "idps_national",
+            "inneed_national",
+            "fts",
+            "inform",
+            "ipc",
+        )
+
+        def fail(self):
+            raise ValueError("IPC is down!")
+
+        monkeypatch.setattr(IPC, "run_async", fail)
+        errors_on_exit = ErrorsOnExit()
+        with temp_dir(
+            "TestArabLeagueShards", delete_on_success=True, delete_on_failure=False
+        ) as temp_folder:
+            today = parse_date("2022-05-02")
+            Read.create_readers(
+                temp_folder,
+                join(folder, "input"),
+                temp_folder,
+                save=False,
+                use_saved=True,
+                today=today,
+            )
+            tabs = configuration["tabs"]
+
+            def run(name, **kwargs):
+                noout = BaseOutput(tabs)
+                jsonout = JsonFile(configuration["json"], tabs)
+                outputs = {"gsheets": noout, "excel": noout, "json": jsonout}
+                countries_to_save = get_indicators(
+                    configuration,
+                    today,
+                    outputs,
+                    tabs,
+                    scrapers_to_run=list(scrapers_to_run),
+                    errors_on_exit=errors_on_exit,
+                    use_live=False,
+                    **kwargs,
+                )
+                if "shard_bundle" in kwargs:
+                    return None
+                output_folder = join(temp_folder, name)
+                makedirs(output_folder)
+                return jsonout.save(
+                    folder=output_folder, countries_to_save=countries_to_save
+                )[0]
+
+            single_path = run("single")
+            bundles = [join(temp_folder, f"shard{i}.json") for i in range(2)]
+            for i, bundle in enumerate(bundles):
+                run(f"shard{i}", shard=(i, 2), shard_bundle=bundle)
+            merged_path = run("merged", merge_bundles=bundles)
+            assert filecmp.cmp(merged_path, single_path, shallow=False)
+            # Only the single run and each shard fall back for IPC
+            assert len(errors_on_exit.errors) == 3
+            assert all(
+                error.startswith("Using fallbacks for ipc!")
+                for error in errors_on_exit.errors
+            )
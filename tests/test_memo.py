@@ -0,0 +1,89 @@
+from os.path import join
+
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+from scrapers.utilities.memo import Memo
+from scrapers.utilities.reader import Read
+
+
+class TestMemo:
+    def test_memo(self):
+        UserAgent.set_global("test")
+
+        class Scraper:
+            name = "test"
+
+            def __init__(self):
+                self.datasetinfo = {"url": "https://test/data.csv"}
+                self.headers = {"national": (("Orgs",), ("#org+count",))}
+                self.values = {"national": ({},)}
+                self.source_urls = set()
+                self.runs = 0
+
+            def run(self):
+                self.runs += 1
+                reader = Read.get_reader()
+                path = reader.download_file(self.datasetinfo["url"], "data.csv")
+                with open(path) as f:
+                    self.values["national"][0]["AFG"] = len(f.read())
+                rjson = reader.download_json("https://test/data.json", "data.json")
+                self.values["national"][0]["AFG"] += rjson["extra"]
+                self.datasetinfo["source_date"] = today
+
+        class Runner:
+            scraper_names = ["test"]
+
+            def __init__(self, scraper):
+                self.scraper = scraper
+
+            def get_scraper(self, name):
+                return self.scraper
+
+        def run_scraper(memo_path, today):
+            scraper = Scraper()
+            memo = Memo(memo_path, today, ["AFG"], ["test"])
+            memo.install(Runner(scraper))
+            scraper.run()
+            memo.save()
+            return scraper, memo
+
+        with temp_dir("TestMemo") as temp_folder:
+            Read.create_readers(temp_folder, temp_folder, temp_folder, use_saved=True)
+            memo_path = join(temp_folder, "memo.pkl")
+            with open(join(temp_folder, "data.csv"), "w") as f:
+                f.write("abc")
+            with open(join(temp_folder, "data.json"), "w") as f:
+                f.write('{"extra": 0}')
+            today = parse_date("2022-05-01")
+            scraper, memo = run_scraper(memo_path, today)
+            assert scraper.runs == 1
+            assert memo.misses == ["test"]
+            assert scraper.values["national"][0] == {"AFG": 3}
+            # JSON is checked by the hash of its file
+            inputs = memo.entries["test"]["inputs"]
+            assert [input[0] for input in inputs] == ["file", "file"]
+
+            Read.requests.reset()
+            next_day = parse_date("2022-05-02")
+            scraper, memo = run_scraper(memo_path, next_day)
+            assert scraper.runs == 0
+            assert memo.hits == ["test"]
+            assert scraper.values["national"][0] == {"AFG": 3}
+            assert scraper.datasetinfo["source_date"] == next_day
+
+            Read.requests.reset()
+            with open(join(temp_folder, "data.csv"), "w") as f:
+                f.write("abcd")
+            scraper, memo = run_scraper(memo_path, next_day)
+            assert scraper.runs == 1
+            assert memo.misses == ["test"]
+            assert scraper.values["national"][0] == {"AFG": 4}
+
+            Read.requests.reset()
+            with open(join(temp_folder, "data.json"), "w") as f:
+                f.write('{"extra": 1}')
+            scraper, memo = run_scraper(memo_path, next_day)
+            assert scraper.runs == 1
+            assert memo.misses == ["test"]
+            assert scraper.values["national"][0] == {"AFG": 5}
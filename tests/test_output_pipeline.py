@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+from hdx.scraper.outputs.base import BaseOutput
+
+from scrapers.outputs.pipeline import OutputPipeline
+
+
+class SlowOutput(BaseOutput):
+    def __init__(self, updatetabs, delay=0.2, fail=False):
+        super().__init__(updatetabs)
+        self.delay = delay
+        self.fail = fail
+        self.tabs = list()
+        self.threads = set()
+        self.saved = None
+
+    def update_tab(self, tabname, values, hxltags=None):
+        time.sleep(self.delay / 10)
+        self.threads.add(threading.get_ident())
+        self.tabs.append((tabname, values))
+
+    def save(self, **kwargs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("Save failed!")
+        self.saved = kwargs
+
+
+class TestOutputPipeline:
+    def test_pipeline(self):
+        outputs = {
+            "json": SlowOutput(["national", "regional"]),
+            "excel": SlowOutput(["national"]),
+        }
+        start = time.time()
+        with OutputPipeline(outputs) as pipeline:
+            rows = [["a"], ["#a"], [1]]
+            for output in pipeline.outputs.values():
+                output.update_tab("national", rows)
+                output.update_tab("regional", [["b"], ["#b"], [2]])
+            rows[2][0] = 3
+            pipeline.outputs["json"].save(countries_to_save=["SDN"])
+            pipeline.outputs["excel"].save()
+            assert time.time() - start < 0.1
+        assert time.time() - start < 0.35
+        assert outputs["json"].tabs == [
+            ("national", [["a"], ["#a"], [1]]),
+            ("regional", [["b"], ["#b"], [2]]),
+        ]
+        assert outputs["excel"].tabs == [("national", [["a"], ["#a"], [1]])]
+        assert outputs["json"].saved == {"countries_to_save": ["SDN"]}
+        assert outputs["excel"].saved == {}
+        assert threading.get_ident() not in outputs["json"].threads
+
+    def test_errors(self):
+        outputs = {
+            "json": SlowOutput(["national"], delay=0.01),
+            "gsheets": SlowOutput(["national"], delay=0.01, fail=True),
+        }
+        with pytest.raises(ValueError):
+            with OutputPipeline(outputs) as pipeline:
+                for output in pipeline.outputs.values():
+                    output.save()
+        assert outputs["json"].saved == {}
@@ -0,0 +1,61 @@
+from os.path import join
+
+from hdx.scraper.outputs.base import BaseOutput
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.loader import load_json, load_yaml
+from hdx.utilities.path import temp_dir
+from hdx.utilities.saver import save_json
+from hdx.utilities.useragent import UserAgent
+from scrapers.fts import FTS
+from scrapers.utilities.planstore import PlanStore
+from scrapers.utilities.reader import Read
+
+
+class TestPlanStore:
+    def test_plan_store(self):
+        UserAgent.set_global("test")
+        configuration = load_yaml(join("config", "project_configuration.yml"))
+        countries = configuration["countries"]
+        today = parse_date("2022-05-02")
+
+        def run_fts(store_path):
+            plan_store = PlanStore(store_path)
+            fts = FTS(
+                configuration["fts"],
+                today,
+                {"test": BaseOutput([])},
+                countries,
+                plan_store=plan_store,
+            )
+            fts.run()
+            return fts.get_values("national"), plan_store
+
+        with temp_dir("TestPlanStore") as temp_folder:
+            Read.create_readers(
+                temp_folder,
+                join("tests", "fixtures", "input"),
+                temp_folder,
+                use_saved=True,
+                today=today,
+            )
+            store_path = join(temp_folder, "fts_plans.json")
+            expected, plan_store = run_fts(store_path)
+            calls = plan_store.calls
+            assert calls != 0
+            assert plan_store.saved_calls == 0
+            plans = load_json(store_path)
+            assert len(plans) == calls
+
+            values, plan_store = run_fts(store_path)
+            assert values == expected
+            assert plan_store.calls == 0
+            assert plan_store.saved_calls == calls
+
+            plan_id = sorted(plans)[0]
+            plans[plan_id]["funding"] = -1
+            save_json(plans, store_path)
+            values, plan_store = run_fts(store_path)
+            assert values == expected
+            assert plan_store.calls == 1
+            assert plan_store.saved_calls == calls - 1
+            assert load_json(store_path)[plan_id]["funding"] != -1
@@ -0,0 +1,69 @@
+from io import BytesIO
+from os.path import join
+
+import pytest
+from hdx.utilities.loader import LoadError, load_json
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+from scrapers.utilities.projection import First, fields, project_json
+from scrapers.utilities.reader import Read
+
+
+class TestProjection:
+    def test_project_json(self):
+        data = b'{"a": 1.5, "b": [{"c": [1, 2], "d": {"e": 1}}, 3], "f": null, "g": {}}'
+        assert project_json(BytesIO(data), None) == {
+            "a": 1.5,
+            "b": [{"c": [1, 2], "d": {"e": 1}}, 3],
+            "f": None,
+            "g": {},
+        }
+        assert project_json(BytesIO(data), fields("a", b=[fields("c")])) == {
+            "a": 1.5,
+            "b": [{"c": [1, 2]}, 3],
+        }
+        assert project_json(BytesIO(data), {"b": First(fields("d"))}) == {
+            "b": [{"d": {"e": 1}}]
+        }
+        assert project_json(BytesIO(data), {"f": {"x": None}, "h": None}) == {"f": None}
+        assert project_json(BytesIO(b"[]"), First()) == []
+        with pytest.raises(LoadError):
+            project_json(BytesIO(b'{"a": [1, 2}'), None)
+        with pytest.raises(LoadError):
+            project_json(BytesIO(b""), None)
+
+    def test_download_projected_json(self):
+        UserAgent.set_global("test")
+        folder = join("tests", "fixtures", "input")
+        with temp_dir("TestProjection") as temp_folder:
+            Read.create_readers(temp_folder, folder, temp_folder, use_saved=True)
+            reader = Read.get_reader()
+            filename = "inform_apr2022-page-1.json"
+            projection = {"results": [fields("iso3", "drivers")], "next": None}
+            json = reader.download_json(
+                "https://test/api", filename=filename, projection=projection
+            )
+            expected = load_json(join(folder, filename))
+            assert json == {
+                "results": [
+                    {"iso3": result["iso3"], "drivers": result["drivers"]}
+                    for result in expected["results"]
+                ],
+                "next": expected["next"],
+            }
+            # Reads of the same URL and projection are shared but each caller
+            # gets its own copy
+            json["next"] = "changed"
+            shared = reader.download_json(
+                "https://test/api",
+                filename=filename,
+                projection={"results": [fields("iso3", "drivers")], "next": None},
+            )
+            assert shared is not json
+            assert shared["next"] == expected["next"]
+            assert shared["results"] == json["results"]
+            assert (
+                reader.download_json("https://test/api", filename=filename) == expected
+            )
+            assert reader.requests.fetched["json"] == 2
+            assert reader.requests.coalesced["json"] == 1
@@ -0,0 +1,62 @@
+import re
+from os.path import join
+
+import pytest
+from hdx.api.configuration import Configuration
+from hdx.data.dataset import Dataset
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+
+from scrapers.utilities.reader import Read
+
+
+class FakeCKAN:
+    # Answers package_search name queries from saved datasets
+    def __init__(self, folder, names):
+        self.datasets = {
+            name: Dataset.load_from_json(join(folder, f"{name}.json")) for name in names
+        }
+        self.searches = list()
+
+    def package_search(self, fq, rows):
+        names = re.findall(r'"([^"]+)"', fq)
+        self.searches.append(names)
+        results = [self.datasets[name] for name in names if name in self.datasets]
+        return results[:rows]
+
+
+class TestReadDatasets:
+    @pytest.fixture(scope="class")
+    def configuration(self):
+        UserAgent.set_global("test")
+        Configuration._create(hdx_read_only=True, hdx_site="prod")
+        return Configuration.read()
+
+    @pytest.fixture(scope="class")
+    def names(self):
+        return [
+            "afghanistan-displacement-data-baseline-assessment-iom-dtm",
+            "burundi-baseline-assessment-data-iom-dtm",
+            "cameroon-baseline-assessment-data-iom-dtm",
+            "car-baseline-assessment-data-iom-dtm",
+            "ethiopia-baseline-assessment-data-iom-dtm",
+        ]
+
+    def test_read_datasets(self, configuration, names):
+        folder = join("tests", "fixtures", "input")
+        ckan = FakeCKAN(folder, names)
+        with temp_dir("TestReadDatasets") as temp_folder:
+            Read.create_readers(temp_folder, temp_folder, temp_folder)
+            reader = Read.get_reader()
+            reader.read_datasets(
+                names + ["", names[0], "missing"], ckan.package_search, batch_size=4
+            )
+            assert ckan.searches == [names[:4], names[4:] + ["missing"]]
+            for name in names:
+                dataset = reader.read_dataset(name)
+                assert dataset["name"] == name
+                assert dataset.get_resource()["url"]
+            assert reader.requests.coalesced == {"dataset": 5}
+            assert not reader.requests.has("dataset", "missing")
+            reader.read_datasets(names, ckan.package_search)
+            assert len(ckan.searches) == 2
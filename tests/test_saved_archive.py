@@ -0,0 +1,65 @@
+import filecmp
+from os import listdir
+from os.path import join
+
+import pytest
+from hdx.utilities.loader import load_json
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+from scrapers.utilities.reader import Read
+from scrapers.utilities.saved_archive import (
+    SavedArchive,
+    SavedArchiveError,
+    pack_directory,
+    unpack_archive,
+)
+
+
+class TestSavedArchive:
+    @pytest.fixture(scope="class")
+    def folder(self):
+        return join("tests", "fixtures", "input")
+
+    def test_pack_unpack(self, folder):
+        with temp_dir("TestSavedArchive") as temp_folder:
+            archive_path = join(temp_folder, "saved_data.arc")
+            count = pack_directory(folder, archive_path)
+            filenames = sorted(listdir(folder))
+            assert count == len(filenames)
+            with SavedArchive(archive_path) as archive:
+                assert sorted(archive.names()) == filenames
+                assert "iati-egy.json" in archive
+                assert "missing.json" not in archive
+                with open(join(folder, "iati-egy.json"), "rb") as f:
+                    assert archive.read("iati-egy.json") == f.read()
+                with pytest.raises(KeyError):
+                    archive.read("missing.json")
+            unpacked_folder = join(temp_folder, "unpacked")
+            assert unpack_archive(archive_path, unpacked_folder) == count
+            _, mismatch, errors = filecmp.cmpfiles(
+                folder, unpacked_folder, filenames, shallow=False
+            )
+            assert mismatch == []
+            assert errors == []
+            with pytest.raises(SavedArchiveError):
+                SavedArchive(join(folder, "iati-egy.json"))
+
+    def test_read_from_archive(self, folder):
+        UserAgent.set_global("test")
+        with temp_dir("TestSavedArchiveRead") as temp_folder:
+            archive_path = join(temp_folder, "saved_data.arc")
+            pack_directory(folder, archive_path)
+            Read.create_readers(
+                temp_folder,
+                "saved_data",
+                temp_folder,
+                use_saved=True,
+                saved_archive=archive_path,
+            )
+            reader = Read.get_reader()
+            filename = "inform_apr2022-page-1.json"
+            json = reader.download_json("https://test/api", filename=filename)
+            assert json == load_json(join(folder, filename))
+            filename = "allocations_download-full-pfmb-allocations.csv"
+            path = reader.download_file("https://test/file.csv", filename=filename)
+            assert filecmp.cmp(path, join(folder, filename), shallow=False)
@@ -0,0 +1,29 @@
+import time
+from os.path import exists, join
+from threading import Timer
+
+from scrapers.utilities.scheduler import Scheduler
+
+
+class TestScheduler:
+    def test_get_next_time(self):
+        scheduler = Scheduler(3600)
+        assert scheduler.get_next_time(7200) == 10800
+        assert scheduler.get_next_time(7201.5) == 10800
+
+    def test_scheduler(self, tmp_path):
+        trigger_path = join(tmp_path, "trigger")
+        scheduler = Scheduler(3600, trigger_path, max_cycles=2, poll=0.01)
+        timer = Timer(0.1, lambda: open(trigger_path, "w").close())
+        timer.start()
+        start = time.time()
+        times = list(scheduler)
+        assert len(times) == 2
+        assert time.time() - start < 5
+        assert scheduler.cycles == 2
+        assert not exists(trigger_path)
+
+        scheduler = Scheduler(0.05, max_cycles=3, poll=0.01)
+        start = time.time()
+        assert len(list(scheduler)) == 3
+        assert time.time() - start < 1
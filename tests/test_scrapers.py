@@ -0,0 +1,118 @@
+import json
+from os import listdir
+from os.path import exists, join, splitext
+from timeit import default_timer as timer
+
+import pytest
+from hdx.api.configuration import Configuration
+from hdx.scraper.outputs.base import BaseOutput
+from hdx.scraper.utilities.fallbacks import Fallbacks
+from hdx.scraper.utilities.sources import Sources
+from hdx.utilities.dateparse import parse_date
+from hdx.utilities.loader import load_json
+from hdx.utilities.path import temp_dir
+from hdx.utilities.saver import save_json
+from hdx.utilities.useragent import UserAgent
+from scrapers.main import add_scrapers, population_scrapers, setup_indicators
+from scrapers.utilities.reader import Read
+from scrapers.utilities.runner import Runner
+
+# Each scraper is run on its own against the saved inputs and its values and
+# sources compared to its golden file. Run with --update-goldens to rewrite
+# them and with -n auto to spread the scrapers over all cores. There are no
+# fallbacks so a scraper that cannot read its inputs fails.
+fixtures = join("tests", "fixtures")
+inputs = join(fixtures, "input")
+goldens = join(fixtures, "scrapers")
+golden_names = sorted(splitext(filename)[0] for filename in listdir(goldens))
+
+
+def get_output(scraper):
+    output = {
+        "fallbacks_used": scraper.fallbacks_used,
+        "levels": {
+            level: {
+                "headers": scraper.headers[level],
+                "values": scraper.get_values(level),
+                "sources": scraper.get_sources(level),
+            }
+            for level in scraper.headers
+        },
+    }
+    # Same types as read back from the golden file
+    return json.loads(json.dumps(output, default=str))
+
+
+class TestScrapers:
+    @pytest.fixture(scope="class")
+    def runner(self):
+        if not exists(inputs) or not listdir(inputs):
+            pytest.skip(f"No saved inputs in {inputs}")
+        UserAgent.set_global("test")
+        Configuration._create(
+            hdx_read_only=True,
+            hdx_site="prod",
+            project_config_yaml=join("config", "project_configuration.yml"),
+        )
+        configuration = Configuration.read()
+        today = parse_date("2022-05-02")
+        # Same source dates as get_indicators
+        source_date_format = Sources.default_source_date_format
+        Sources.set_default_source_date_format("%Y-%m-%d")
+        fallbacks = Fallbacks.fallbacks
+        Fallbacks.fallbacks = None
+        with temp_dir("TestScrapers") as temp_folder:
+            Read.create_readers(
+                temp_folder,
+                inputs,
+                temp_folder,
+                save=False,
+                use_saved=True,
+                today=today,
+            )
+            countries, all_countries, adminlevel = setup_indicators(
+                configuration, use_live=False
+            )
+            runner = Runner(countries, today)
+            add_scrapers(
+                runner,
+                configuration,
+                today,
+                {"none": BaseOutput([])},
+                countries,
+                all_countries,
+                adminlevel,
+            )
+            for name in population_scrapers:
+                if runner.get_scraper(name):
+                    runner.run_one(name)
+            yield runner
+        Sources.set_default_source_date_format(source_date_format)
+        Fallbacks.fallbacks = fallbacks
+
+    def run_scraper(self, runner, name, record_property=None):
+        start = timer()
+        runner.run_one(name, force_run=True)
+        if record_property:
+            record_property("scraper_seconds", round(timer() - start, 3))
+        scraper = runner.get_scraper(name)
+        assert not scraper.fallbacks_used, f"{name} used fallbacks"
+        return get_output(scraper)
+
+    def test_goldens(self, runner, update_goldens):
+        missing = [name for name in runner.scraper_names if name not in golden_names]
+        if update_goldens:
+            for name in missing:
+                output = self.run_scraper(runner, name)
+                save_json(output, join(goldens, f"{name}.json"), pretty=True)
+        else:
+            assert missing == [], "Run with --update-goldens to add goldens"
+
+    @pytest.mark.parametrize("name", golden_names)
+    def test_scraper(self, runner, name, update_goldens, record_property):
+        output = self.run_scraper(runner, name, record_property)
+        path = join(goldens, f"{name}.json")
+        if update_goldens:
+            save_json(output, path, pretty=True)
+        else:
+            assert output == load_json(path)
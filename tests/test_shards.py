@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+from os.path import join
+
+import pytest
+from hdx.scraper.base_scraper import BaseScraper
+
+from scrapers.utilities.shards import (
+    BundleError,
+    get_shard,
+    load_bundles,
+    merge_sources,
+    save_bundle,
+)
+
+
+class ShardScraper(BaseScraper):
+    def __init__(self, countries=(), fail=False):
+        super().__init__(
+            "test",
+            {"source": "Test"},
+            {
+                "national": (("Population",), ("#population",)),
+                "subnational": (("Cases",), ("#cases",)),
+            },
+        )
+        self.countries = countries
+        self.fail = fail
+
+    def run(self):
+        national = self.get_values("national")[0]
+        subnational = self.get_values("subnational")[0]
+        for i, countryiso3 in enumerate(self.countries):
+            national[countryiso3] = 1000 * (i + 1)
+            subnational[f"{countryiso3[:2]}01"] = i + 1
+
+
+class FakeRunner:
+    def __init__(self, scraper):
+        self.scraper_names = [scraper.name]
+        self.scraper = scraper
+
+    def get_scraper(self, name):
+        return self.scraper
+
+
+class FakeAdminLevel:
+    pcode_to_iso3 = {"SD01": "SDN", "SY01": "SYR", "YE01": "YEM"}
+
+
+class TestShards:
+    def save_shard(self, path, countries, date, fallback=False, tabs=None):
+        scraper = ShardScraper(countries)
+        scraper.run()
+        scraper.datasetinfo["source_date"] = {
+            "default_date": {"end": datetime(2022, 5, 2, tzinfo=timezone.utc)}
+        }
+        scraper.sources = {
+            "national": [("#population", date, "Test", "http://test")],
+            "subnational": [("#cases", date, "Test", "http://test")],
+        }
+        if fallback:
+            scraper.values["national"][0]["YEM"] = 5
+            scraper.fallbacks_used = True
+        scraper.has_run = True
+        if tabs is None:
+            tabs = {"tab": [["a"], ["#a"]]}
+        save_bundle(path, FakeRunner(scraper), countries, tabs)
+
+    def test_get_shard(self):
+        countries = ["SDN", "SYR", "YEM", "LBY", "SOM"]
+        shards = [get_shard(countries, i, 2) for i in range(2)]
+        assert shards == [["SDN", "YEM", "SOM"], ["SYR", "LBY"]]
+        with pytest.raises(BundleError):
+            get_shard(countries, 2, 2)
+
+    def test_merge_sources(self):
+        sources = merge_sources(
+            (
+                [("#a", "2022-01-01", "A", "url"), ("#b", "2022-03-01", "B", "url")],
+                [("#a", "2022-02-01", "A", "url"), ("#c", None, "C", "url")],
+            )
+        )
+        assert sources == [
+            ("#a", "2022-02-01", "A", "url"),
+            ("#b", "2022-03-01", "B", "url"),
+            ("#c", None, "C", "url"),
+        ]
+
+    def test_load_bundles(self, tmp_path):
+        paths = [join(tmp_path, f"shard{i}.json") for i in range(3)]
+        self.save_shard(paths[0], ["SDN"], "2022-01-01")
+        self.save_shard(paths[1], ["SYR", "YEM"], "2022-02-01")
+        scraper = ShardScraper()
+        tabs, countries = load_bundles(FakeRunner(scraper), paths[:2], FakeAdminLevel())
+        assert tabs == {"tab": [["a"], ["#a"]]}
+        assert countries == {"SDN", "SYR", "YEM"}
+        assert scraper.has_run is True
+        assert scraper.get_values("national") == (
+            {"SDN": 1000, "SYR": 1000, "YEM": 2000},
+        )
+        assert scraper.get_values("subnational") == ({"SD01": 1, "SY01": 1, "YE01": 2},)
+        assert scraper.get_sources("national") == [
+            ("#population", "2022-02-01", "Test", "http://test")
+        ]
+        assert scraper.population_lookup["YEM"] == 2000
+        assert scraper.datasetinfo["source_date"] == {
+            "default_date": {"end": datetime(2022, 5, 2, tzinfo=timezone.utc)}
+        }
+
+        self.save_shard(paths[2], ["LBY"], "2022-01-01", tabs={"other": [["b"]]})
+        tabs, _ = load_bundles(FakeRunner(ShardScraper()), paths, FakeAdminLevel())
+        assert tabs == {"tab": [["a"], ["#a"]], "other": [["b"]]}
+        self.save_shard(paths[2], ["LBY"], "2022-01-01", tabs={"tab": [["b"]]})
+        with pytest.raises(BundleError):
+            load_bundles(FakeRunner(ShardScraper()), paths, FakeAdminLevel())
+
+        self.save_shard(paths[2], ["SDN"], "2022-01-01")
+        with pytest.raises(BundleError):
+            load_bundles(FakeRunner(ShardScraper()), paths, FakeAdminLevel())
+
+        self.save_shard(paths[1], ["SYR", "YEM"], "2022-02-01", fallback=True)
+        scraper = ShardScraper()
+        load_bundles(FakeRunner(scraper), paths[:2], FakeAdminLevel())
+        assert scraper.fallbacks_used is True
+        assert scraper.get_values("national") == ({"SYR": 1000, "YEM": 5},)
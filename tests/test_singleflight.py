@@ -0,0 +1,44 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scrapers.utilities.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_do(self):
+        requests = SingleFlight()
+        calls = list()
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"a": 1}
+
+        with ThreadPoolExecutor(5) as executor:
+            futures = [
+                executor.submit(requests.do, "dataset", "test", fetch) for _ in range(5)
+            ]
+            results = [future.result() for future in futures]
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert requests.do("dataset", "test", fetch) == {"a": 1}
+        assert requests.do("file", "test", fetch) == {"a": 1}
+        assert len(calls) == 2
+        assert requests.fetched == {"dataset": 1, "file": 1}
+        assert requests.coalesced == {"dataset": 5}
+
+        def fail():
+            calls.append(1)
+            raise ValueError("Failed!")
+
+        with pytest.raises(ValueError):
+            requests.do("text", "fail", fail)
+        with pytest.raises(ValueError):
+            requests.do("text", "fail", fail)
+        assert len(calls) == 4
+
+        requests.reset()
+        requests.do("dataset", "test", fetch)
+        assert len(calls) == 5
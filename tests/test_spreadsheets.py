@@ -0,0 +1,93 @@
+from os.path import join
+
+from hdx.utilities.path import temp_dir
+from hdx.utilities.useragent import UserAgent
+from openpyxl import Workbook
+
+from scrapers.utilities.reader import Read, get_columns
+
+
+class TestSpreadsheets:
+    def test_get_columns(self):
+        datasetinfo = {
+            "prefilter": "chtype == 'current'",
+            "sort": {"reverse": True, "keys": ["reference_year", "reference_code"]},
+            "admin": ["adm0_pcod3", ["adm1_pcod2", "adm1_name"]],
+            "date": ["reference_year", "reference_code"],
+            "filter_cols": ["chtype"],
+            "input": ["phase3", "population"],
+        }
+        assert get_columns(datasetinfo) == [
+            "adm0_pcod3",
+            "adm1_pcod2",
+            "adm1_name",
+            "reference_year",
+            "reference_code",
+            "chtype",
+            "phase3",
+            "population",
+        ]
+        datasetinfo = {
+            "admin": ["ISO", {"value": "ALL"}],
+            "subsets": [{"input": ["Budget"]}, {"input": ["Budget", "Other"]}],
+        }
+        assert get_columns(datasetinfo) == ["ISO", "Budget", "Other"]
+        assert get_columns({"admin": ["{{0}}"], "input": ["Value"]}) is None
+        assert get_columns({"use_hxl": True, "input": ["#population"]}) is None
+        assert get_columns({}) is None
+        datasetinfo = {
+            "prefilter": "row['Status'] == 'Final'",
+            "admin": ["ISO"],
+            "subsets": [
+                {"input": ["Budget"], "transform": {"Budget": "float(Budget) * Rate"}}
+            ],
+        }
+        headers = ["ISO", "Status", "Budget", "Rate", "Notes"]
+        assert get_columns(datasetinfo, headers) == ["ISO", "Budget", "Status", "Rate"]
+
+    def test_read_tabular(self):
+        UserAgent.set_global("test")
+        with temp_dir("TestSpreadsheets") as temp_folder:
+            path = join(temp_folder, "test.xlsx")
+            workbook = Workbook()
+            sheet = workbook.active
+            sheet.append(["ISO", "Name", "Value", "Notes"])
+            sheet.append(["SDN", "Sudan", 10, "a"])
+            sheet.append(["SYR", "Syria", 20, "b"])
+            workbook.save(path)
+            datasetinfo = {
+                "url": path,
+                "format": "xlsx",
+                "fill_merged_cells": False,
+                "admin": ["ISO"],
+                "input": ["Value"],
+            }
+            Read.create_readers(
+                temp_folder, temp_folder, temp_folder, spreadsheet_streaming=True
+            )
+            reader = Read.get_reader()
+            headers, iterator = reader.read_tabular(dict(datasetinfo))
+            assert headers == ["ISO", "Name", "Value", "Notes"]
+            assert list(iterator) == [
+                {"ISO": "SDN", "Value": 10},
+                {"ISO": "SYR", "Value": 20},
+            ]
+            # Columns only in the prefilter are kept for it
+            prefilter = "row['Notes'] == 'a'"
+            headers, iterator = reader.read_tabular(
+                {**datasetinfo, "prefilter": prefilter}
+            )
+            rows = list(iterator)
+            assert rows[0] == {"ISO": "SDN", "Value": 10, "Notes": "a"}
+            assert [row["ISO"] for row in rows if eval(prefilter)] == ["SDN"]
+            # Merged cells are filled unless a source says there are none
+            sheet.merge_cells("D2:D3")
+            workbook.save(path)
+            del datasetinfo["fill_merged_cells"]
+            headers, iterator = reader.read_tabular({**datasetinfo, "input": ["Notes"]})
+            assert [row["Notes"] for row in iterator] == ["a", "a"]
+            Read.create_readers(temp_folder, temp_folder, temp_folder)
+            reader = Read.get_reader()
+            headers, iterator = reader.read_tabular(dict(datasetinfo))
+            assert headers == ["ISO", "Name", "Value", "Notes"]
+            assert len(list(iterator)) == 2
@@ -0,0 +1,61 @@
+import pickle
+
+from scrapers.utilities.runner import Runner
+from scrapers.utilities.valuestore import RowIndex, ValueColumn, ValueStore
+
+
+class TestValueStore:
+    def test_value_column(self):
+        index = RowIndex(["AFG", "SDN", "YEM"])
+        values = ValueColumn(index)
+        values["YEM"] = 2
+        values["AFG"] = 3
+        assert values.kind == "int"
+        assert list(values.items()) == [("YEM", 2), ("AFG", 3)]
+        assert "SDN" not in values
+        assert values.get("SDN") is None
+        values["SYR"] = 1.5
+        assert values.kind == "object"
+        assert values == {"YEM": 2, "AFG": 3, "SYR": 1.5}
+        assert type(values["YEM"]) is int
+        assert index.adms == ["AFG", "SDN", "YEM", "SYR"]
+        del values["AFG"]
+        values["AFG"] = None
+        assert list(values) == ["YEM", "SYR", "AFG"]
+        rows = index.get_rows(["AFG", "SDN", "YEM", "SYR", "LBN"])
+        assert values.take(rows).tolist() == [None, None, 2, 1.5, None]
+        floats = ValueColumn(index, {"SDN": 0.1, "AFG": -0.0})
+        assert floats.kind == "float"
+        assert floats.take(rows).tolist() == [-0.0, 0.1, None, None, None]
+        assert type(floats.take(rows)[1]) is float
+        assert pickle.loads(pickle.dumps(floats)) == floats
+
+    def test_get_rows(self):
+        runner = Runner(("AFG", "SDN", "YEM"), today=None)
+
+        class Scraper:
+            name = "test"
+            has_run = True
+            source_configuration = {}
+            headers = {"national": (("Population", "Name"), ("#population", "#name"))}
+            values = {"national": ({"YEM": 30, "AFG": 40}, {"SDN": "Sudan"})}
+            sources = {"national": []}
+
+            def get_values(self, level):
+                return self.values[level]
+
+            def get_sources(self, level):
+                return self.sources[level]
+
+        runner.scrapers["test"] = Scraper()
+        runner.scraper_names.append("test")
+        args = ("national", ("AFG", "SDN", "YEM"), (["ISO3"], ["#country+code"]))
+        expected = runner.get_rows(*args, row_fns=(lambda adm: adm,))
+        ValueStore({"national": ("AFG", "SDN", "YEM")}).install(runner)
+        assert isinstance(Scraper.values["national"][0], ValueColumn)
+        assert runner.get_rows(*args, row_fns=(lambda adm: adm,)) == expected
+        assert expected[2:] == [
+            ["AFG", 40, None],
+            ["SDN", None, "Sudan"],
+            ["YEM", 30, None],
+        ]